@@ -7,75 +7,94 @@ PanelWithControl - Модульная система создания интер
 - config: Конфигурация и константы
 - ui_builder: Построение интерфейса
 - tab_system: Система вкладок
+- scene: Модель сцены без Tk (данные проекта)
 - elements: Элементы холста (Frame, Panel, Button, Image)
 - mechanisms: Механизмы анимации (MoveTrack, Rotator)
 - dialogs: Диалоговые окна настроек
 - tabs: Вкладки боковой панели
-"""
 
-# Базовая конфигурация
-from .config import Config
+Подсистемы загружаются при первом обращении (PEP 562): import modules
+не тянет tkinter, ИИ-ассистента, диалоги и механизмы.
+Регрессию времени импорта ловит benchmarks/import_bench.py
+"""
 
-# Система компонентов
-from .component_system import Component, ComponentManager, ArtifactManager
+from .utils.lazy_import import lazy_exports
 
-# Системы
-from .grid_system import GridSystem
-from .selection_system import SelectionSystem
-from .selection_tool import SelectionTool
-from .ui_builder import UIBuilder
-from .tab_system import TabSystem
-from .zoom_system import ZoomSystem
-from .main_canvas import MainCanvas
-from .code_generator import CodeGenerator
-from .project_manager import ProjectManager
-# Обработчики событий и колбэки
-from .event_handlers import EventHandlers
-from .app_callbacks import AppCallbacks
-from .loading_overlay import LoadingOverlay, LoadingContext
-from .ai_assistant import AIAssistant, AIModelType, get_ai_assistant
-from .window_manager import WindowManager, WindowConfig, get_window_manager
+# Имя button_functions совпадает с подмодулем - импортируется сразу
 from .button_functions import (
-    ButtonFunctions, ButtonAction, 
+    ButtonFunctions, ButtonAction,
     button_functions, get_button_functions,
     call_button_function, register_button_function, get_available_functions
 )
 
-# Элементы
-from .elements import (
-    ElementManager,
-    ElementBase,
-    FrameElement,
-    PanelElement,
-    ButtonElement,
-    ImageElement,
-    TextElement,
-    ScrollAreaElement
-)
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    # Базовая конфигурация
+    '.config': ('Config',),
 
-# Механизмы
-from .mechanisms import (
-    MechanismManager,
-    MechanismBase,
-    MoveTrackMechanism,
-    RotatorMechanism,
-    ScaleMechanism,
-    FadeMechanism,
-    ShakeMechanism,
-    PathMechanism,
-    PulseMechanism
-)
+    # Система компонентов
+    '.component_system': ('Component', 'ComponentManager', 'ArtifactManager'),
 
-# Диалоги
-from .dialogs import (
-    ButtonConfigDialog,
-    FrameConfigDialog,
-    PanelConfigDialog,
-    ImageConfigDialog,
-    ActionConfigDialog,
-    show_button_config,
-    show_frame_config,
-    show_panel_config,
-    show_image_config,
-    show_action_config
-)
+    # Системы
+    '.grid_system': ('GridSystem',),
+    '.selection_system': ('SelectionSystem',),
+    '.selection_tool': ('SelectionTool',),
+    '.ui_builder': ('UIBuilder',),
+    '.tab_system': ('TabSystem',),
+    '.zoom_system': ('ZoomSystem',),
+    '.main_canvas': ('MainCanvas',),
+    '.code_generator': ('CodeGenerator',),
+    '.project_manager': ('ProjectManager',),
+    # Обработчики событий и колбэки
+    '.event_handlers': ('EventHandlers',),
+    '.app_callbacks': ('AppCallbacks',),
+    '.loading_overlay': ('LoadingOverlay', 'LoadingContext'),
+    '.ai_assistant': ('AIAssistant', 'AIModelType', 'get_ai_assistant'),
+    '.window_manager': ('WindowManager', 'WindowConfig', 'get_window_manager'),
+
+    # Модель сцены (без Tk)
+    '.scene': ('SceneModel', 'ElementModel', 'MechanismModel', 'SceneCanvasView'),
+
+    # Элементы
+    '.elements': (
+        'ElementManager',
+        'ElementBase',
+        'FrameElement',
+        'PanelElement',
+        'ButtonElement',
+        'ImageElement',
+        'TextElement',
+        'ScrollAreaElement',
+    ),
+
+    # Механизмы
+    '.mechanisms': (
+        'MechanismManager',
+        'MechanismBase',
+        'MoveTrackMechanism',
+        'RotatorMechanism',
+        'ScaleMechanism',
+        'FadeMechanism',
+        'ShakeMechanism',
+        'PathMechanism',
+        'PulseMechanism',
+    ),
+
+    # Диалоги
+    '.dialogs': (
+        'ButtonConfigDialog',
+        'FrameConfigDialog',
+        'PanelConfigDialog',
+        'ImageConfigDialog',
+        'ActionConfigDialog',
+        'show_button_config',
+        'show_frame_config',
+        'show_panel_config',
+        'show_image_config',
+        'show_action_config',
+    ),
+})
+__all__ += [
+    'ButtonFunctions', 'ButtonAction',
+    'button_functions', 'get_button_functions',
+    'call_button_function', 'register_button_function', 'get_available_functions',
+]
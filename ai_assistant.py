@@ -6,11 +6,20 @@ AI Assistant Module
 """
 import os
 import json
+import queue
+import itertools
 import threading
+import time
 from typing import Optional, Callable, Dict, Any, List
 from dataclasses import dataclass
 from enum import Enum
 
+from .utils.event_bus import call_on_ui
+from .utils.logger import get_logger
+from .utils.response_cache import ResponseCache
+
+log = get_logger('AIAssistant')
+
 
 class AIModelType(Enum):
     """Типы доступных моделей"""
@@ -28,6 +37,132 @@ class AIResponse:
     tokens_used: int = 0
     generation_time: float = 0.0
     error: Optional[str] = None
+    cancelled: bool = False
+
+
+class AIRequest:
+    """
+    Запрос в очереди генерации.
+
+    Возвращается из AIAssistant.submit(): через него генерацию можно
+    отменить (cancel) или дождаться (wait). Токены копятся в буфере и
+    передаются в on_token пачками - одним вызовом в потоке Tk за такт
+    насоса шины событий, а не вызовом на каждый токен.
+    """
+
+    def __init__(self, prompt: str, task_type: str, priority: int,
+                 callback: Optional[Callable[[AIResponse], None]] = None,
+                 on_token: Optional[Callable[[str], None]] = None,
+                 cache_key: Optional[str] = None):
+        self.prompt = prompt
+        self.task_type = task_type
+        self.priority = priority
+        self.callback = callback
+        self.on_token = on_token
+        self.cache_key = cache_key
+        self.response: Optional[AIResponse] = None
+        self._cancelled = threading.Event()
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._pending: List[str] = []
+        self._flush_scheduled = False
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def cancel(self):
+        """Отменяет запрос (ожидающий - не начнётся, текущий - остановится на следующем токене)"""
+        self._cancelled.set()
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[AIResponse]:
+        """Ждёт завершения (не вызывать из потока Tk с колбэками - они выполняются в нём же)"""
+        self._done.wait(timeout)
+        return self.response
+
+    def _push_token(self, text: str):
+        """Токен из потока генерации"""
+        if self.on_token is None:
+            return
+        with self._lock:
+            self._pending.append(text)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        call_on_ui(self._flush_tokens)
+
+    def _flush_tokens(self):
+        with self._lock:
+            chunk = ''.join(self._pending)
+            self._pending.clear()
+            self._flush_scheduled = False
+        if chunk:
+            try:
+                self.on_token(chunk)
+            except Exception as e:
+                log.error("Token callback error: %s", e)
+
+
+def _estimate_tokens(text: str) -> int:
+    """Грубая оценка числа токенов (~3 символа на токен для кириллицы и кода)"""
+    return len(text) // 3 + 1
+
+
+class _ChatSession:
+    """
+    Открытый chat_session модели: системный промпт уже обработан
+    и лежит в контексте. После каждого запроса история откатывается
+    к системному промпту (rewind) - ответ зависит только от задачи
+    и запроса, поэтому его можно кэшировать по (запрос, задача).
+    """
+
+    def __init__(self, model, task_type: str, system_prompt: str):
+        self.task_type = task_type
+        self._model = model
+        self._context = model.chat_session(system_prompt)
+        self._context.__enter__()
+        # Сообщения системного промпта в истории сессии
+        history = self._history()
+        self._prefix = list(history) if history is not None else None
+        # Занято в окне контекста (оценка)
+        self.tokens = _estimate_tokens(system_prompt)
+        self.turns = 0
+        self.last_used = time.time()
+
+    def _history(self) -> Optional[list]:
+        history = getattr(self._model, 'current_chat_session', None)
+        return history if isinstance(history, list) else None
+
+    def fits(self, tokens: int, limit: int) -> bool:
+        return self.tokens + tokens <= limit
+
+    def rewind(self) -> bool:
+        """
+        Убирает из истории прошлые запросы и ответы.
+
+        Returns:
+            False если модель не даёт заменить историю (сессию нужно закрыть)
+        """
+        if self._prefix is None:
+            return False
+        try:
+            self._model.current_chat_session = list(self._prefix)
+        except (AttributeError, TypeError, ValueError) as e:
+            log.debug("История сессии не откатывается: %s", e)
+            return False
+        self.turns += 1
+        self.last_used = time.time()
+        return True
+
+    def close(self):
+        try:
+            self._context.__exit__(None, None, None)
+        except Exception as e:
+            log.debug("Ошибка закрытия сессии: %s", e)
 
 
 class AIAssistant:
@@ -110,11 +245,31 @@ mechanism.start()
 '''
     }
 
-    def __init__(self, model_type: AIModelType = AIModelType.TINY):
+    # Дисковый кэш ответов (общий для всех сессий)
+    CACHE_FILE = '~/.panel_editor_ai_cache.db'
+
+    # Приоритеты запросов (больше - раньше)
+    PRIORITY_LOW = -10
+    PRIORITY_NORMAL = 0
+    PRIORITY_HIGH = 10
+
+    # Окно контекста модели (токенов) - сессия сбрасывается до переполнения
+    CONTEXT_TOKENS = 2048
+    # Выгрузка модели после простоя (сек, 0 - не выгружать)
+    IDLE_UNLOAD_SECONDS = 600
+    IDLE_POLL_SECONDS = 30
+
+    def __init__(self, model_type: AIModelType = AIModelType.TINY, model=None):
+        """
+        Args:
+            model_type: Модель GPT4All
+            model: Готовый объект модели (интерфейс GPT4All: chat_session, generate
+                   со streaming/callback) - например, локальная заглушка
+        """
         self.model_type = model_type
-        self.model = None
+        self.model = model
         self.model_path = os.path.expanduser("~/.local/share/nomic.ai/GPT4All/")
-        self.is_loaded = False
+        self.is_loaded = model is not None
         self.is_loading = False
         self.callbacks: Dict[str, List[Callable]] = {
             'on_load': [],
@@ -122,9 +277,26 @@ mechanism.start()
             'on_error': []
         }
         
-        # Кэш для быстрых ответов
-        self.response_cache: Dict[str, str] = {}
+        # Кэш для быстрых ответов: переживает перезапуск, прогревается в фоне
+        self.response_cache = ResponseCache(self.CACHE_FILE)
         self.cache_enabled = True
+        threading.Thread(target=self.response_cache.warm, daemon=True).start()
+        
+        # Один поток генерации на все запросы: модель не потокобезопасна
+        self._queue: 'queue.PriorityQueue' = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._model_lock = threading.Lock()
+        self.active_request: Optional[AIRequest] = None
+        
+        # Открытая сессия модели (контекст у модели один - одна сессия)
+        self._session: Optional[_ChatSession] = None
+        self.session_stats = {'opened': 0, 'reused': 0, 'overflow': 0}
+        self.idle_unload_seconds = self.IDLE_UNLOAD_SECONDS
+        self._last_used = time.time()
+        # Модель выгружена по простою - загрузится снова при следующем запросе
+        self._idle_unloaded = False
         
         # Настройки генерации
         self.settings = {
@@ -145,12 +317,15 @@ mechanism.start()
             self.callbacks[event].remove(callback)
 
     def _emit(self, event: str, *args, **kwargs):
-        """Вызов колбэков события"""
+        """Вызов колбэков события (в потоке Tk, откуда бы ни был вызван)"""
+        call_on_ui(self._emit_now, event, *args, **kwargs)
+
+    def _emit_now(self, event: str, *args, **kwargs):
         for callback in self.callbacks.get(event, []):
             try:
                 callback(*args, **kwargs)
             except Exception as e:
-                print(f"[AIAssistant] Callback error: {e}")
+                log.error("Callback error: %s", e)
 
     def load_model(self, callback: Optional[Callable] = None):
         """Загружает модель в фоновом потоке"""
@@ -163,125 +338,298 @@ mechanism.start()
         
         def _load():
             try:
-                from gpt4all import GPT4All
-                
-                # Создаём директорию для моделей если нет
-                os.makedirs(self.model_path, exist_ok=True)
-                
-                # Загружаем модель (скачает автоматически если нет)
-                self.model = GPT4All(
-                    model_name=self.model_type.value,
-                    model_path=self.model_path,
-                    allow_download=True,
-                    verbose=False
-                )
-                
-                self.is_loaded = True
+                model = self._create_model()
+                with self._model_lock:
+                    self.model = model
+                    self.is_loaded = True
+                    self._idle_unloaded = False
                 self.is_loading = False
+                self._last_used = time.time()
                 
                 self._emit('on_load', True)
                 if callback:
-                    callback(True)
+                    call_on_ui(callback, True)
                     
             except Exception as e:
                 self.is_loading = False
                 self._emit('on_error', str(e))
                 if callback:
-                    callback(False)
+                    call_on_ui(callback, False)
         
         thread = threading.Thread(target=_load, daemon=True)
         thread.start()
 
+    def _create_model(self):
+        """Создаёт модель GPT4All (блокирующе)"""
+        from gpt4all import GPT4All
+        
+        # Создаём директорию для моделей если нет
+        os.makedirs(self.model_path, exist_ok=True)
+        
+        # Загружаем модель (скачает автоматически если нет)
+        return GPT4All(
+            model_name=self.model_type.value,
+            model_path=self.model_path,
+            allow_download=True,
+            verbose=False
+        )
+
     def unload_model(self):
-        """Выгружает модель из памяти"""
-        if self.model:
-            del self.model
-            self.model = None
-            self.is_loaded = False
+        """Выгружает модель из памяти (после текущей генерации)"""
+        self.cancel_all()
+        with self._model_lock:
+            self._close_session()
+            if self.model:
+                del self.model
+                self.model = None
+                self.is_loaded = False
+
+    # === Сессии ===
+
+    def reset_session(self):
+        """Сбрасывает контекст модели (следующий запрос начнётся с системного промпта)"""
+        with self._model_lock:
+            self._close_session()
+
+    def _close_session(self):
+        """Закрывает сессию (вызывается под _model_lock)"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def _acquire_session(self, task_type: str, request_tokens: int) -> _ChatSession:
+        """
+        Сессия для запроса (вызывается под _model_lock).
+        
+        Запросы той же задачи идут в открытую сессию: системный промпт
+        не обрабатывается заново, прошлые запросы из истории уже убраны.
+        Другая задача или переполнение окна контекста - сессия
+        открывается заново.
+        """
+        session = self._session
+        if session is not None:
+            if session.task_type != task_type:
+                self._close_session()
+            elif not session.fits(request_tokens, self.CONTEXT_TOKENS):
+                self.session_stats['overflow'] += 1
+                log.debug("Сессия %s: окно контекста заполнено (%d), сброс",
+                          task_type, session.tokens)
+                self._close_session()
+            else:
+                self.session_stats['reused'] += 1
+                return session
+        
+        system_prompt = self.SYSTEM_PROMPTS.get(task_type, self.SYSTEM_PROMPTS['general'])
+        self._session = _ChatSession(self.model, task_type, system_prompt)
+        self.session_stats['opened'] += 1
+        return self._session
 
     def generate(self, prompt: str, task_type: str = 'general', 
-                 callback: Optional[Callable[[AIResponse], None]] = None) -> Optional[AIResponse]:
+                 callback: Optional[Callable[[AIResponse], None]] = None,
+                 on_token: Optional[Callable[[str], None]] = None,
+                 priority: int = PRIORITY_NORMAL) -> Optional[AIResponse]:
         """
         Генерирует ответ от ИИ
         
+        callback, on_token и подписчики событий вызываются в потоке Tk (через call_on_ui),
+        сама модель работает в фоновом потоке генерации.
+        
         Args:
             prompt: Запрос пользователя
             task_type: Тип задачи (general, code_generator, css_generator, etc.)
-            callback: Колбэк для асинхронного ответа
+            callback: Колбэк для асинхронного ответа (без него - ожидание результата)
+            on_token: Колбэк для фрагментов ответа по мере генерации
+            priority: Приоритет в очереди (PRIORITY_*)
         """
-        # Проверяем кэш
-        cache_key = f"{task_type}:{prompt}"
-        if self.cache_enabled and cache_key in self.response_cache:
-            response = AIResponse(
+        if callback:
+            self.submit(prompt, task_type, callback, on_token, priority)
+            return None
+        # Синхронный режим
+        return self.submit(prompt, task_type, None, on_token, priority).wait()
+
+    def submit(self, prompt: str, task_type: str = 'general',
+               callback: Optional[Callable[[AIResponse], None]] = None,
+               on_token: Optional[Callable[[str], None]] = None,
+               priority: int = PRIORITY_NORMAL) -> AIRequest:
+        """
+        Ставит запрос в очередь генерации.
+        
+        Returns:
+            AIRequest - для отмены (cancel) или ожидания (wait)
+        """
+        # Проверяем кэш (регистр и пробелы запроса не важны, настройки - важны)
+        cache_key = self.response_cache.make_key(
+            task_type, prompt, self.model_type.value, self.settings
+        )
+        request = AIRequest(prompt, task_type, priority, callback, on_token, cache_key)
+        
+        cached_text = self.response_cache.get(cache_key) if self.cache_enabled else None
+        if cached_text is not None:
+            if on_token:
+                on_token(cached_text)
+            self._finish(request, AIResponse(
                 success=True,
-                text=self.response_cache[cache_key],
+                text=cached_text,
                 tokens_used=0,
                 generation_time=0.0
-            )
-            if callback:
-                callback(response)
-            return response
+            ), deliver=None)
+            return request
         
-        if not self.is_loaded:
-            error_response = AIResponse(
+        if not self.is_loaded and not self._idle_unloaded:
+            self._finish(request, AIResponse(
                 success=False,
                 text="",
                 error="Модель не загружена. Вызовите load_model() сначала."
-            )
-            if callback:
-                callback(error_response)
-            return error_response
+            ), deliver=None)
+            return request
         
-        def _generate():
-            import time
-            start_time = time.time()
-            
+        self._ensure_worker()
+        self._queue.put((-priority, next(self._sequence), request))
+        return request
+
+    def _finish(self, request: AIRequest, response: AIResponse,
+                deliver: Optional[Callable] = call_on_ui):
+        """Завершает запрос: ответ, колбэк (через deliver, None - сразу), сигнал ожидающим"""
+        request.response = response
+        if request.callback:
+            if deliver:
+                deliver(request.callback, response)
+            else:
+                request.callback(response)
+        request._done.set()
+
+    def cancel_all(self):
+        """Отменяет текущую генерацию и все запросы в очереди"""
+        if self.active_request:
+            self.active_request.cancel()
+        while True:
+            try:
+                _, _, request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            request.cancel()
+            self._finish(request, self._cancelled_response(request, ''))
+            self._queue.task_done()
+
+    @staticmethod
+    def _cancelled_response(request: AIRequest, text: str, start_time: Optional[float] = None) -> AIResponse:
+        return AIResponse(
+            success=False,
+            text=text,
+            tokens_used=len(text.split()),
+            generation_time=time.time() - start_time if start_time else 0.0,
+            error="Генерация отменена",
+            cancelled=True
+        )
+
+    # === Поток генерации ===
+
+    def _ensure_worker(self):
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._worker_loop, name='AIWorker', daemon=True)
+                self._worker.start()
+
+    def _worker_loop(self):
+        while True:
+            # Пока модель загружена - просыпаемся проверить простой
+            timeout = self.IDLE_POLL_SECONDS if self.is_loaded and self.idle_unload_seconds else None
             try:
-                system_prompt = self.SYSTEM_PROMPTS.get(task_type, self.SYSTEM_PROMPTS['general'])
+                _, _, request = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._check_idle()
+                continue
+            self.active_request = request
+            try:
+                self._run_request(request)
+            except Exception as e:
+                log.exception("Ошибка потока генерации: %s", e)
+            finally:
+                self.active_request = None
+                self._last_used = time.time()
+                self._queue.task_done()
+
+    def _check_idle(self):
+        """Выгружает модель, если она не использовалась idle_unload_seconds"""
+        if not self.is_loaded or not self.idle_unload_seconds or not self._queue.empty():
+            return
+        idle = time.time() - self._last_used
+        if idle < self.idle_unload_seconds:
+            return
+        log.info("Модель не использовалась %.0f с - выгружается", idle)
+        self._idle_unloaded = True
+        self.unload_model()
+
+    def _run_request(self, request: AIRequest):
+        """Генерирует ответ на запрос (в потоке генерации)"""
+        if request.cancelled:
+            self._finish(request, self._cancelled_response(request, ''))
+            return
+        
+        start_time = time.time()
+        chunks: List[str] = []
+        try:
+            with self._model_lock:
+                if self.model is None:
+                    if not self._idle_unloaded:
+                        raise RuntimeError("Модель выгружена")
+                    log.info("Повторная загрузка модели после простоя")
+                    self.model = self._create_model()
+                    self.is_loaded = True
+                    self._idle_unloaded = False
                 
-                with self.model.chat_session(system_prompt):
-                    response_text = self.model.generate(
-                        prompt,
+                # Запрос и ответ должны поместиться в окно контекста
+                request_tokens = _estimate_tokens(request.prompt) + self.settings['max_tokens']
+                session = self._acquire_session(request.task_type, request_tokens)
+                try:
+                    # callback модели останавливает генерацию сразу после отмены
+                    tokens = self.model.generate(
+                        request.prompt,
                         max_tokens=self.settings['max_tokens'],
                         temp=self.settings['temperature'],
                         top_p=self.settings['top_p'],
-                        repeat_penalty=self.settings['repeat_penalty']
+                        repeat_penalty=self.settings['repeat_penalty'],
+                        streaming=True,
+                        callback=lambda token_id, text: not request.cancelled
                     )
+                    for token in tokens:
+                        if request.cancelled:
+                            break
+                        chunks.append(token)
+                        request._push_token(token)
+                except Exception:
+                    # Состояние контекста неизвестно - следующий запрос начнёт заново
+                    self._close_session()
+                    raise
+                # Следующий запрос не видит этот диалог
+                if not session.rewind():
+                    self._close_session()
+            
+            response_text = ''.join(chunks)
+            if request.cancelled:
+                self._finish(request, self._cancelled_response(request, response_text, start_time))
+                return
+            
+            # Кэшируем ответ
+            if self.cache_enabled:
+                self.response_cache.put(request.cache_key, response_text, request.task_type)
+            
+            response = AIResponse(
+                success=True,
+                text=response_text,
+                tokens_used=len(chunks),
+                generation_time=time.time() - start_time
+            )
+            self._emit('on_response', response)
+            self._finish(request, response)
                 
-                generation_time = time.time() - start_time
-                
-                # Кэшируем ответ
-                if self.cache_enabled:
-                    self.response_cache[cache_key] = response_text
-                
-                response = AIResponse(
-                    success=True,
-                    text=response_text,
-                    tokens_used=len(response_text.split()),
-                    generation_time=generation_time
-                )
-                
-                self._emit('on_response', response)
-                if callback:
-                    callback(response)
-                    
-            except Exception as e:
-                response = AIResponse(
-                    success=False,
-                    text="",
-                    error=str(e)
-                )
-                self._emit('on_error', str(e))
-                if callback:
-                    callback(response)
-        
-        if callback:
-            thread = threading.Thread(target=_generate, daemon=True)
-            thread.start()
-            return None
-        else:
-            # Синхронный режим
-            _generate()
+        except Exception as e:
+            self._emit('on_error', str(e))
+            self._finish(request, AIResponse(
+                success=False,
+                text=''.join(chunks),
+                error=str(e)
+            ))
 
     # === Специализированные методы ===
     
@@ -475,6 +823,13 @@ mechanism.start()
             'is_loaded': self.is_loaded,
             'is_loading': self.is_loading,
             'cache_size': len(self.response_cache),
+            'cache_hits': self.response_cache.hits,
+            'queued': self._queue.qsize(),
+            'generating': self.active_request is not None,
+            'session_task': self._session.task_type if self._session else None,
+            'session_tokens': self._session.tokens if self._session else 0,
+            'sessions': dict(self.session_stats),
+            'idle_unload_seconds': self.idle_unload_seconds,
             'settings': self.settings.copy()
         }
 
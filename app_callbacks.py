@@ -5,6 +5,9 @@
 Содержит методы для обработки событий UI и взаимодействия между компонентами.
 """
 import tkinter as tk
+from .utils.logger import get_logger
+
+log = get_logger('AppCallbacks')
 
 
 class AppCallbacks:
@@ -64,7 +67,7 @@ class AppCallbacks:
                 try:
                     tab_elements._refresh()
                 except (tk.TclError, AttributeError) as e:
-                    print(f"[AppCallbacks] Error refreshing elements tab: {e}")
+                    log.warning("Error refreshing elements tab: %s", e)
     
     def update_mechanisms_tab(self):
         """Обновляет вкладку механизмов"""
@@ -75,7 +78,7 @@ class AppCallbacks:
                 try:
                     tab_mechanisms.refresh()
                 except (tk.TclError, AttributeError) as e:
-                    print(f"[AppCallbacks] Error refreshing mechanisms tab: {e}")
+                    log.warning("Error refreshing mechanisms tab: %s", e)
     
     def update_info_panel(self):
         """Обновляет информационную панель"""
@@ -95,7 +98,7 @@ class AppCallbacks:
                 if hasattr(tab_color, 'set_element'):
                     tab_color.set_element(element)
             except Exception as e:
-                print(f"Error loading element to color tab: {e}")
+                log.warning("Error loading element to color tab: %s", e)
         
         # Для текстового элемента
         if hasattr(element, 'ELEMENT_TYPE') and element.ELEMENT_TYPE == 'text':
@@ -104,7 +107,7 @@ class AppCallbacks:
                 try:
                     tab_text.set_element(element)
                 except (tk.TclError, AttributeError) as e:
-                    print(f"[AppCallbacks] Error loading text element: {e}")
+                    log.warning("Error loading text element: %s", e)
     
     def load_main_canvas_to_color_tab(self):
         """Загружает свойства главной панели в панель цвета"""
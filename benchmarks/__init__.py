@@ -0,0 +1,6 @@
+#!/usr/bin/env python3
+"""
+Бенчмарки
+Замеры производительности на синтетических сценах (без Tk)
+"""
+from .scene_factory import build_scene_dict, build_scene
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк генерации кода
+Замеряет время и пиковую память CodeGenerator на синтетических сценах
+и сохраняет результаты в JSON для сравнения между версиями
+
+Запуск:
+    python -m modules.benchmarks.codegen_bench --sizes 100 1000 10000 --output bench.json
+    python -m modules.benchmarks.codegen_bench --compare bench.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Any
+
+from ..code_generator import CodeGenerator
+from .scene_factory import build_scene
+
+
+DEFAULT_SIZES = (100, 1000, 10000)
+
+# Допустимое замедление при сравнении (1.2 = +20%)
+DEFAULT_THRESHOLD = 1.2
+
+
+def _operations(generator: CodeGenerator) -> Dict[str, Callable[[], str]]:
+    """Замеряемые операции: отдельные генераторы и шаблоны экспорта"""
+    return {
+        # Генераторы
+        'generate_html': generator.generate_html,
+        'generate_css': generator.generate_css,
+        'generate_js': generator.generate_js,
+        # Шаблоны экспорта (LiveProjectManager.export_project)
+        'template_html': generator.generate_all,
+        'template_react': generator.export_react_component,
+        'template_vue': generator.export_vue_component,
+    }
+
+
+def _time_call(func: Callable[[], str], repeat: int) -> Dict[str, float]:
+    """Время выполнения (мс) по нескольким прогонам"""
+    samples = []
+    output = ''
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        'min_ms': round(min(samples), 3),
+        'median_ms': round(statistics.median(samples), 3),
+        'max_ms': round(max(samples), 3),
+        'output_bytes': len(output.encode('utf-8')),
+    }
+
+
+def _peak_memory(func: Callable[[], str]) -> int:
+    """Пиковая память (байт) за один вызов"""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, repeat: int = 5, seed: int = 0) -> Dict[str, Any]:
+    """
+    Выполняет все замеры.
+
+    Returns:
+        dict: метаданные окружения и результаты по размерам сцены
+    """
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'seed': seed,
+        },
+        'results': {},
+    }
+
+    for size in sizes:
+        start = time.perf_counter()
+        scene = build_scene(size, seed=seed)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        generator = CodeGenerator()
+        generator.set_scene(scene)
+
+        size_results = {
+            'elements': len(scene.elements),
+            'mechanisms': len(scene.mechanisms),
+            'scene_build_ms': round(build_ms, 3),
+            'operations': {},
+        }
+        # Меньше повторов на больших сценах
+        size_repeat = max(1, repeat if size <= 1000 else repeat // 2)
+        for name, func in _operations(generator).items():
+            entry = _time_call(func, size_repeat)
+            entry['peak_bytes'] = _peak_memory(func)
+            size_results['operations'][name] = entry
+            print(f"  {size:>6} × {name:<16} {entry['median_ms']:>10.2f} мс  "
+                  f"{entry['peak_bytes'] / 1024:>10.1f} КБ")
+
+        results['results'][str(size)] = size_results
+
+    return results
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Сравнивает результаты с базовыми.
+
+    Returns:
+        Список регрессий (пустой если всё в пределах порога)
+    """
+    regressions = []
+    for size, size_results in current.get('results', {}).items():
+        base_size = baseline.get('results', {}).get(size)
+        if not base_size:
+            continue
+        for name, entry in size_results['operations'].items():
+            base_entry = base_size['operations'].get(name)
+            if not base_entry:
+                continue
+            for metric in ('median_ms', 'peak_bytes'):
+                base_value = base_entry.get(metric) or 0
+                value = entry.get(metric) or 0
+                if base_value and value > base_value * threshold:
+                    regressions.append(
+                        f"{size} × {name}: {metric} {base_value} → {value} "
+                        f"(×{value / base_value:.2f})"
+                    )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк генерации кода")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help="Размеры сцен (количество элементов)")
+    parser.add_argument('--repeat', type=int, default=5, help="Количество прогонов")
+    parser.add_argument('--seed', type=int, default=0, help="Зерно синтетической сцены")
+    parser.add_argument('--output', help="Файл для сохранения результатов (JSON)")
+    parser.add_argument('--compare', help="Файл базовых результатов для сравнения")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Допустимый коэффициент замедления")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.repeat, args.seed)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"Результаты сохранены: {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("Регрессии:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("Регрессий нет")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
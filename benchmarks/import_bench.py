@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк времени импорта (холодный старт)
+Запускает `python -X importtime -c "import ..."` в отдельных процессах,
+суммирует время импорта пакета и проверяет, что тяжёлые модули
+(PIL, gpt4all, pygame, numpy) не загружаются при импорте
+
+Запуск:
+    python -m modules.benchmarks.import_bench --output imports.json
+    python -m modules.benchmarks.import_bench --compare imports.json
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+
+# Имя пакета и каталог, из которого он импортируется
+PACKAGE = __name__.split('.')[0] if '.' in __name__ else 'modules'
+PACKAGE_PARENT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_TARGETS = (PACKAGE, f'{PACKAGE}.scene', f'{PACKAGE}.code_generator')
+
+# Не должны загружаться при импорте ни одной цели
+HEAVY_MODULES = ('PIL', 'gpt4all', 'pygame', 'numpy')
+
+# Дополнительно запрещённые модули для отдельных целей
+FORBIDDEN = {
+    PACKAGE: ('tkinter', 'multiprocessing'),
+    f'{PACKAGE}.scene': ('tkinter',),
+    f'{PACKAGE}.code_generator': ('tkinter',),
+}
+
+# Допустимое замедление при сравнении (импорт шумнее генерации кода)
+DEFAULT_THRESHOLD = 1.3
+
+_LINE_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$')
+
+
+def _run_importtime(target: str) -> List[Tuple[int, int, int, str]]:
+    """
+    Импортирует цель в чистом интерпретаторе.
+
+    Returns:
+        [(собственное время мкс, суммарное мкс, глубина, модуль)] в порядке вывода
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [PACKAGE_PARENT, env.get('PYTHONPATH')]))
+    # Без кэша .pyc замер включал бы компиляцию
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {target}'],
+        cwd=PACKAGE_PARENT, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {target} завершился ошибкой:\n{proc.stderr[-2000:]}")
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((int(self_us), int(cumulative_us), (len(indent) - 1) // 2, name))
+    return entries
+
+
+def _package_total(entries: List[Tuple[int, int, int, str]]) -> int:
+    """Суммарное время (мкс) верхнеуровневых импортов, начиная с пакета (без старта интерпретатора)"""
+    total = 0
+    started = False
+    for _, cumulative_us, depth, name in entries:
+        if name == PACKAGE or name.startswith(PACKAGE + '.'):
+            started = True
+        if started and depth == 0:
+            total += cumulative_us
+    return total
+
+
+def measure(target: str, repeat: int = 5, top: int = 10) -> Dict[str, Any]:
+    """Замеряет импорт цели: медиана суммарного времени и самые дорогие модули"""
+    totals = []
+    entries = []
+    for _ in range(repeat + 1):
+        entries = _run_importtime(target)
+        totals.append(_package_total(entries))
+    # Первый прогон прогревает кэш .pyc и файловой системы
+    totals = totals[1:]
+
+    modules = {name for _, _, _, name in entries}
+    forbidden = HEAVY_MODULES + FORBIDDEN.get(target, ())
+    loaded_forbidden = sorted(name for name in modules
+                              if name.split('.')[0] in forbidden)
+    slowest = sorted(entries, key=lambda entry: entry[0], reverse=True)[:top]
+    return {
+        'median_ms': round(statistics.median(totals) / 1000, 3),
+        'min_ms': round(min(totals) / 1000, 3),
+        'max_ms': round(max(totals) / 1000, 3),
+        'modules': len(modules),
+        'package_modules': len([name for name in modules
+                                if name == PACKAGE or name.startswith(PACKAGE + '.')]),
+        'forbidden_loaded': loaded_forbidden,
+        'slowest_self': [{'module': name, 'self_ms': round(self_us / 1000, 3)}
+                         for self_us, _, _, name in slowest],
+    }
+
+
+def run_benchmarks(targets=DEFAULT_TARGETS, repeat: int = 5) -> Dict[str, Any]:
+    """
+    Выполняет все замеры.
+
+    Returns:
+        dict: метаданные окружения и результаты по целям импорта
+    """
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'repeat': repeat,
+        },
+        'results': {},
+    }
+    for target in targets:
+        entry = measure(target, repeat)
+        results['results'][target] = entry
+        print(f"  {target:<28} {entry['median_ms']:>8.2f} мс  "
+              f"{entry['modules']:>4} модулей ({entry['package_modules']} из пакета)")
+        for name in entry['forbidden_loaded']:
+            print(f"    ! загружен {name}")
+    return results
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Сравнивает результаты с базовыми.
+
+    Returns:
+        Список регрессий (пустой если всё в пределах порога)
+    """
+    regressions = []
+    for target, entry in current.get('results', {}).items():
+        base_entry = baseline.get('results', {}).get(target)
+        if not base_entry:
+            continue
+        for metric in ('median_ms', 'package_modules'):
+            base_value = base_entry.get(metric) or 0
+            value = entry.get(metric) or 0
+            if base_value and value > base_value * threshold:
+                regressions.append(
+                    f"{target}: {metric} {base_value} → {value} (×{value / base_value:.2f})"
+                )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк времени импорта")
+    parser.add_argument('--targets', nargs='+', default=list(DEFAULT_TARGETS),
+                        help="Импортируемые модули")
+    parser.add_argument('--repeat', type=int, default=5, help="Количество прогонов")
+    parser.add_argument('--output', help="Файл для сохранения результатов (JSON)")
+    parser.add_argument('--compare', help="Файл базовых результатов для сравнения")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Допустимый коэффициент замедления")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.targets, args.repeat)
+    failed = any(entry['forbidden_loaded'] for entry in results['results'].values())
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"Результаты сохранены: {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("Регрессии:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("Регрессий нет")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
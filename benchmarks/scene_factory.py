@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Генератор синтетических сцен
+Строит project.json-совместимые словари любого размера:
+все типы элементов, вложенные группы, механизмы
+"""
+import random
+from typing import Dict, Any
+
+from ..scene import SceneModel
+
+
+# Типы берутся из реестров менеджеров, чтобы новые типы попадали в замеры
+def _element_types():
+    from ..elements.element_manager import ElementManager
+    return sorted(ElementManager.ELEMENT_TYPES)
+
+
+def _mechanism_types():
+    from ..mechanisms.mechanism_manager import MechanismManager
+    return sorted(MechanismManager.MECHANISM_TYPES)
+
+
+SHAPES = ('rectangle', 'rounded', 'pill', 'chamfer')
+DISPLAY_MODES = ('stroke', 'fill', 'both')
+LINE_STYLES = ('solid', 'dashed', 'dotted', 'dash_dot', 'long_dash')
+
+
+def build_scene_dict(element_count: int,
+                     seed: int = 0,
+                     group_size: int = 8,
+                     group_depth: int = 3,
+                     mechanism_ratio: float = 0.1) -> Dict[str, Any]:
+    """
+    Строит словарь сцены в формате project.json.
+
+    Args:
+        element_count: Количество элементов
+        seed: Зерно генератора (одинаковое зерно = одинаковая сцена)
+        group_size: Сколько детей у каждой группы
+        group_depth: Максимальная глубина вложенности групп
+        mechanism_ratio: Доля элементов с привязанным механизмом
+
+    Returns:
+        dict с ключами canvas, elements, mechanisms
+    """
+    rng = random.Random(seed)
+    element_types = _element_types()
+    mechanism_types = _mechanism_types()
+
+    canvas_width, canvas_height = 1920, 1080
+    elements = []
+
+    for index in range(element_count):
+        el_type = element_types[index % len(element_types)]
+        width = rng.randint(40, 400)
+        height = rng.randint(24, 300)
+        shape = rng.choice(SHAPES)
+        elements.append({
+            'type': el_type,
+            'id': f"{el_type}_{index}",
+            'x': rng.randint(0, canvas_width - width),
+            'y': rng.randint(0, canvas_height - height),
+            'width': width,
+            'height': height,
+            'properties': {
+                'fill_color': f"#{rng.randrange(0x1000000):06x}",
+                'stroke_color': f"#{rng.randrange(0x1000000):06x}",
+                'stroke_width': rng.randint(0, 4),
+                'shape': shape,
+                'display_mode': rng.choice(DISPLAY_MODES),
+                'line_style': rng.choice(LINE_STYLES),
+                'corner_radius': rng.randint(0, 16) if shape == 'rounded' else 0,
+                'shadow_enabled': rng.random() < 0.3,
+                'glow_enabled': rng.random() < 0.1,
+                'double_border': rng.random() < 0.1,
+                'label_enabled': rng.random() < 0.5,
+                'label_text': f"Элемент {index}",
+            },
+            'attached_mechanisms': [],
+            'parent_group': None,
+            'children': [],
+            'is_group': False,
+        })
+
+    # Вложенные группы: элемент i - родитель следующих group_size элементов
+    _link_groups(elements, group_size, group_depth)
+
+    # Механизмы
+    mechanisms = []
+    for index, element in enumerate(elements):
+        if rng.random() >= mechanism_ratio:
+            continue
+        mech_type = mechanism_types[len(mechanisms) % len(mechanism_types)]
+        mech_id = f"mech_{mech_type}_{len(mechanisms)}"
+        mechanisms.append({
+            'id': mech_id,
+            'type': mech_type,
+            'x': element['x'],
+            'y': element['y'] + element['height'] + 10,
+            'width': 200,
+            'height': 10,
+            'properties': {'speed': rng.randint(20, 300), 'loop': True},
+            'attached_elements': [element['id']],
+            'trigger_button_id': None,
+            'trigger_function_id': rng.randint(0, 9),
+        })
+        element['attached_mechanisms'].append(mech_id)
+
+    groups = []
+    for start in range(0, len(mechanisms), 16):
+        chunk = mechanisms[start:start + 16]
+        groups.append({
+            'id': f"mech_group_{start // 16}",
+            'name': f"Группа {start // 16 + 1}",
+            'mechanism_ids': [m['id'] for m in chunk],
+            'is_expanded': True,
+            'is_locked': False,
+            'is_visible': True,
+        })
+
+    return {
+        'name': f"synthetic-{element_count}",
+        'version': '1.0',
+        'canvas': {
+            'x': 0,
+            'y': 0,
+            'width': canvas_width,
+            'height': canvas_height,
+            'fill_color': '#000000',
+        },
+        'elements': elements,
+        'mechanisms': {'mechanisms': mechanisms, 'groups': groups},
+    }
+
+
+def _link_groups(elements, group_size, group_depth):
+    """Связывает элементы в деревья глубиной до group_depth"""
+    if group_size <= 0 or group_depth <= 0:
+        return
+
+    depth = {}
+    cursor = 1
+    for parent in elements:
+        parent_depth = depth.get(parent['id'], 0)
+        if parent_depth >= group_depth:
+            continue
+        children = elements[cursor:cursor + group_size]
+        if not children:
+            break
+        for child in children:
+            child['parent_group'] = parent['id']
+            parent['children'].append(child['id'])
+            depth[child['id']] = parent_depth + 1
+        parent['is_group'] = True
+        cursor += group_size
+
+
+def build_scene(element_count: int, **kwargs) -> SceneModel:
+    """Строит SceneModel синтетической сцены"""
+    return SceneModel.from_dict(build_scene_dict(element_count, **kwargs))
@@ -4,6 +4,10 @@
 Здесь описываются функции и действия, которые вызываются кнопками
 """
 
+from .utils.logger import get_logger
+
+log = get_logger('ButtonFunctions')
+
 
 class ButtonAction:
     """Описание действия кнопки"""
@@ -141,11 +145,11 @@ class ButtonFunctions:
         if func_id in self._functions:
             try:
                 func_info = self._functions[func_id]
-                print(f"[ButtonFunctions] Вызов: {func_info['name']} (#{func_id})")
+                log.debug("Вызов: %s (#%s)", func_info['name'], func_id)
                 result = func_info['func'](*args, **kwargs)
                 results.append(result)
             except Exception as e:
-                print(f"[ButtonFunctions] Ошибка функции #{func_id}: {e}")
+                log.error("Ошибка функции #%s: %s", func_id, e)
         
         # Выполняем действия
         if func_id in self._actions:
@@ -153,7 +157,7 @@ class ButtonFunctions:
                 try:
                     self._execute_action(action)
                 except Exception as e:
-                    print(f"[ButtonFunctions] Ошибка действия: {e}")
+                    log.error("Ошибка действия: %s", e)
         
         return results[0] if results else None
 
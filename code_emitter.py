@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Эмиттер кода
+Пишет сгенерированный код напрямую в поток (io.StringIO или файл)
+с учётом уровня отступа - без промежуточных списков строк и
+повторных split/join больших фрагментов
+"""
+import io
+import re
+from contextlib import contextmanager
+from itertools import islice
+from typing import Optional, TextIO
+
+
+class CodeEmitter:
+    """
+    Построчный writer с отслеживанием отступов.
+
+    Строки разделяются '\\n' (как '\\n'.join), пустые строки пишутся без отступа.
+
+    Использование:
+        emitter = CodeEmitter()
+        emitter.line('.box {')
+        with emitter.indent():
+            emitter.line('position: absolute;')
+        emitter.line('}')
+        css = emitter.getvalue()
+
+        # Или сразу в файл
+        with open('style.css', 'w', encoding='utf-8') as f:
+            generator.write_css(CodeEmitter(f))
+    """
+
+    # Начало каждой непустой строки (для отступа готовых блоков за один проход)
+    _LINE_START = re.compile(r'^(?=.)', re.MULTILINE)
+
+    # Размер пачки строк для lines()
+    CHUNK_LINES = 1024
+
+    def __init__(self, stream: Optional[TextIO] = None, indent_unit: str = '    ', level: int = 0):
+        """
+        Args:
+            stream: Поток для записи (по умолчанию новый io.StringIO)
+            indent_unit: Строка одного уровня отступа
+            level: Начальный уровень отступа
+        """
+        self.stream = stream if stream is not None else io.StringIO()
+        self.indent_unit = indent_unit
+        self.level = level
+        self._prefix = indent_unit * level
+        self._empty = True
+        self.line_count = 0
+
+    @contextmanager
+    def indent(self, levels: int = 1):
+        """Увеличивает отступ внутри блока with"""
+        self._set_level(self.level + levels)
+        try:
+            yield self
+        finally:
+            self._set_level(self.level - levels)
+
+    def _set_level(self, level: int):
+        self.level = level
+        self._prefix = self.indent_unit * level
+
+    def _separate(self):
+        self.line_count += 1
+        if self._empty:
+            self._empty = False
+        else:
+            self.stream.write('\n')
+
+    def line(self, text: str = ''):
+        """Пишет одну строку с текущим отступом"""
+        self.line_count += 1
+        if self._empty:
+            self._empty = False
+            self.stream.write(self._prefix + text if text else '')
+        else:
+            self.stream.write('\n' + self._prefix + text if text else '\n')
+
+    def lines(self, texts):
+        """
+        Пишет несколько строк с текущим отступом.
+
+        Строки пишутся пачками по CHUNK_LINES - одна запись в поток на пачку,
+        без сборки всего фрагмента в памяти.
+        """
+        if isinstance(texts, (list, tuple)) and len(texts) <= self.CHUNK_LINES:
+            self._write_chunk(texts)
+            return
+        iterator = iter(texts)
+        while True:
+            chunk = list(islice(iterator, self.CHUNK_LINES))
+            if not chunk:
+                break
+            self._write_chunk(chunk)
+
+    def _write_chunk(self, texts):
+        if not texts:
+            return
+        prefix = self._prefix
+        if prefix:
+            texts = [prefix + text if text else '' for text in texts]
+        self._separate()
+        self.line_count += len(texts) - 1
+        self.stream.write('\n'.join(texts))
+
+    def block(self, text: str):
+        """Пишет готовый многострочный фрагмент, добавляя текущий отступ к каждой строке"""
+        self._separate()
+        if self._prefix:
+            text = self._LINE_START.sub(self._prefix, text)
+        self.stream.write(text)
+
+    def getvalue(self) -> str:
+        """Возвращает накопленный текст (только для io.StringIO)"""
+        return self.stream.getvalue()
+
+
+def iter_text_chunks(text: str, size: int = 64 * 1024):
+    """
+    Режет готовый текст на куски примерно по size символов по границам строк
+    (для постепенного вывода уже сгенерированного кода)
+    """
+    start = 0
+    length = len(text)
+    while start < length:
+        end = text.find('\n', start + size)
+        end = length if end < 0 else end + 1
+        yield text[start:end]
+        start = end
@@ -2,12 +2,18 @@
 """
 Генератор кода
 Преобразует элементы холста в HTML/CSS/JavaScript
+Код пишется через CodeEmitter прямо в поток (StringIO или файл)
 """
+import io
+from .code_emitter import CodeEmitter
 
 
 class CodeGenerator:
     """Генератор кода из элементов"""
 
+    # Сколько элементов попадает в один кусок iter_chunks()
+    CHUNK_ELEMENTS = 500
+
     def __init__(self):
         self.elements = []
         self.main_canvas = None
@@ -25,123 +31,234 @@ class CodeGenerator:
         self.elements = elements
         self.main_canvas = main_canvas
 
+    def set_scene(self, scene):
+        """Устанавливает сцену (SceneModel) - генерация без холста"""
+        self.set_elements(scene.elements, scene.canvas)
+
     def generate_all(self):
         """Генерирует полный HTML документ"""
-        html = self.generate_html()
-        css = self.generate_css()
-        js = self.generate_js()
-        
-        return f'''<!DOCTYPE html>
-<html lang="ru">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Generated Interface</title>
-    <style>
-{self._indent(css, 2)}
-    </style>
-</head>
-<body>
-{self._indent(html, 1)}
-    <script>
-{self._indent(js, 2)}
-    </script>
-</body>
-</html>'''
+        emitter = CodeEmitter()
+        self.write_document(emitter)
+        return emitter.getvalue()
+
+    def write_document(self, emitter, html=None, css=None, js=None):
+        """
+        Пишет полный HTML документ в эмиттер.
+        
+        Args:
+            emitter: CodeEmitter (поверх io.StringIO или файла)
+            html, css, js: Уже сгенерированные части (например из кеша).
+                Если не переданы - генерируются прямо в поток.
+        """
+        emitter.lines((
+            '<!DOCTYPE html>',
+            '<html lang="ru">',
+            '<head>',
+            '    <meta charset="UTF-8">',
+            '    <meta name="viewport" content="width=device-width, initial-scale=1.0">',
+            '    <title>Generated Interface</title>',
+            '    <style>',
+        ))
+        with emitter.indent(2):
+            self._write_part(emitter, css, self.write_css)
+        emitter.lines(('    </style>', '</head>', '<body>'))
+        with emitter.indent(1):
+            self._write_part(emitter, html, self.write_html)
+        emitter.line('    <script>')
+        with emitter.indent(2):
+            self._write_part(emitter, js, self.write_js)
+        emitter.lines(('    </script>', '</body>', '</html>'))
+
+    def _write_part(self, emitter, text, writer):
+        """Пишет готовый текст или генерирует часть прямо в поток"""
+        if text is not None:
+            emitter.block(text)
+            return
+        
+        before = emitter.line_count
+        writer(emitter)
+        if emitter.line_count == before:
+            # Пустая часть всё равно занимает строку документа
+            emitter.line()
 
     def generate_html(self):
         """Генерирует HTML разметку"""
-        lines = []
-        
+        emitter = CodeEmitter()
+        self.write_html(emitter)
+        return emitter.getvalue()
+
+    def write_html(self, emitter):
+        """Пишет HTML разметку в эмиттер"""
+        for _ in self._html_steps(emitter):
+            pass
+
+    def _html_steps(self, emitter, batch=None, elements=None):
+        """Пишет HTML разметку, останавливаясь (yield) после каждой пачки элементов"""
         if self.settings['include_comments']:
-            lines.append('<!-- Generated Interface -->')
+            emitter.line('<!-- Generated Interface -->')
         
         # Контейнер (главная панель)
         if self.main_canvas:
-            lines.append(f'<div class="main-container" id="main-container">')
+            emitter.line('<div class="main-container" id="main-container">')
         
         # Элементы
-        for element in self.elements:
-            html = self._element_to_html(element)
-            if html:
-                lines.append(f'    {html}')
+        with emitter.indent():
+            for elements in self._element_batches(batch, elements):
+                emitter.lines(html for html in map(self._element_to_html, elements) if html)
+                yield
         
         if self.main_canvas:
-            lines.append('</div>')
-        
-        return '\n'.join(lines)
+            emitter.line('</div>')
 
     def generate_css(self):
         """Генерирует CSS стили"""
-        lines = []
-        
+        emitter = CodeEmitter()
+        self.write_css(emitter)
+        return emitter.getvalue()
+
+    def write_css(self, emitter):
+        """Пишет CSS стили в эмиттер"""
+        for _ in self._css_steps(emitter):
+            pass
+
+    def _css_steps(self, emitter, batch=None, elements=None):
+        """Пишет CSS стили, останавливаясь (yield) после каждой пачки элементов"""
+        self.write_base_css(emitter)
+        yield
+        
+        # Стили элементов (правило и пустая строка - одной записью)
+        for elements in self._element_batches(batch, elements):
+            for element in elements:
+                rule = self._element_css_lines(element)
+                rule.append('')
+                emitter.lines(rule)
+            yield
+
+    def generate_base_css(self):
+        """Генерирует общие CSS стили (без правил элементов)"""
+        emitter = CodeEmitter()
+        self.write_base_css(emitter)
+        return emitter.getvalue()
+
+    def write_base_css(self, emitter):
+        """Пишет общие CSS стили в эмиттер"""
         if self.settings['include_comments']:
-            lines.append('/* Generated Styles */')
-            lines.append('')
+            emitter.line('/* Generated Styles */')
+            emitter.line()
         
         # CSS переменные
         if self.settings['use_css_variables']:
-            lines.append(':root {')
-            lines.append('    --primary-color: #ffffff;')
-            lines.append('    --background-color: #000000;')
-            lines.append('    --border-color: #333333;')
-            lines.append('}')
-            lines.append('')
+            emitter.lines((
+                ':root {',
+                '    --primary-color: #ffffff;',
+                '    --background-color: #000000;',
+                '    --border-color: #333333;',
+                '}',
+                '',
+            ))
         
         # Базовые стили
-        lines.append('* {')
-        lines.append('    box-sizing: border-box;')
-        lines.append('    margin: 0;')
-        lines.append('    padding: 0;')
-        lines.append('}')
-        lines.append('')
+        emitter.lines((
+            '* {',
+            '    box-sizing: border-box;',
+            '    margin: 0;',
+            '    padding: 0;',
+            '}',
+            '',
+        ))
         
         # Стили главного контейнера
         if self.main_canvas:
-            lines.append('.main-container {')
-            lines.append('    position: relative;')
-            lines.append(f'    width: {self.main_canvas.width}px;')
-            lines.append(f'    height: {self.main_canvas.height}px;')
-            lines.append(f'    background-color: {self.main_canvas.properties.get("fill_color", "#000000")};')
-            stroke = self.main_canvas.properties.get("stroke_color", "#333333")
-            stroke_w = self.main_canvas.properties.get("stroke_width", 1)
-            if stroke and stroke_w:
-                lines.append(f'    border: {stroke_w}px solid {stroke};')
-            lines.append('    margin: 0 auto;')
-            lines.append('}')
-            lines.append('')
-        
-        # Стили элементов
-        for element in self.elements:
-            css = self._element_to_css(element)
-            if css:
-                lines.append(css)
-                lines.append('')
-        
-        return '\n'.join(lines)
+            emitter.line('.main-container {')
+            with emitter.indent():
+                emitter.line('position: relative;')
+                emitter.line(f'width: {self.main_canvas.width}px;')
+                emitter.line(f'height: {self.main_canvas.height}px;')
+                emitter.line(f'background-color: {self.main_canvas.properties.get("fill_color", "#000000")};')
+                stroke = self.main_canvas.properties.get("stroke_color", "#333333")
+                stroke_w = self.main_canvas.properties.get("stroke_width", 1)
+                if stroke and stroke_w:
+                    emitter.line(f'border: {stroke_w}px solid {stroke};')
+                emitter.line('margin: 0 auto;')
+            emitter.line('}')
+            emitter.line()
 
     def generate_js(self):
         """Генерирует JavaScript код"""
-        lines = []
-        
+        emitter = CodeEmitter()
+        self.write_js(emitter)
+        return emitter.getvalue()
+
+    def write_js(self, emitter):
+        """Пишет JavaScript код в эмиттер"""
+        for _ in self._js_steps(emitter):
+            pass
+
+    def _js_steps(self, emitter, batch=None, elements=None):
+        """Пишет JavaScript код, останавливаясь (yield) после каждой пачки элементов"""
         if self.settings['include_comments']:
-            lines.append('// Generated JavaScript')
-            lines.append('')
+            emitter.line('// Generated JavaScript')
+            emitter.line()
         
-        lines.append('document.addEventListener("DOMContentLoaded", function() {')
-        lines.append('    // Initialization')
-        lines.append('    console.log("Interface loaded");')
-        lines.append('')
+        emitter.lines((
+            'document.addEventListener("DOMContentLoaded", function() {',
+            '    // Initialization',
+            '    console.log("Interface loaded");',
+            '',
+        ))
         
         # Обработчики для элементов
-        for element in self.elements:
-            js = self._element_to_js(element)
-            if js:
-                lines.append(self._indent(js, 1))
-        
-        lines.append('});')
+        with emitter.indent():
+            for elements in self._element_batches(batch, elements):
+                for element in elements:
+                    self._write_element_js(emitter, element)
+                yield
         
-        return '\n'.join(lines)
+        emitter.line('});')
+
+    def _element_batches(self, batch=None, elements=None):
+        """Элементы (по умолчанию self.elements) пачками по batch (None - все одной пачкой)"""
+        if elements is None:
+            elements = self.elements
+        if not batch or batch >= len(elements):
+            yield elements
+            return
+        for start in range(0, len(elements), batch):
+            yield elements[start:start + batch]
+
+    def iter_chunks(self, part='html', batch=None):
+        """
+        Генерирует часть кода кусками (для постепенного вывода в UI).
+        
+        Args:
+            part: 'html', 'css' или 'js'
+            batch: Элементов в одном куске (по умолчанию CHUNK_ELEMENTS)
+        
+        Yields:
+            str: Очередной кусок кода. Склейка кусков совпадает с generate_<part>()
+        """
+        steps = {
+            'html': self._html_steps,
+            'css': self._css_steps,
+            'js': self._js_steps,
+        }.get(part)
+        if steps is None:
+            raise ValueError(f"Неизвестная часть кода: {part}")
+        
+        # Снимок списка: между кусками set_elements() может заменить элементы
+        elements = list(self.elements)
+        stream = io.StringIO()
+        emitter = CodeEmitter(stream)
+        for _ in steps(emitter, batch or self.CHUNK_ELEMENTS, elements):
+            chunk = stream.getvalue()
+            if chunk:
+                stream.seek(0)
+                stream.truncate()
+                yield chunk
+        
+        chunk = stream.getvalue()
+        if chunk:
+            yield chunk
 
     def _element_to_html(self, element):
         """Преобразует элемент в HTML"""
@@ -157,6 +274,10 @@ class CodeGenerator:
 
     def _element_to_css(self, element):
         """Преобразует свойства элемента в CSS"""
+        return '\n'.join(self._element_css_lines(element))
+
+    def _element_css_lines(self, element):
+        """Строки CSS правила элемента (правило пишется в эмиттер одной записью)"""
         el_id = element.id.replace('_', '-')
         props = element.properties
         
@@ -251,20 +372,28 @@ class CodeGenerator:
             lines.append(f'    outline-offset: {gap}px;')
         
         lines.append('}')
-        return '\n'.join(lines)
+        return lines
 
     def _element_to_js(self, element):
         """Генерирует JavaScript для элемента"""
+        return '\n'.join(self._element_js_lines(element))
+
+    def _write_element_js(self, emitter, element):
+        """Пишет JavaScript элемента в эмиттер"""
+        emitter.lines(self._element_js_lines(element))
+
+    def _element_js_lines(self, element):
+        """Строки JavaScript элемента"""
         el_id = element.id.replace('_', '-')
-        
-        lines = []
-        lines.append(f'// Element: {el_id}')
-        lines.append(f'const {el_id.replace("-", "_")} = document.getElementById("{el_id}");')
-        lines.append(f'{el_id.replace("-", "_")}.addEventListener("click", function(e) {{')
-        lines.append(f'    console.log("Clicked: {el_id}");')
-        lines.append('});')
-        
-        return '\n'.join(lines)
+        var_name = el_id.replace("-", "_")
+        
+        return (
+            f'// Element: {el_id}',
+            f'const {var_name} = document.getElementById("{el_id}");',
+            f'{var_name}.addEventListener("click", function(e) {{',
+            f'    console.log("Clicked: {el_id}");',
+            '});',
+        )
 
     def _line_style_to_css(self, style):
         """Преобразует стиль линии в CSS"""
@@ -279,8 +408,9 @@ class CodeGenerator:
 
     def _indent(self, text, level):
         """Добавляет отступы"""
-        indent = '    ' * level
-        return '\n'.join(indent + line if line else '' for line in text.split('\n'))
+        emitter = CodeEmitter(level=level)
+        emitter.block(text)
+        return emitter.getvalue()
 
     # === Экспорт отдельных частей ===
     
@@ -298,44 +428,57 @@ class CodeGenerator:
 
     def export_react_component(self):
         """Экспортирует как React компонент"""
-        lines = []
-        lines.append('import React from "react";')
-        lines.append('import "./styles.css";')
-        lines.append('')
-        lines.append('export default function GeneratedInterface() {')
-        lines.append('    return (')
-        lines.append('        <div className="main-container">')
-        
-        for element in self.elements:
-            el_id = element.id.replace('_', '-')
-            el_type = element.ELEMENT_TYPE
-            lines.append(f'            <div className="{el_type} {el_id}" />')
-        
-        lines.append('        </div>')
-        lines.append('    );')
-        lines.append('}')
-        
-        return '\n'.join(lines)
+        emitter = CodeEmitter()
+        self.write_react_component(emitter)
+        return emitter.getvalue()
+
+    def write_react_component(self, emitter):
+        """Пишет React компонент в эмиттер"""
+        emitter.lines((
+            'import React from "react";',
+            'import "./styles.css";',
+            '',
+            'export default function GeneratedInterface() {',
+            '    return (',
+            '        <div className="main-container">',
+        ))
+        
+        with emitter.indent(3):
+            emitter.lines(
+                f'<div className="{element.ELEMENT_TYPE} {element.id.replace("_", "-")}" />'
+                for element in self.elements
+            )
+        
+        emitter.lines((
+            '        </div>',
+            '    );',
+            '}',
+        ))
 
     def export_vue_component(self):
         """Экспортирует как Vue компонент"""
-        html = self.generate_html()
-        css = self.generate_css()
-        
-        return f'''<template>
-{self._indent(html, 1)}
-</template>
-
-<script>
-export default {{
-    name: "GeneratedInterface",
-    mounted() {{
-        console.log("Interface loaded");
-    }}
-}}
-</script>
-
-<style scoped>
-{css}
-</style>'''
+        emitter = CodeEmitter()
+        self.write_vue_component(emitter)
+        return emitter.getvalue()
 
+    def write_vue_component(self, emitter):
+        """Пишет Vue компонент в эмиттер"""
+        emitter.line('<template>')
+        with emitter.indent():
+            self._write_part(emitter, None, self.write_html)
+        emitter.lines((
+            '</template>',
+            '',
+            '<script>',
+            'export default {',
+            '    name: "GeneratedInterface",',
+            '    mounted() {',
+            '        console.log("Interface loaded");',
+            '    }',
+            '}',
+            '</script>',
+            '',
+            '<style scoped>',
+        ))
+        self.write_css(emitter)
+        emitter.line('</style>')
@@ -190,10 +190,12 @@ class ComponentManager:
         # ID mapping (старый -> новый)
         id_mapping = {}
         
-        # Размещаем элементы
+        # Описания элементов
+        specs = []
         for elem_data in component.elements:
             # Создаём копию данных
             new_data = elem_data.copy()
+            new_data.setdefault('type', 'panel')
             
             # Смещаем позицию
             new_data['x'] = elem_data.get('x', 0) + x
@@ -204,23 +206,10 @@ class ComponentManager:
             new_id = f"{old_id}_{uuid.uuid4().hex[:4]}"
             new_data['id'] = new_id
             id_mapping[old_id] = new_id
-            
-            # Создаём элемент
-            elem_type = new_data.get('type', 'panel')
-            new_elem = self.element_manager.create_element(
-                elem_type,
-                new_data['x'],
-                new_data['y'],
-                new_data.get('width', 100),
-                new_data.get('height', 100)
-            )
-            
-            if new_elem:
-                # Применяем свойства
-                new_elem.from_dict(new_data)
-                new_elem.id = new_id
-                new_elem.update()
-                placed['elements'].append(new_elem)
+            specs.append(new_data)
+        
+        # Размещаем элементы одной пачкой (без перерисовки сцены на каждый)
+        placed['elements'] = self.element_manager.create_elements_bulk(specs, validate=False)
         
         # Размещаем механизмы
         for mech_data in component.mechanisms:
@@ -81,6 +81,7 @@ class Config:
     CONTROL_PANEL_SIDE = tk.LEFT
     CONTROL_PANEL_FILL = tk.Y
     CONTROL_PANEL_EXPAND = False
+    TAB_PREBUILD_IDLE = True          # Строить скрытые вкладки в фоне после запуска
 
     # ============================================
     # ОСНОВНАЯ ПАНЕЛЬ (справа от боковой)
@@ -210,3 +211,21 @@ class Config:
     WORK_ZONE_MAX_SIZE = 5000
     WORK_ZONE_COLOR = BG_INSET
     CANVAS_BG = BG_CANVAS
+
+    # ============================================
+    # КОНТРОЛЬ ОБЪЕКТОВ ХОЛСТА (отладка)
+    # ============================================
+    CANVAS_AUDIT_ENABLED = False      # Периодическая проверка утечек (Ctrl+F12 - разовая)
+    CANVAS_AUDIT_INTERVAL_MS = 5000
+    CANVAS_ITEM_BUDGET = 5000         # Бюджет объектов холста на сцену
+
+    # ============================================
+    # РЕЖИМ ПРОСМОТРА
+    # ============================================
+    PREVIEW_TARGET_FPS = 60           # Частота общего кадрового цикла
+    PREVIEW_STATIC_CACHE = True       # Статические элементы - одним изображением (нужен Pillow)
+
+    # ============================================
+    # ЛОКАЛЬНЫЙ ИИ (GPT4All)
+    # ============================================
+    AI_IDLE_UNLOAD_SECONDS = 600      # Выгрузить модель после простоя (0 - не выгружать)
@@ -4,11 +4,88 @@
 """
 
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+from tkinter import ttk, filedialog, messagebox, font as tkfont
 import os
-import re
+import queue
+import threading
 from typing import Dict, Any, List, Optional
 from .base import FunctionalArtifact, ArtifactRegistry
+from ...utils.safe_exec import safe_exec
+from ...utils.sandbox_pool import get_sandbox_pool
+from ...utils.syntax_highlight import KEYWORDS as LANGUAGE_KEYWORDS, TextHighlighter
+
+
+class LineNumberGutter(tk.Canvas):
+    """
+    Номера строк на Canvas.
+    Рисуются только видимые строки (по dlineinfo редактора),
+    элементы холста переиспользуются между перерисовками.
+    """
+    
+    PADDING = 6
+    
+    def __init__(self, parent, editor: tk.Text, font, fg: str, bg: str):
+        super().__init__(parent, bg=bg, highlightthickness=0, bd=0)
+        self.editor = editor
+        self.fg = fg
+        self.font = tkfont.Font(font=font)
+        self._items: List[int] = []
+        self._digits = 0
+        self._after_id = None
+        self._update_width(1)
+        
+    def set_font(self, font):
+        """Меняет шрифт номеров"""
+        self.font = tkfont.Font(font=font)
+        for item in self._items:
+            self.itemconfig(item, font=self.font)
+        self._digits = 0
+        self.schedule()
+        
+    def schedule(self, *args):
+        """Перерисовка в after_idle (частые вызовы объединяются)"""
+        if self._after_id is None:
+            self._after_id = self.after_idle(self.redraw)
+            
+    def _update_width(self, line_count: int):
+        digits = max(2, len(str(line_count)))
+        if digits != self._digits:
+            self._digits = digits
+            self.config(width=self.font.measure('0' * digits) + self.PADDING * 2)
+            
+    def redraw(self):
+        """Рисует номера видимых строк"""
+        self._after_id = None
+        if not self.winfo_exists():
+            return
+        
+        self._update_width(int(self.editor.index('end-1c').split('.')[0]))
+        x = int(self.cget('width')) - self.PADDING
+        
+        used = 0
+        index = self.editor.index('@0,0')
+        while True:
+            info = self.editor.dlineinfo(index)
+            if info is None:
+                break
+            line = index.split('.')[0]
+            if used < len(self._items):
+                item = self._items[used]
+                self.coords(item, x, info[1])
+                self.itemconfig(item, text=line, state='normal')
+            else:
+                self._items.append(self.create_text(x, info[1], anchor='ne', text=line,
+                                                    font=self.font, fill=self.fg))
+            used += 1
+            
+            next_index = self.editor.index(f'{line}.0+1line')
+            if next_index.split('.')[0] == line:
+                break  # Последняя строка
+            index = next_index
+            
+        # Лишние элементы прячем (не удаляем - пригодятся при прокрутке)
+        for item in self._items[used:]:
+            self.itemconfig(item, state='hidden')
 
 
 class CodeEditorArtifact(FunctionalArtifact):
@@ -35,17 +112,10 @@ class CodeEditorArtifact(FunctionalArtifact):
     }
     
     # Ключевые слова по языкам
-    KEYWORDS = {
-        'python': ['def', 'class', 'if', 'elif', 'else', 'for', 'while', 'try', 
-                   'except', 'finally', 'with', 'as', 'import', 'from', 'return',
-                   'yield', 'lambda', 'pass', 'break', 'continue', 'and', 'or',
-                   'not', 'in', 'is', 'True', 'False', 'None', 'self', 'async', 'await'],
-        'javascript': ['function', 'const', 'let', 'var', 'if', 'else', 'for', 
-                       'while', 'return', 'class', 'new', 'this', 'true', 'false',
-                       'null', 'undefined', 'async', 'await', 'import', 'export',
-                       'default', 'try', 'catch', 'finally', 'throw'],
-        'json': ['true', 'false', 'null'],
-    }
+    KEYWORDS = LANGUAGE_KEYWORDS
+    
+    # Интервал опроса результата выполнения (мс)
+    RUN_POLL_MS = 50
     
     def __init__(self, parent_canvas, x, y, width=450, height=400, config=None):
         default_config = {
@@ -72,6 +142,9 @@ class CodeEditorArtifact(FunctionalArtifact):
         self.history: List[str] = []
         self.history_index = -1
         
+        # Поток ожидания результата sandbox
+        self._run_thread: Optional[threading.Thread] = None
+        
     def _build_content(self):
         """Строит контент редактора"""
         # Панель вкладок файлов
@@ -92,6 +165,9 @@ class CodeEditorArtifact(FunctionalArtifact):
         # Загружаем файл
         self._load_file(self.current_file)
         
+        # Процессы sandbox запускаются заранее, к первому "Запуску" они уже готовы
+        get_sandbox_pool()
+        
     def _create_file_tabs(self):
         """Создаёт вкладки файлов"""
         tabs_frame = tk.Frame(self.content_frame, bg=self.COLOR_BG_DARK, height=28)
@@ -180,14 +256,6 @@ class CodeEditorArtifact(FunctionalArtifact):
         editor_frame = tk.Frame(self.content_frame, bg=self.COLOR_BG)
         editor_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Номера строк
-        self.line_numbers = tk.Text(editor_frame, width=4, padx=4, pady=4,
-                                    font=(self.config['font_family'], self.config['font_size']),
-                                    bg=self.COLOR_BG_DARK, fg=self.COLOR_TEXT_MUTED,
-                                    relief='flat', state='disabled',
-                                    highlightthickness=0, bd=0)
-        self.line_numbers.pack(side=tk.LEFT, fill=tk.Y)
-        
         # Редактор кода
         self.editor = tk.Text(editor_frame, padx=8, pady=4,
                              font=(self.config['font_family'], self.config['font_size']),
@@ -196,12 +264,25 @@ class CodeEditorArtifact(FunctionalArtifact):
                              selectbackground=self.COLOR_ACCENT,
                              relief='flat', highlightthickness=0,
                              undo=True, wrap='none' if not self.config['word_wrap'] else 'word')
+        
+        # Номера строк (только видимые, синхронно с yview редактора)
+        self.line_numbers = LineNumberGutter(editor_frame, self.editor,
+                                             font=(self.config['font_family'], self.config['font_size']),
+                                             fg=self.COLOR_TEXT_MUTED, bg=self.COLOR_BG_DARK)
+        if self.config['show_line_numbers']:
+            self.line_numbers.pack(side=tk.LEFT, fill=tk.Y)
         self.editor.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
         # Скроллбар
         scrollbar = ttk.Scrollbar(editor_frame, orient='vertical', command=self._on_scroll)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.editor.config(yscrollcommand=scrollbar.set)
+        self._scrollbar = scrollbar
+        
+        # Подсветка: только изменённые и видимые строки
+        self.highlighter = TextHighlighter(self.editor)
+        self.highlighter.set_yscroll_target(self._on_editor_yscroll)
+        self.editor.config(yscrollcommand=self.highlighter.view_changed)
+        self.editor.bind('<Configure>', self.line_numbers.schedule, add='+')
         
         # Привязка событий
         self.editor.bind('<KeyRelease>', self._on_key_release)
@@ -265,14 +346,17 @@ class CodeEditorArtifact(FunctionalArtifact):
                 fg=self.COLOR_ACCENT, bg=self.COLOR_BG_DARK).pack(side=tk.RIGHT, padx=8)
         
     def _on_scroll(self, *args):
-        """Синхронизация скролла"""
+        """Прокрутка скроллбаром (номера строк догоняют через yscrollcommand)"""
         self.editor.yview(*args)
-        self.line_numbers.yview(*args)
+        
+    def _on_editor_yscroll(self, first, last):
+        """yscrollcommand редактора: скроллбар и номера строк"""
+        self._scrollbar.set(first, last)
+        self.line_numbers.schedule()
         
     def _on_key_release(self, event=None):
         """Обработка ввода"""
         self._update_line_numbers()
-        self._highlight_syntax()
         self._update_cursor_position()
         
     def _on_enter(self, event):
@@ -294,18 +378,15 @@ class CodeEditorArtifact(FunctionalArtifact):
         return 'break'
         
     def _on_modified(self, event=None):
-        """Отслеживание изменений"""
+        """Отслеживание изменений (ввод, вставка, вырезание)"""
+        if not self.editor.edit_modified():
+            return
         self.editor.edit_modified(False)
+        self.highlighter.notify_edit()
         
     def _update_line_numbers(self):
-        """Обновляет номера строк"""
-        self.line_numbers.config(state='normal')
-        self.line_numbers.delete('1.0', 'end')
-        
-        lines = self.editor.get('1.0', 'end').count('\n')
-        line_nums = '\n'.join(str(i) for i in range(1, lines + 1))
-        self.line_numbers.insert('1.0', line_nums)
-        self.line_numbers.config(state='disabled')
+        """Обновляет номера строк (перерисовываются только видимые)"""
+        self.line_numbers.schedule()
         
     def _update_cursor_position(self):
         """Обновляет позицию курсора в статус баре"""
@@ -314,70 +395,9 @@ class CodeEditorArtifact(FunctionalArtifact):
         self.status_line.set(f"Строка {line}, Столбец {int(col) + 1}")
         
     def _highlight_syntax(self):
-        """Подсветка синтаксиса"""
-        # Удаляем все теги
-        for tag in self.SYNTAX_COLORS:
-            self.editor.tag_remove(tag, '1.0', 'end')
-            
-        content = self.editor.get('1.0', 'end')
+        """Подсветка синтаксиса заново (после загрузки или полной замены текста)"""
         lang = self.files[self.current_file].get('language', 'text')
-        
-        # Ключевые слова
-        keywords = self.KEYWORDS.get(lang, [])
-        for keyword in keywords:
-            start = '1.0'
-            while True:
-                pos = self.editor.search(r'\m' + keyword + r'\M', start, 
-                                         stopindex='end', regexp=True)
-                if not pos:
-                    break
-                end = f"{pos}+{len(keyword)}c"
-                self.editor.tag_add('keyword', pos, end)
-                start = end
-                
-        # Строки
-        for pattern, tag in [(r'"[^"]*"', 'string'), (r"'[^']*'", 'string')]:
-            start = '1.0'
-            while True:
-                pos = self.editor.search(pattern, start, stopindex='end', regexp=True)
-                if not pos:
-                    break
-                # Находим конец строки
-                match_text = self.editor.get(pos, 'end').split('\n')[0]
-                match = re.match(pattern, match_text)
-                if match:
-                    end = f"{pos}+{len(match.group())}c"
-                    self.editor.tag_add(tag, pos, end)
-                    start = end
-                else:
-                    start = f"{pos}+1c"
-                    
-        # Комментарии
-        comment_char = '#' if lang == 'python' else '//'
-        start = '1.0'
-        while True:
-            pos = self.editor.search(comment_char, start, stopindex='end')
-            if not pos:
-                break
-            end = f"{pos} lineend"
-            self.editor.tag_add('comment', pos, end)
-            start = f"{pos}+1l"
-            
-        # Числа
-        start = '1.0'
-        while True:
-            pos = self.editor.search(r'\d+', start, stopindex='end', regexp=True)
-            if not pos:
-                break
-            # Находим длину числа
-            text = self.editor.get(pos, 'end')
-            match = re.match(r'\d+', text)
-            if match:
-                end = f"{pos}+{len(match.group())}c"
-                self.editor.tag_add('number', pos, end)
-                start = end
-            else:
-                start = f"{pos}+1c"
+        self.highlighter.set_language(lang, self.KEYWORDS.get(lang, []))
                 
     def _load_file(self, filename: str):
         """Загружает файл в редактор"""
@@ -450,6 +470,7 @@ class CodeEditorArtifact(FunctionalArtifact):
         try:
             self.editor.edit_undo()
             self._on_key_release()
+            self._highlight_syntax()
         except tk.TclError:
             pass  # Нет действий для отмены
             
@@ -458,6 +479,7 @@ class CodeEditorArtifact(FunctionalArtifact):
         try:
             self.editor.edit_redo()
             self._on_key_release()
+            self._highlight_syntax()
         except tk.TclError:
             pass  # Нет действий для повтора
             
@@ -472,6 +494,7 @@ class CodeEditorArtifact(FunctionalArtifact):
                 formatted = json.dumps(json.loads(content), indent=2, ensure_ascii=False)
                 self.editor.delete('1.0', 'end')
                 self.editor.insert('1.0', formatted)
+                self._highlight_syntax()
                 self._log("✓ JSON отформатирован", 'success')
             else:
                 self._log("ℹ Форматирование для этого языка недоступно", 'info')
@@ -481,33 +504,57 @@ class CodeEditorArtifact(FunctionalArtifact):
         self._on_key_release()
         
     def _run_code(self):
-        """Выполняет код безопасно в sandbox"""
+        """Выполняет код в sandbox (отдельный процесс, интерфейс не блокируется)"""
         content = self.editor.get('1.0', 'end-1c')
         lang = self.files[self.current_file].get('language', 'text')
         
+        if lang != 'python':
+            self._log("ℹ Выполнение доступно только для Python", 'info')
+            return
+        if self._run_thread and self._run_thread.is_alive():
+            self._log("ℹ Код уже выполняется", 'info')
+            return
+            
         self._log("▶ Выполнение в sandbox...", 'info')
+        results = queue.Queue()
         
-        if lang == 'python':
+        def run():
             try:
-                from ..utils.safe_exec import safe_exec, SafeExecutionError
-                
-                # Выполняем в безопасном окружении
-                success, output, result = safe_exec(content)
+                success, output, _ = safe_exec(content, on_output=lambda text: results.put(('output', text)))
+                results.put(('done', success, output))
+            except Exception as e:
+                results.put(('error', e))
                 
-                if success:
-                    if output:
-                        self._log(output.strip(), 'info')
-                    self._log("✓ Выполнено успешно", 'success')
+        self._run_thread = threading.Thread(target=run, name='CodeEditorRun', daemon=True)
+        self._run_thread.start()
+        self._poll_run(results, streamed=False)
+        
+    def _poll_run(self, results: 'queue.Queue', streamed: bool):
+        """Забирает вывод выполнения в потоке Tk"""
+        try:
+            while True:
+                message = results.get_nowait()
+                kind = message[0]
+                if kind == 'output':
+                    streamed = True
+                    self._log(message[1].rstrip('\n'), 'info')
+                elif kind == 'done':
+                    _, success, output = message
+                    if success:
+                        if output and not streamed:
+                            self._log(output.strip(), 'info')
+                        self._log("✓ Выполнено успешно", 'success')
+                    else:
+                        self._log(f"✗ {output}", 'error')
+                    return
                 else:
-                    self._log(f"✗ {output}", 'error')
-                    
-            except ImportError:
-                # Fallback если модуль недоступен
-                self._log("⚠ Sandbox недоступен, выполнение отключено", 'error')
-            except Exception as e:
-                self._log(f"✗ Ошибка: {e}", 'error')
-        else:
-            self._log("ℹ Выполнение доступно только для Python", 'info')
+                    self._log(f"✗ Ошибка: {message[1]}", 'error')
+                    return
+        except queue.Empty:
+            pass
+        
+        if self.frame.winfo_exists():
+            self.frame.after(self.RUN_POLL_MS, self._poll_run, results, streamed)
             
     def _show_find(self):
         """Показывает диалог поиска"""
@@ -582,7 +629,7 @@ class CodeEditorArtifact(FunctionalArtifact):
         # Применяем размер шрифта
         font_size = settings.get('font_size', 11)
         self.editor.config(font=(self.config['font_family'], font_size))
-        self.line_numbers.config(font=(self.config['font_family'], font_size))
+        self.line_numbers.set_font((self.config['font_family'], font_size))
         
         # Номера строк
         if settings.get('show_line_numbers', True):
@@ -82,7 +82,7 @@ class CanvasController:
             self.zoom_system.zoom_in(center)
             self.refresh()
             emit('ui:zoom_changed', self.zoom_system.zoom)
-            log.debug(f"Zoom in: {self.zoom_system.zoom}")
+            log.debug("Zoom in: %s", self.zoom_system.zoom)
             
     def zoom_out(self, center: Optional[Tuple[int, int]] = None):
         """
@@ -95,7 +95,7 @@ class CanvasController:
             self.zoom_system.zoom_out(center)
             self.refresh()
             emit('ui:zoom_changed', self.zoom_system.zoom)
-            log.debug(f"Zoom out: {self.zoom_system.zoom}")
+            log.debug("Zoom out: %s", self.zoom_system.zoom)
             
     def zoom_reset(self):
         """Сбрасывает масштаб на 100%"""
@@ -198,7 +198,7 @@ class CanvasController:
             }
             self.canvas.config(cursor=cursors.get(tool, 'arrow'))
             
-        log.debug(f"Tool: {tool}")
+        log.debug("Tool: %s", tool)
         
     def get_tool(self) -> str:
         """Возвращает текущий инструмент"""
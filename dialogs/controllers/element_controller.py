@@ -56,7 +56,7 @@ class ElementController:
         if self.element_manager:
             self.element_manager.select(element)
             emit('element:selected', element)
-            log.debug(f"Selected: {element.id}")
+            log.debug("Selected: %s", element.id)
             
     def deselect(self):
         """Снимает выделение с текущего элемента"""
@@ -162,7 +162,7 @@ class ElementController:
         element = self.get_selected()
         if element and self._drag_start:
             emit('element:moved', element)
-            log.debug(f"Moved: {element.id} to ({element.x}, {element.y})")
+            log.debug("Moved: %s to (%s, %s)", element.id, element.x, element.y)
         self._drag_start = None
         
     # === Изменение размера ===
@@ -188,7 +188,7 @@ class ElementController:
         element = self.get_selected()
         if element:
             self._clipboard = element.to_dict()
-            log.debug(f"Copied: {element.id}")
+            log.debug("Copied: %s", element.id)
             
     def paste(self):
         """Вставляет элемент из буфера"""
@@ -201,12 +201,13 @@ class ElementController:
         data['x'] = data.get('x', 0) + 20
         data['y'] = data.get('y', 0) + 20
         
-        # Создаём новый элемент
-        element = self.element_manager.create_from_dict(data)
+        # Создаём новый элемент (ID копии заменяется на новый)
+        created = self.element_manager.create_elements_bulk([data], validate=False)
+        element = created[0] if created else None
         if element:
             self.select(element)
             emit('element:created', element)
-            log.debug(f"Pasted: {element.id}")
+            log.debug("Pasted: %s", element.id)
             
         return element
         
@@ -6,6 +6,11 @@
 """
 from abc import ABC, abstractmethod
 import uuid
+from ..scene.scene_model import DEFAULT_ELEMENT_PROPERTIES
+from ..utils.profiler import profiled
+from ..utils.logger import get_logger
+
+log = get_logger('ElementBase')
 
 
 class ElementBase(ABC):
@@ -18,73 +23,14 @@ class ElementBase(ABC):
     # ID счётчик
     _id_counter = 0
     
-    # Единая система свойств (все возможные свойства)
-    DEFAULT_PROPERTIES = {
-        # === Основные цвета ===
-        'fill_color': '',           # Цвет заливки (пустой = прозрачный)
-        'stroke_color': '#ffffff',  # Цвет обводки
-        'stroke_width': 2,          # Толщина обводки
-        'opacity': 100,             # Прозрачность (0-100)
-        
-        # === Геометрия ===
-        'shape': 'rectangle',       # rectangle, rounded, pill, chamfer
-        'display_mode': 'stroke',   # stroke, fill, both
-        'line_style': 'solid',      # solid, dashed, dotted, dash_dot, long_dash
-        
-        # === Углы ===
-        'corner_radius': 0,
-        'corner_tl': None,
-        'corner_tr': None,
-        'corner_bl': None,
-        'corner_br': None,
-        'chamfer_size': 10,
-        
-        # === Двойная рамка ===
-        'double_border': False,
-        'double_border_gap': 3,
-        'double_border_color': '',
-        
-        # === Тень ===
-        'shadow_enabled': False,
-        'shadow_x': 2,
-        'shadow_y': 2,
-        'shadow_color': '#000000',
-        
-        # === Внутренняя тень ===
-        'inset_shadow': False,
-        'inset_shadow_size': 5,
-        'inset_shadow_color': '#000000',
-        
-        # === Свечение ===
-        'glow_enabled': False,
-        'glow_radius': 5,
-        'glow_color': '#ffffff',
-        
-        # === Встроенный текст ===
-        'label_enabled': False,
-        'label_text': '',
-        'label_font': 'Arial',
-        'label_size': 12,
-        'label_color': '#ffffff',
-        'label_bold': False,
-        'label_italic': False,
-        'label_position': 'center',  # center, top, bottom, left, right, top-left, top-right, bottom-left, bottom-right
-        'label_offset_x': 0,
-        'label_offset_y': 0,
-        
-        # === Трансформации ===
-        'rotation': 0,              # Угол поворота (градусы)
-        'scale_x': 1.0,             # Масштаб по X
-        'scale_y': 1.0,             # Масштаб по Y
-        'flip_h': False,            # Отразить горизонтально
-        'flip_v': False,            # Отразить вертикально
-        
-        # === Анимация (базовая) ===
-        'animation_enabled': False,
-        'animation_type': 'none',   # none, pulse, bounce, shake, glow
-        'animation_speed': 1.0,
-        'animation_loop': True,
-    }
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Переопределённая перерисовка тоже попадает в профилировщик
+        if 'update' in cls.__dict__:
+            cls.update = profiled(f'element.update.{cls.__name__}')(cls.__dict__['update'])
+    
+    # Единая система свойств (все возможные свойства, см. scene.scene_model)
+    DEFAULT_PROPERTIES = DEFAULT_ELEMENT_PROPERTIES
     
     # Стили линий
     LINE_STYLES = {
@@ -370,7 +316,7 @@ class ElementBase(ABC):
                 try:
                     handler(self, data)
                 except Exception as e:
-                    print(f"[ElementBase] Event handler error: {e}")
+                    log.error("Event handler error: %s", e)
 
     # === Анимация (базовая) ===
     
@@ -390,6 +336,7 @@ class ElementBase(ABC):
         self._animation_state = {}
         self.update()
 
+    @profiled('element.animation')
     def _run_animation(self):
         """Выполняет кадр анимации"""
         if not self.properties.get('animation_enabled'):
@@ -502,6 +449,7 @@ class ElementBase(ABC):
 
     # === Управление ===
     
+    @profiled('element.update')
     def update(self):
         """Перерисовывает элемент"""
         self.clear()
@@ -518,6 +466,40 @@ class ElementBase(ABC):
                 pass  # Canvas item already deleted
         self.canvas_items = []
 
+    # === Отрисовка на другом холсте ===
+    
+    # Атрибуты, которые draw() заполняет помимо canvas_items (PhotoImage и т.п.)
+    DRAW_STATE = ()
+
+    def render_to(self, canvas, zoom_system, overrides=None):
+        """
+        Рисует элемент на другом холсте тем же draw(), что и в редакторе
+        (режим просмотра). Графика элемента в редакторе не затрагивается.
+        
+        Args:
+            canvas: Холст назначения
+            zoom_system: Преобразование координат (ZoomSystem со своим масштабом и смещением)
+            overrides: Свойства, временно заменяющие свойства элемента (например, цвет наведения)
+            
+        Returns:
+            (объекты холста, состояние DRAW_STATE) - состояние нужно
+            хранить, пока объекты на холсте
+        """
+        saved = (self.canvas, self.zoom_system, self.canvas_items, self.properties)
+        saved_state = {name: getattr(self, name) for name in self.DRAW_STATE}
+        self.canvas, self.zoom_system, self.canvas_items = canvas, zoom_system, []
+        if overrides:
+            self.properties = {**self.properties, **overrides}
+        try:
+            if self.is_visible:
+                self.draw()
+                self._draw_label()
+            return self.canvas_items, {name: getattr(self, name) for name in self.DRAW_STATE}
+        finally:
+            self.canvas, self.zoom_system, self.canvas_items, self.properties = saved
+            for name, value in saved_state.items():
+                setattr(self, name, value)
+
     def show(self):
         self.is_visible = True
         self.update()
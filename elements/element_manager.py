@@ -6,6 +6,7 @@
 Главная панель - отдельный модуль (MainCanvas), не является элементом
 """
 import tkinter as tk
+from typing import Dict, Iterable, List
 from .frame import FrameElement
 from .panel import PanelElement
 from .button import ButtonElement
@@ -16,6 +17,10 @@ from .state_switcher import StateSwitcherElement
 from .artifact import ArtifactElement
 from ..utils.event_bus import event_bus
 from ..size_constraints import SizeConstraints
+from ..ui_constraints import UIConstraints
+from ..utils.logger import get_logger
+
+log = get_logger('ElementManager')
 
 
 class ElementManager:
@@ -85,11 +90,7 @@ class ElementManager:
         if element_type not in self.ELEMENT_TYPES:
             return None
         
-        element_class = self.ELEMENT_TYPES[element_type]
-        element = element_class(self.canvas, self.config)
-        
-        if self.zoom_system:
-            element.set_zoom_system(self.zoom_system)
+        element = self._instantiate(element_type)
         
         element.x = x
         element.y = y
@@ -104,15 +105,122 @@ class ElementManager:
         
         self.elements.append(element)
         self.redraw_all()
+        event_bus.emit('element.created', {'element': element})
         self.select_element(element)
         
         return element
 
+    # Поля to_dict(), которые должны быть списками
+    _LIST_FIELDS = ('attached_mechanisms', 'children')
+
+    def create_elements_bulk(self, specs: Iterable[Dict], select: bool = True,
+                             clamp_to_canvas: bool = True, validate: bool = True) -> List:
+        """
+        Создаёт пачку элементов одной транзакцией (макет ИИ, заготовка, вставка, загрузка).
+        
+        Все описания сначала проверяются; затем элементы создаются без
+        перерисовки сцены и без событий на каждый элемент: каждый новый
+        элемент рисуется один раз, подписчики получают одно событие
+        'element.bulk_created', выбор меняется один раз. Описание, элемент
+        по которому создать не удалось, пропускается без следов на холсте.
+        
+        Args:
+            specs: Описания элементов - {'type', 'x', 'y', 'width', 'height'}
+                   или полный словарь to_dict() (свойства, флаги, 'id')
+            select: Выбрать последний созданный элемент
+            clamp_to_canvas: Удерживать элементы в пределах главной панели
+            validate: Корректировать размеры по SizeConstraints/UIConstraints
+                      (ответ ИИ, ввод пользователя). False - сохранённые данные
+                      (проект, заготовка, буфер обмена): геометрия как есть
+            
+        Returns:
+            Созданные элементы (в порядке описаний, невалидные пропущены)
+        """
+        canvas_bounds = None
+        if validate and clamp_to_canvas and self.main_canvas:
+            canvas_bounds = (int(self.main_canvas.width), int(self.main_canvas.height))
+        
+        # 1. Проверка всех описаний до создания чего-либо
+        prepared = []
+        used_ids = {element.id for element in self.elements}
+        for spec in specs:
+            if not isinstance(spec, dict):
+                log.warning("Пропущено описание элемента: %r", spec)
+                continue
+            element_type = spec.get('type')
+            if element_type not in self.ELEMENT_TYPES:
+                log.warning("Пропущен элемент неизвестного типа: %r", element_type)
+                continue
+            try:
+                geometry = {name: float(spec.get(name, default)) for name, default in
+                            (('x', 0), ('y', 0), ('width', 100), ('height', 100))}
+            except (TypeError, ValueError):
+                log.warning("Пропущен элемент %s с некорректной геометрией: %r", element_type, spec)
+                continue
+            if not isinstance(spec.get('properties', {}), dict) or any(
+                    not isinstance(spec.get(name, []), list) for name in self._LIST_FIELDS):
+                log.warning("Пропущен элемент %s с некорректными полями: %r", element_type, spec)
+                continue
+            corrected = {}
+            if validate:
+                _, _, corrected = UIConstraints.validate_element_creation(
+                    element_type, geometry['x'], geometry['y'],
+                    geometry['width'], geometry['height'], canvas_bounds
+                )
+            element_id = spec.get('id')
+            if element_id in used_ids:
+                element_id = None  # Вставка копии - новый ID
+            if element_id:
+                used_ids.add(element_id)
+            prepared.append((element_type, spec, corrected, element_id))
+        
+        # 2. Создание: без redraw_all и событий на каждый элемент
+        created = []
+        with event_bus.suspend():
+            for element_type, spec, corrected, element_id in prepared:
+                element = None
+                try:
+                    element = self._instantiate(element_type)
+                    if element_id:
+                        element.id = element_id
+                    if element_type == 'artifact' and spec.get('artifact_type') and hasattr(element, 'set_artifact_type'):
+                        element.set_artifact_type(spec['artifact_type'])
+                    
+                    data = dict(spec)
+                    data.update(corrected)
+                    # from_dict применяет свойства и рисует элемент
+                    element.from_dict(data)
+                except Exception as e:
+                    log.warning("Элемент %s не создан: %s", element_type, e)
+                    if element is not None:
+                        element.clear()
+                    continue
+                created.append(element)
+        
+        if not created:
+            return created
+        self.elements.extend(created)
+        
+        # 3. Одно событие и одна смена выбора на всю пачку
+        event_bus.emit('element.bulk_created', {'elements': created})
+        if select:
+            self.select_element(created[-1])
+        log.debug("Создано элементов пачкой: %d", len(created))
+        return created
+
+    def _instantiate(self, element_type):
+        """Экземпляр элемента типа (ещё не добавлен в сцену)"""
+        element = self.ELEMENT_TYPES[element_type](self.canvas, self.config)
+        if self.zoom_system:
+            element.set_zoom_system(self.zoom_system)
+        return element
+
     def delete_element(self, element):
         """Удаляет элемент"""
         if element in self.elements:
             element.clear()
             self.elements.remove(element)
+            event_bus.emit('element.deleted', {'element': element})
             
             if self.selected_element == element:
                 self.selected_element = None
@@ -129,6 +237,7 @@ class ElementManager:
             element.clear()
         self.elements = []
         self.selected_element = None
+        event_bus.emit('element.cleared', {})
         self._notify_selection_change()
 
     def select_element(self, element):
@@ -191,8 +300,8 @@ class ElementManager:
             
             # Логируем если размеры изменились
             if (width, height) != original_size:
-                print(f"[ElementManager] Размеры {element_type} скорректированы при изменении: "
-                      f"{original_size[0]}×{original_size[1]} → {width}×{height}")
+                log.info("Размеры %s скорректированы при изменении: %s×%s → %s×%s",
+                         element_type, original_size[0], original_size[1], width, height)
             
             self.selected_element.resize(width, height)
             event_bus.emit('element.resized', {'element': self.selected_element})
@@ -385,12 +494,20 @@ class ElementManager:
             element.clear()
         self.elements = []
         self.selected_element = None
+        event_bus.emit('element.cleared', {})
         self._notify_selection_change()
 
     def get_all_elements(self):
         """Возвращает список всех элементов"""
         return self.elements.copy()
 
+    def get_canvas_items(self):
+        """Все объекты холста элементов и превью создания"""
+        items = list(self._preview_items)
+        for element in self.elements:
+            items.extend(element.canvas_items)
+        return items
+
     # === Управление порядком слоёв ===
     
     def bring_to_front(self, element):
@@ -415,6 +532,7 @@ class ElementManager:
                 self.elements.remove(element)
                 self.elements.insert(index + 1, element)
                 self._redraw_all()
+                event_bus.emit('element.reordered', {'element': element})
 
     def move_down(self, element):
         """Перемещает элемент на один уровень ниже"""
@@ -424,6 +542,7 @@ class ElementManager:
                 self.elements.remove(element)
                 self.elements.insert(index - 1, element)
                 self._redraw_all()
+                event_bus.emit('element.reordered', {'element': element})
 
     def _redraw_all(self):
         """Перерисовывает все элементы в правильном порядке"""
@@ -440,6 +559,7 @@ class ElementManager:
             self.elements.remove(element)
             self.elements.append(element)
             self.redraw_all()
+            event_bus.emit('element.reordered', {'element': element})
 
     def send_to_back(self, element):
         """Перемещает элемент на задний план"""
@@ -447,6 +567,7 @@ class ElementManager:
             self.elements.remove(element)
             self.elements.insert(0, element)
             self.redraw_all()
+            event_bus.emit('element.reordered', {'element': element})
 
     def to_dict(self):
         """Сериализует все элементы"""
@@ -464,3 +585,4 @@ class ElementManager:
                     element.set_zoom_system(self.zoom_system)
                 element.from_dict(item)
                 self.elements.append(element)
+        event_bus.emit('element.loaded', {})
@@ -6,20 +6,30 @@
 from ..element_base import ElementBase
 from tkinter import filedialog
 import os
+from ...utils.logger import get_logger
 
-# Пробуем импортировать PIL для работы с изображениями
-PIL_AVAILABLE = False
+log = get_logger('ImageElement')
+
+# PIL импортируется при первой загрузке изображения, а не при старте
+PIL_AVAILABLE = None  # None - ещё не проверяли
 Image = None
 ImageTk = None
 
-try:
-    from PIL import Image as PILImage
-    from PIL import ImageTk as PILImageTk
-    Image = PILImage
-    ImageTk = PILImageTk
-    PIL_AVAILABLE = True
-except ImportError:
-    pass
+
+def _ensure_pil() -> bool:
+    """Импортирует PIL при первом вызове; False если он не установлен"""
+    global PIL_AVAILABLE, Image, ImageTk
+    if PIL_AVAILABLE is None:
+        try:
+            from PIL import Image as PILImage
+            from PIL import ImageTk as PILImageTk
+            Image = PILImage
+            ImageTk = PILImageTk
+            PIL_AVAILABLE = True
+        except ImportError:
+            PIL_AVAILABLE = False
+            log.warning("PIL не установлен - изображения не отображаются")
+    return PIL_AVAILABLE
 
 
 class ImageElement(ElementBase):
@@ -28,6 +38,9 @@ class ImageElement(ElementBase):
     ELEMENT_TYPE = "image"
     ELEMENT_SYMBOL = "🖼"
 
+    # PhotoImage на каждом холсте свой (см. render_to)
+    DRAW_STATE = ('_display_image', '_image_item')
+
     def __init__(self, canvas, config):
         super().__init__(canvas, config)
         
@@ -81,7 +94,7 @@ class ImageElement(ElementBase):
         self.canvas_items.append(bg)
 
         # 3. Изображение
-        if self.properties['image_path'] and PIL_AVAILABLE:
+        if self.properties['image_path'] and _ensure_pil():
             self._draw_image(x1, y1, x2, y2)
         elif not self.properties['image_path']:
             # Рисуем placeholder
@@ -155,7 +168,7 @@ class ImageElement(ElementBase):
 
     def _draw_image(self, x1, y1, x2, y2):
         """Рисует загруженное изображение"""
-        if not PIL_AVAILABLE:
+        if not _ensure_pil():
             return
         
         try:
@@ -198,11 +211,11 @@ class ImageElement(ElementBase):
             self.canvas_items.append(self._image_item)
             
         except Exception as e:
-            print(f"[ImageElement] Ошибка отрисовки: {e}")
+            log.error("Ошибка отрисовки: %s", e)
 
     def _load_image(self):
         """Загружает изображение из файла"""
-        if not PIL_AVAILABLE:
+        if not _ensure_pil():
             return
         
         path = self.properties.get('image_path', '')
@@ -216,7 +229,7 @@ class ImageElement(ElementBase):
             if self._original_image.mode != 'RGBA':
                 self._original_image = self._original_image.convert('RGBA')
         except Exception as e:
-            print(f"[ImageElement] Ошибка загрузки {path}: {e}")
+            log.error("Ошибка загрузки %s: %s", path, e)
             self._original_image = None
 
     def _resize_image(self, target_width, target_height):
@@ -6,6 +6,8 @@
 """
 import tkinter as tk
 
+from .utils.debounce import FrameThrottler
+
 
 class EventHandlers:
     """Класс для обработки событий мыши и клавиатуры"""
@@ -37,6 +39,9 @@ class EventHandlers:
         self._resize_handle = None
         self._resize_start_bounds = None
         self._pan_start = None
+        
+        # Перетаскивание/resize/панорамирование - не чаще одного раза за кадр
+        self._drag_frame = FrameThrottler(app.root)
     
     def bind_events(self):
         """Привязывает все события к холсту и окну"""
@@ -155,7 +160,11 @@ class EventHandlers:
             app.selection_system.on_mouse_press(event)
     
     def _on_mouse_drag(self, event):
-        """Обработчик перетаскивания"""
+        """Обработчик перетаскивания (события мыши схлопываются до одного за кадр)"""
+        self._drag_frame.call(self._apply_mouse_drag, event)
+    
+    def _apply_mouse_drag(self, event):
+        """Применяет последнее положение мыши при перетаскивании"""
         app = self.app
         
         # Создание элемента
@@ -248,6 +257,8 @@ class EventHandlers:
     def _on_mouse_release(self, event):
         """Обработчик отпускания мыши"""
         app = self.app
+        # Последнее положение применяется до завершения перетаскивания
+        self._drag_frame.flush()
         
         # Завершение создания механизма
         if app.mechanism_manager.is_creating():
@@ -268,13 +279,8 @@ class EventHandlers:
             real_x, real_y = app.zoom_system.screen_to_real(event.x, event.y)
             element = app.element_manager.on_create_end(real_x, real_y)
             if element:
-                app._update_elements_tab()
+                # Списки вкладок обновляются по событию element.created
                 app._update_size_fields()
-                if hasattr(app, 'tab_layers') and app.tab_layers:
-                    try:
-                        app.tab_layers.update()
-                    except (tk.TclError, AttributeError):
-                        pass  # Tab not ready
             app.canvas.config(cursor="arrow")
             return
         
@@ -347,7 +353,10 @@ class EventHandlers:
         self.app.canvas.config(cursor="fleur")
     
     def _on_pan_drag(self, event):
-        """Панорамирование"""
+        """Панорамирование (не чаще одного раза за кадр)"""
+        self._drag_frame.call(self._apply_pan_drag, event)
+    
+    def _apply_pan_drag(self, event):
         if self._pan_start:
             app = self.app
             dx = event.x - self._pan_start[0]
@@ -360,6 +369,7 @@ class EventHandlers:
     
     def _on_pan_end(self, event):
         """Конец панорамирования"""
+        self._drag_frame.flush()
         self._pan_start = None
         self.app.canvas.config(cursor="arrow")
     
@@ -5,6 +5,11 @@
 Сетка всегда отображается поверх всех элементов
 """
 
+from .utils.logger import get_logger
+from .utils.profiler import profiled
+
+log = get_logger('GridSystem')
+
 
 class GridSystem:
     """Управление сеткой на холсте"""
@@ -48,7 +53,7 @@ class GridSystem:
         new_size = self.grid_size + self.GRID_SIZE_STEP
         if new_size <= self.MAX_GRID_SIZE:
             self.grid_size = new_size
-            print(f"[GridSystem] Размер увеличен до {self.grid_size}px")
+            log.debug("Размер увеличен до %spx", self.grid_size)
             if self.grid_enabled:
                 self.draw_grid()
         return self.grid_size
@@ -74,6 +79,7 @@ class GridSystem:
         """Проверяет, включена ли сетка (для совместимости)"""
         return self.grid_enabled
 
+    @profiled('grid.draw')
     def draw_grid(self):
         """Рисует сетку на главной панели (поверх всех элементов)"""
         self.clear_grids()
@@ -81,7 +87,7 @@ class GridSystem:
         if not self.grid_enabled or not self.main_panel:
             return
         
-        print(f"[GridSystem] Рисуем сетку размером {self.grid_size}px")
+        log.debug("Рисуем сетку размером %spx", self.grid_size)
         
         # Получаем экранные координаты главной панели
         if self.zoom_system:
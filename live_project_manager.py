@@ -10,8 +10,12 @@ import tempfile
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from .code_generator import CodeGenerator
+from .code_emitter import CodeEmitter
+from .preview_server import PreviewServer
 from .utils.event_bus import event_bus, on as subscribe
+from .utils.debounce import Debouncer, FrameThrottler, DEBOUNCE_CODEGEN, DEBOUNCE_CODEGEN_MAX_WAIT
 from .utils.logger import get_logger
+from .utils.profiler import profiled
 
 log = get_logger('LiveProjectManager')
 
@@ -49,6 +53,16 @@ class LiveProjectManager:
         self._cached_js = ""
         self._cache_valid = False
         
+        # Регенерация по серии изменений (перетаскивание, ввод размеров):
+        # после паузы, но не реже DEBOUNCE_CODEGEN_MAX_WAIT
+        self._regen_debouncer = Debouncer(DEBOUNCE_CODEGEN, max_wait_ms=DEBOUNCE_CODEGEN_MAX_WAIT)
+        self._pending_updates: Dict[str, bool] = {}
+        
+        # Сервер живого превью (запускается по требованию); патчи уходят
+        # с частотой кадров, не дожидаясь дебаунса регенерации файлов
+        self.preview_server = None
+        self._preview_frame = FrameThrottler(fps=30)
+        
         # Шаблоны проектов
         self.templates = self._init_templates()
         
@@ -107,6 +121,7 @@ class LiveProjectManager:
         """Настраивает слушатели событий"""
         # События элементов
         subscribe('element.created', self._on_element_changed)
+        subscribe('element.bulk_created', self._on_element_changed)
         subscribe('element.updated', self._on_element_changed) 
         subscribe('element.deleted', self._on_element_changed)
         subscribe('element.moved', self._on_element_changed)
@@ -141,6 +156,9 @@ class LiveProjectManager:
         self.auto_generation = enabled
         if enabled:
             self._regenerate_if_needed()
+        else:
+            self._regen_debouncer.cancel()
+            self._pending_updates = {}
         log.info(f"Автогенерация {'включена' if enabled else 'отключена'}")
     
     def _on_element_changed(self, event_data=None):
@@ -154,12 +172,10 @@ class LiveProjectManager:
             self.code_generator.set_elements(elements, self.main_canvas)
         
         self._invalidate_cache()
-        self._regenerate_if_needed()
-        
-        # Уведомляем об изменении проекта
-        event_bus.emit('project.code_updated', {
+        self._schedule_preview()
+        self._schedule_regeneration({
             'html_updated': True,
-            'css_updated': True, 
+            'css_updated': True,
             'js_updated': True
         })
     
@@ -169,16 +185,36 @@ class LiveProjectManager:
             return
         
         self._invalidate_cache()
-        self._regenerate_if_needed()
-        
-        event_bus.emit('project.code_updated', {
+        self._schedule_preview()
+        self._schedule_regeneration({
             'html_updated': True,
             'css_updated': True
         })
     
+    def _schedule_preview(self):
+        """Отправляет патчи в открытое превью на ближайшем кадре"""
+        if self.preview_server and self.preview_server.is_running:
+            self._preview_frame.call(self._update_preview)
+    
+    def _update_preview(self):
+        if self.preview_server and self.preview_server.is_running:
+            self.preview_server.update(self.code_generator)
+    
+    def _schedule_regeneration(self, updates: Dict[str, bool]):
+        """Откладывает регенерацию и уведомление до паузы в изменениях"""
+        self._pending_updates.update(updates)
+        self._regen_debouncer.call(self._flush_regeneration)
+    
+    def _flush_regeneration(self):
+        """Регенерирует код и уведомляет об изменении проекта"""
+        updates, self._pending_updates = self._pending_updates, {}
+        self._regenerate_if_needed()
+        event_bus.emit('project.code_updated', updates)
+    
     def _on_project_settings_changed(self, event_data=None):
         """Обработчик изменения настроек проекта"""
         self._invalidate_cache()
+        self._schedule_preview()
         if event_data and event_data.get('regenerate', True):
             self._regenerate_if_needed()
     
@@ -191,6 +227,7 @@ class LiveProjectManager:
         if not self._cache_valid:
             self._regenerate_code()
     
+    @profiled('codegen.regenerate')
     def _regenerate_code(self):
         """Регенерирует весь код"""
         try:
@@ -200,6 +237,7 @@ class LiveProjectManager:
             self._cache_valid = True
             
             # Автосохранение в проект папку
+            # (превью обновляется отдельно - _schedule_preview)
             if self.project_dir:
                 self._auto_save_to_project()
                 
@@ -217,11 +255,9 @@ class LiveProjectManager:
             css_file = self.project_dir / "style.css"
             js_file = self.project_dir / "script.js"
             
-            # Создаём полный HTML документ
-            full_html = self.code_generator.generate_all()
-            
+            # Полный HTML документ собирается из кеша прямо в файл
             with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(full_html)
+                self._write_full_html(CodeEmitter(f))
             
             with open(css_file, 'w', encoding='utf-8') as f:
                 f.write(self._cached_css)
@@ -229,11 +265,35 @@ class LiveProjectManager:
             with open(js_file, 'w', encoding='utf-8') as f:
                 f.write(self._cached_js)
                 
-            log.debug(f"Автосохранение в {self.project_dir}")
+            log.debug("Автосохранение в %s", self.project_dir)
             
         except Exception as e:
             log.error(f"Ошибка автосохранения: {e}")
     
+    # === Живое превью ===
+    
+    def start_preview_server(self, port: int = 0) -> str:
+        """
+        Запускает локальный сервер превью.
+        
+        Args:
+            port: Порт (0 = любой свободный)
+            
+        Returns:
+            URL страницы превью
+        """
+        if not self.preview_server:
+            self.preview_server = PreviewServer(port=port)
+        url = self.preview_server.start()
+        self.preview_server.update(self.code_generator)
+        return url
+    
+    def stop_preview_server(self):
+        """Останавливает сервер превью"""
+        self._preview_frame.cancel()
+        if self.preview_server:
+            self.preview_server.stop()
+    
     def get_generated_html(self) -> str:
         """Возвращает сгенерированный HTML"""
         self._regenerate_if_needed()
@@ -251,7 +311,30 @@ class LiveProjectManager:
     
     def get_full_html(self) -> str:
         """Возвращает полный HTML документ"""
-        return self.code_generator.generate_all()
+        emitter = CodeEmitter()
+        self._write_full_html(emitter)
+        return emitter.getvalue()
+    
+    def _write_full_html(self, emitter):
+        """Пишет полный HTML документ, используя кеш частей если он валиден"""
+        if self._cache_valid:
+            self.code_generator.write_document(
+                emitter, self._cached_html, self._cached_css, self._cached_js
+            )
+        else:
+            self.code_generator.write_document(emitter)
+    
+    def _write_template_document(self, stream, template_name: str):
+        """Пишет главный файл шаблона экспорта прямо в поток"""
+        emitter = CodeEmitter(stream)
+        if template_name == 'html':
+            self._write_full_html(emitter)
+        elif template_name == 'react':
+            self.code_generator.write_react_component(emitter)
+        elif template_name == 'vue':
+            self.code_generator.write_vue_component(emitter)
+        else:
+            stream.write(self._cached_html)
     
     def export_project(self, export_dir: str, template_name: str = 'html') -> str:
         """
@@ -280,25 +363,16 @@ class LiveProjectManager:
                 full_path = export_path / file_path
                 full_path.parent.mkdir(parents=True, exist_ok=True)
                 
-                # Заменяем placeholder-ы реальным кодом
-                if content == "<!-- Will be generated -->":
-                    if template_name == 'html':
-                        content = self.get_full_html()
-                    elif template_name == 'react':
-                        content = self.code_generator.export_react_component()
-                    elif template_name == 'vue':
-                        content = self.code_generator.export_vue_component()
-                    else:
-                        content = self._cached_html
-                        
-                elif content == "/* Will be generated */":
-                    content = self._cached_css
-                    
-                elif content == "// Will be generated":
-                    content = self._cached_js
-                
+                # Заменяем placeholder-ы реальным кодом (пишем прямо в файл)
                 with open(full_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                    if content == "<!-- Will be generated -->":
+                        self._write_template_document(f, template_name)
+                    elif content == "/* Will be generated */":
+                        f.write(self._cached_css)
+                    elif content == "// Will be generated":
+                        f.write(self._cached_js)
+                    else:
+                        f.write(content)
             
             # Создаём метаданные проекта
             meta = {
@@ -383,9 +457,10 @@ class LiveProjectManager:
         # Подсчитываем строки и размеры
         self._regenerate_if_needed()
         
-        stats['lines_of_code']['html'] = len(self._cached_html.splitlines())
-        stats['lines_of_code']['css'] = len(self._cached_css.splitlines())
-        stats['lines_of_code']['js'] = len(self._cached_js.splitlines())
+        # count() не создаёт список строк, в отличие от splitlines();
+        # последняя строка без '\n' тоже считается
+        for part, text in (('html', self._cached_html), ('css', self._cached_css), ('js', self._cached_js)):
+            stats['lines_of_code'][part] = text.count('\n') + (not text.endswith('\n')) if text else 0
         
         stats['file_sizes']['html'] = len(self._cached_html.encode('utf-8'))
         stats['file_sizes']['css'] = len(self._cached_css.encode('utf-8'))
@@ -21,7 +21,8 @@ from modules.elements import ElementManager, ButtonElement
 from modules.zoom_system import ZoomSystem
 from modules.main_canvas import MainCanvas
 from modules.code_generator import CodeGenerator
-from modules.dialogs import show_button_config, show_frame_config, show_panel_config, show_image_config, show_visibility_dialog, show_scroll_area_config, show_save_artifact_dialog, show_artifact_browser, show_state_switcher_config, show_element_extended_dialog
+# Диалоги загружаются при первом открытии (ленивый пакет)
+from modules import dialogs
 from modules.elements.state_switcher import StateSwitcherElement
 from modules.component_system import Component, ComponentManager
 from modules.artifact_manager import ArtifactManager as NewArtifactManager
@@ -30,7 +31,6 @@ from modules.artifact_manager_integrated import get_artifact_manager_integrated
 from modules.loading_overlay import LoadingOverlay, LoadingContext
 from modules.button_functions import call_button_function, register_button_function, get_button_functions
 from modules.window_manager import get_window_manager
-from modules.dialogs import show_action_config
 from modules.elements import FrameElement, PanelElement, ImageElement, TextElement, ScrollAreaElement
 from modules.mechanisms import MechanismManager
 from modules.project_manager import ProjectManager
@@ -42,6 +42,7 @@ from modules.controllers import AppController, CanvasController, ElementControll
 from modules.utils.logger import get_logger
 from modules.utils.event_bus import event_bus, on as subscribe, emit
 from modules.utils.hotkeys import HotkeyManager
+from modules.utils.startup import StartupGraph
 
 log = get_logger('Main')
 
@@ -68,6 +69,9 @@ class PanelWithControl:
         self.root = tk.Tk()
         self.config = Config()
         
+        # Вызовы из фоновых потоков (ИИ, таймеры) выполняются в потоке Tk
+        event_bus.attach_ui(self.root)
+        
         # Настройка тёмных стилей для ttk виджетов
         self._setup_dark_styles()
         
@@ -106,44 +110,88 @@ class PanelWithControl:
         
         # Интегрированный менеджер артефактов (создается позже когда canvas готов)
         self.artifact_manager_integrated = None
+        
+        # HUD профилировщика (создаётся по F12)
+        self.profiler_hud = None
+        
+        # Контроль утечек объектов холста (Ctrl+F12 или Config.CANVAS_AUDIT_ENABLED)
+        self.canvas_audit = None
+        
+        # Граф запуска интерфейса (создаётся после авторизации)
+        self.startup = None
+        
+        # Библиотека артефактов (загружается отложенным этапом запуска)
+        self.artifact_manager = None
     
     def _on_auth_success(self, user):
         """Колбэк успешной авторизации"""
         self.current_user = user
         # Показываем загрузку интерфейса с прогрессом
         self.loading.show("Подготовка интерфейса", "Инициализация...", progress=0)
-        self.root.after(100, self._init_main_interface)
-    
-    def _init_main_interface(self):
-        """Инициализирует основной интерфейс после авторизации"""
-        try:
-            # Строим интерфейс - 10%
-            self.loading.update("Создание интерфейса", "UI компоненты...", progress=10)
-            self.root.update_idletasks()
-            
-            self.ui = UIBuilder(self.root, self.config)
-            self.ui.set_app_reference(self)
-            self.ui.set_callbacks(
-                toggle_grid=self.toggle_grid,
-                grid_increase=self.grid_increase,
-                grid_decrease=self.grid_decrease,
-                apply_size=self.apply_element_size,
-                reload_app=self.reload_app,
-                delete_element=self.delete_selected_element,
-                save=self.save_project,
-                lock_size=self.toggle_size_lock
-            )
-            self.canvas = self.ui.build()
-            self.root.update_idletasks()
-        except Exception as e:
-            print(f"[Init] UI Error: {e}")
-            import traceback
-            traceback.print_exc()
+        self._start_interface()
+
+    def _start_interface(self):
+        """
+        Запускает построение интерфейса по графу этапов.
+        Каждый этап выполняется, как только готовы его зависимости;
+        вкладки, библиотека артефактов, звуки и ИИ подключаются после показа окна.
+        """
+        startup = StartupGraph(self.root, on_stage=self._on_startup_stage,
+                               on_error=self._on_startup_error)
+        startup.add('ui', self._startup_ui, title="Создание интерфейса")
+        startup.add('systems', self._startup_systems, requires=('ui',), title="Системы")
+        startup.add('managers', self._startup_managers, requires=('systems',), title="Менеджеры")
+        startup.add('events', self._startup_events, requires=('managers',), title="События")
+        # Холст получил реальные размеры (<Configure>)
+        startup.add('main_panel', self._create_main_panel,
+                    requires=('events', 'canvas_sized'), title="Главная панель")
+        startup.add('ready', self._complete_startup, requires=('main_panel',), title="Готово!")
+
+        # Некритичное - в паузах цикла событий после показа окна
+        startup.add('tabs', self._setup_tabs, requires=('events',), deferred=True)
+        startup.add('artifact_library', self._startup_artifact_library,
+                    requires=('tabs',), deferred=True)
+        startup.add('sounds', self._setup_sounds_tab, requires=('tabs',), deferred=True)
+        startup.add('ai', self._setup_ai_tab, requires=('tabs',), deferred=True)
+        startup.add('tabs_prebuild', self._prebuild_tabs,
+                    requires=('artifact_library', 'sounds', 'ai'), deferred=True)
+
+        self.startup = startup
+        startup.start()
+
+    def _on_startup_stage(self, stage, progress):
+        """Отображает этап запуска в оверлее загрузки"""
+        self.loading.update(stage.title, "", progress=int(progress * 100))
+
+    def _on_startup_error(self, stage, error):
+        """Ошибка основного этапа - убираем оверлей, чтобы окно не зависло в загрузке"""
+        if not stage.deferred:
+            self.loading.hide()
+
+    def _on_canvas_configure(self, event):
+        """Холст получил размеры - можно строить главную панель"""
+        if event.width > 1 and event.height > 1:
+            self.startup.signal('canvas_sized')
+
+    def _startup_ui(self):
+        """Этап: построение интерфейса"""
+        self.ui = UIBuilder(self.root, self.config)
+        self.ui.set_app_reference(self)
+        self.ui.set_callbacks(
+            toggle_grid=self.toggle_grid,
+            grid_increase=self.grid_increase,
+            grid_decrease=self.grid_decrease,
+            apply_size=self.apply_element_size,
+            reload_app=self.reload_app,
+            delete_element=self.delete_selected_element,
+            save=self.save_project,
+            lock_size=self.toggle_size_lock
+        )
+        self.canvas = self.ui.build()
+        self.canvas.bind('<Configure>', self._on_canvas_configure, add='+')
 
-        # Инициализируем системы - 25%
-        self.loading.update("Системы", "Zoom и сетка...", progress=25)
-        self.root.update_idletasks()
-        
+    def _startup_systems(self):
+        """Этап: zoom, сетка, выделение, главная панель"""
         self.zoom_system = ZoomSystem(self.canvas, self.config)
         self.zoom_system.set_zoom_callback(self._on_zoom_changed)
         
@@ -154,20 +202,12 @@ class PanelWithControl:
         self.selection_tool = SelectionTool(self.canvas, self.config)
         self.selection_tool.set_zoom_system(self.zoom_system)
         
-        # Главная панель - 35%
-        self.loading.update("Системы", "Главная панель...", progress=35)
-        self.root.update_idletasks()
-        
+        # Главная панель (рисуется на этапе main_panel)
         self.main_canvas = MainCanvas(self.canvas, self.config)
         self.main_canvas.set_zoom_system(self.zoom_system)
-        
-        # Инициализируем главную панель ОДИН РАЗ после создания
-        self.root.after(150, self._init_main_canvas)
-        
-        # Менеджер элементов - 45%
-        self.loading.update("Менеджеры", "Элементы...", progress=45)
-        self.root.update_idletasks()
-        
+
+    def _startup_managers(self):
+        """Этап: менеджеры элементов, механизмов, окон, проектов"""
         self.element_manager = ElementManager(self.canvas, self.config)
         self.element_manager.set_selection_callback(self._on_element_selected)
         self.element_manager.set_zoom_system(self.zoom_system)
@@ -176,10 +216,6 @@ class PanelWithControl:
         self.artifact_manager_integrated = get_artifact_manager_integrated(self.canvas, self.config)
         self.element_manager.set_main_canvas(self.main_canvas)
 
-        # Менеджер механизмов - 55%
-        self.loading.update("Менеджеры", "Механизмы...", progress=55)
-        self.root.update_idletasks()
-        
         self.mechanism_manager = MechanismManager(self.canvas, self.config)
         self.mechanism_manager.set_element_manager(self.element_manager)
         self.mechanism_manager.set_zoom_system(self.zoom_system)
@@ -189,10 +225,7 @@ class PanelWithControl:
         self.window_manager.set_element_manager(self.element_manager)
         self.window_manager.set_mechanism_manager(self.mechanism_manager)
 
-        # Система функций - 65%
-        self.loading.update("Менеджеры", "Функции...", progress=65)
-        self.root.update_idletasks()
-        
+        # Система функций
         self.button_functions = get_button_functions()
         self.button_functions.set_app(self)
         self.button_functions.set_element_manager(self.element_manager)
@@ -206,23 +239,20 @@ class PanelWithControl:
         from modules.preview_mode import PreviewMode
         self.preview_mode = PreviewMode(self)
 
-        # Система компонентов - 75%
-        self.loading.update("Компоненты", "Артефакты...", progress=75)
-        self.root.update_idletasks()
-        
+        # Система компонентов (библиотека артефактов загружается отложенно)
         self.component_manager = ComponentManager(self.element_manager, self.mechanism_manager, self.config)
-        self.artifact_manager = NewArtifactManager()
 
         # Генератор кода
         self.code_generator = CodeGenerator()
 
-        # События - 85%
-        self.loading.update("Финализация", "События...", progress=85)
-        self.root.update_idletasks()
-        
+    def _startup_events(self):
+        """Этап: обработчики событий, контроллеры, горячие клавиши"""
         self.event_handlers = EventHandlers(self)
         self.callbacks = AppCallbacks(self)
         
+        if getattr(self.config, 'CANVAS_AUDIT_ENABLED', False):
+            self._get_canvas_audit().start()
+        
         # === Обновляем контроллеры ссылками на менеджеры ===
         self.app_controller.set_managers(
             self.element_manager,
@@ -246,9 +276,6 @@ class PanelWithControl:
         # Связываем системы
         self.selection_system.set_info_callback(self.ui.update_coords_label)
         
-        # Связываем вкладки с системами
-        self._setup_tabs()
-        
         # Связываем UI контроллер
         self.ui_controller.set_ui_builder(self.ui)
         self.ui_controller.set_tab_system(self.ui.get_tab_system())
@@ -262,9 +289,28 @@ class PanelWithControl:
         # Инициализируем главный контроллер
         self.app_controller.initialize()
 
-        # Создаём главную панель по центру
-        self.loading.update("Загрузка интерфейса...", "Финализация")
-        self.root.after(200, self._create_main_panel)
+        # Холст мог получить размеры раньше подписки на <Configure>
+        if self.canvas.winfo_width() > 1 and self.canvas.winfo_height() > 1:
+            self.startup.signal('canvas_sized')
+
+    def _prebuild_tabs(self):
+        """Отложенный этап: строит скрытые вкладки в паузах цикла событий"""
+        tab_system = self.ui.get_tab_system()
+        if tab_system and getattr(self.config, 'TAB_PREBUILD_IDLE', True):
+            tab_system.prebuild()
+
+    def _startup_artifact_library(self):
+        """Отложенный этап: библиотека артефактов (чтение папки artifacts)"""
+        self.artifact_manager = NewArtifactManager()
+        tab_system = self.ui.get_tab_system()
+        if not tab_system:
+            return
+        tab_menu = tab_system.get_tab('menu', build=False)
+        if tab_menu:
+            tab_menu.set_artifact_manager(self.artifact_manager)
+        tab_elements = tab_system.get_tab('elements', build=False)
+        if tab_elements:
+            tab_elements.set_artifact_manager(self.artifact_manager)
 
     def _setup_hotkeys(self):
         """Настраивает горячие клавиши через менеджер"""
@@ -300,8 +346,68 @@ class PanelWithControl:
         self.hotkey_manager.register('Shift-Left', lambda: self._move_selected(-10, 0))
         self.hotkey_manager.register('Shift-Right', lambda: self._move_selected(10, 0))
         
+        # Профилирование: HUD и экспорт trace
+        self.hotkey_manager.register('F12', self.toggle_profiler_hud,
+                                     'HUD профилировщика', HotkeyManager.CATEGORY_VIEW)
+        self.hotkey_manager.register('Shift-F12', self.export_profiler_trace,
+                                     'Экспорт trace профилировщика', HotkeyManager.CATEGORY_VIEW)
+        self.hotkey_manager.register('Control-F12', self.run_canvas_audit,
+                                     'Проверка утечек объектов холста', HotkeyManager.CATEGORY_VIEW)
+        
         log.debug("Горячие клавиши настроены")
 
+    def toggle_profiler_hud(self):
+        """Показывает/скрывает HUD профилировщика на холсте"""
+        if not self.canvas:
+            return
+        if self.profiler_hud is None:
+            from modules.utils.profiler import ProfilerHUD
+            self.profiler_hud = ProfilerHUD(self.canvas)
+        self.profiler_hud.toggle()
+
+    def export_profiler_trace(self):
+        """Сохраняет замеры профилировщика в Chrome trace JSON"""
+        from tkinter import filedialog
+        from modules.utils.profiler import get_profiler
+        path = filedialog.asksaveasfilename(
+            title="Экспорт trace",
+            defaultextension=".json",
+            filetypes=[("Chrome trace", "*.json")],
+            initialfile="trace.json"
+        )
+        if path:
+            get_profiler().export_chrome_trace(path)
+
+    def _get_canvas_audit(self):
+        """Создаёт детектор утечек и регистрирует владельцев объектов холста"""
+        if self.canvas_audit is None:
+            from modules.utils.canvas_audit import CanvasAudit
+            from modules.utils.profiler import ProfilerHUD
+            audit = CanvasAudit(
+                self.canvas,
+                budget=getattr(self.config, 'CANVAS_ITEM_BUDGET', None),
+                interval_ms=getattr(self.config, 'CANVAS_AUDIT_INTERVAL_MS', None)
+            )
+            audit.register_owner('elements', self.element_manager.get_canvas_items)
+            audit.register_owner('mechanisms', self.mechanism_manager.get_canvas_items)
+            audit.register_owner('selection', self.selection_tool.get_canvas_items)
+            audit.register_owner('main_canvas', self.main_canvas.get_canvas_items)
+            audit.register_tag('grid')
+            audit.register_tag('selection')
+            audit.register_tag(ProfilerHUD.TAG, 'profiler')
+            self.canvas_audit = audit
+        return self.canvas_audit
+
+    def run_canvas_audit(self):
+        """Разовая проверка объектов холста (итог - в лог)"""
+        if not self.canvas or getattr(self, 'element_manager', None) is None:
+            return
+        report = self._get_canvas_audit().scan()
+        log.info("Объектов на холсте: %d (%s), без владельца: %d",
+                 report.total,
+                 ', '.join(f"{name}={count}" for name, count in report.owned.items()),
+                 len(report.orphans))
+
     def _setup_dark_styles(self):
         """Настраивает тёмные стили для ttk виджетов"""
         from tkinter import ttk
@@ -350,14 +456,7 @@ class PanelWithControl:
             background=[('selected', ACCENT)], foreground=[('selected', '#ffffff')])
 
     def _create_main_panel(self):
-        """Создаёт главную панель по центру холста"""
-        canvas_width = self.canvas.winfo_width()
-        canvas_height = self.canvas.winfo_height()
-        
-        if canvas_width <= 1 or canvas_height <= 1:
-            self.root.after(100, self._create_main_panel)
-            return
-        
+        """Этап: главная панель по центру холста (размеры холста уже известны)"""
         # Центрируем главную панель
         self.main_canvas.center_on_canvas()
         self.main_canvas.draw()
@@ -373,39 +472,12 @@ class PanelWithControl:
         
         # Обновляем zoom label
         self._update_zoom_label()
-        
-        # Финальная инициализация - запускаем с задержкой
-        self.root.after(300, self._finalize_startup)
-        
-        # Принудительная отрисовка главной панели
-        # НЕ вызываем _force_main_canvas_draw - это создавало цикл!
-    
-    def _finalize_startup(self):
-        """Завершает загрузку и переключает в полноэкранный режим"""
-        # Обновляем UI - 95%
-        self.loading.update("Завершение", "Подготовка...", progress=95)
-        self.root.update_idletasks()
-        
-        # Ждём для полной отрисовки
-        self.root.after(300, self._complete_startup)
     
     def _complete_startup(self):
-        """Полностью завершает запуск приложения"""
-        # Финал - 100%
+        """Этап: скрывает загрузку и переключает в полноэкранный режим"""
         self.loading.update("Готово!", "Запуск...", progress=100)
-        self.root.update_idletasks()
-        
-        # УВЕЛИЧИВАЕМ паузу чтобы ВСЁ загрузилось
-        self.root.after(1000, self._enter_fullscreen_after_load)
-    
-    def _enter_fullscreen_after_load(self):
-        """Переход в полноэкранный режим после загрузки"""
-        # Скрываем загрузку
         self.loading.hide()
-        self.root.update_idletasks()
-        
-        # Переключаем в полноэкранный режим
-        self.root.after(150, self._do_fullscreen)
+        self._do_fullscreen()
     
     def _do_fullscreen(self):
         """Включает полноэкранный режим после загрузки"""
@@ -423,44 +495,47 @@ class PanelWithControl:
         print("[Main] Интерфейс полностью загружен и готов к работе")
 
     def _setup_tabs(self):
-        """Настраивает связи вкладок с системами"""
+        """
+        Настраивает связи вкладок с системами.
+        Виджеты вкладок не строятся (build=False) - только ссылки;
+        вкладка строится при первом показе или в фоне (_prebuild_tabs)
+        """
         tab_system = self.ui.get_tab_system()
         if not tab_system:
             return
         
-        # Связываем вкладку элементов с менеджером
-        # Связываем вкладку меню с менеджером проектов и артефактов
-        tab_menu = tab_system.get_tab('menu')
+        # Связываем вкладку меню с менеджером проектов
+        # (библиотека артефактов подключается этапом artifact_library)
+        tab_menu = tab_system.get_tab('menu', build=False)
         if tab_menu:
             tab_menu.set_project_manager(self.project_manager)
-            tab_menu.set_artifact_manager(self.artifact_manager)
             tab_menu.set_app(self)
         
-        tab_elements = tab_system.get_tab('elements')
+        # Связываем вкладку элементов с менеджером
+        tab_elements = tab_system.get_tab('elements', build=False)
         if tab_elements:
             tab_elements.set_element_manager(self.element_manager)
-            tab_elements.set_artifact_manager(self.artifact_manager)
             tab_elements.set_artifact_manager_integrated(self.artifact_manager_integrated)
             tab_elements.set_app(self)  # Для восстановления обработчиков после создания артефактов
         
         # Связываем вкладку механизмов
-        tab_mechanisms = tab_system.get_tab('mechanisms')
+        tab_mechanisms = tab_system.get_tab('mechanisms', build=False)
         if tab_mechanisms:
             tab_mechanisms.set_mechanism_manager(self.mechanism_manager)
             tab_mechanisms.set_element_manager(self.element_manager)
         
         # Связываем вкладку цвета - при изменении применять к выбранному элементу
-        tab_color = tab_system.get_tab('color')
+        tab_color = tab_system.get_tab('color', build=False)
         if tab_color:
             tab_color.set_change_callback(self._on_color_settings_changed)
         
         # Связываем вкладку текста - при изменении применять к текстовому элементу
-        tab_text = tab_system.get_tab('text')
+        tab_text = tab_system.get_tab('text', build=False)
         if tab_text:
             tab_text.set_change_callback(self._on_text_settings_changed)
         
         # Связываем вкладку кода с генератором и данными
-        tab_code = tab_system.get_tab('code')
+        tab_code = tab_system.get_tab('code', build=False)
         if tab_code:
             tab_code.set_code_generator(self.code_generator)
             tab_code.set_managers_extended(self.element_manager, self.main_canvas)
@@ -470,34 +545,39 @@ class PanelWithControl:
                 self.live_project_manager.set_managers(self.element_manager, self.main_canvas)
         
         # Связываем вкладку фильтров
-        tab_filters = tab_system.get_tab('filters')
+        tab_filters = tab_system.get_tab('filters', build=False)
         if tab_filters:
             tab_filters.set_element_manager(self.element_manager)
             tab_filters.set_main_canvas(self.main_canvas)
             tab_filters.set_app(self)
         
-        # Связываем вкладку звуков
-        tab_sounds = tab_system.get_tab('sounds')
+        # Связываем вкладку слоёв
+        self.tab_layers = tab_system.get_tab('layers', build=False)
+        if self.tab_layers:
+            self.tab_layers.set_element_manager(self.element_manager)
+            self.tab_layers.set_mechanism_manager(self.mechanism_manager)
+
+    def _setup_sounds_tab(self):
+        """Отложенный этап: вкладка звуков"""
+        tab_system = self.ui.get_tab_system()
+        tab_sounds = tab_system.get_tab('sounds', build=False) if tab_system else None
         if tab_sounds:
             tab_sounds.set_element_manager(self.element_manager)
-        
-        # Инициализируем AI Assistant
+
+    def _setup_ai_tab(self):
+        """Отложенный этап: AI Assistant и его вкладка"""
         from modules.ai_assistant import get_ai_assistant
         self.ai_assistant = get_ai_assistant()
+        self.ai_assistant.idle_unload_seconds = getattr(self.config, 'AI_IDLE_UNLOAD_SECONDS', 600)
         
-        # Связываем вкладку AI
-        tab_ai = tab_system.get_tab('ai')
+        tab_system = self.ui.get_tab_system()
+        tab_ai = tab_system.get_tab('ai', build=False) if tab_system else None
         if tab_ai:
             tab_ai.set_element_manager(self.element_manager)
             tab_ai.set_main_canvas(self.main_canvas)
-            tab_ai.set_settings_tab(tab_system.get_tab('settings'))
+            tab_ai.set_settings_tab(tab_system.get_tab('settings', build=False))
             tab_ai.set_app(self)
-        
-        # Связываем вкладку слоёв
-        self.tab_layers = tab_system.get_tab('layers')
-        if self.tab_layers:
-            self.tab_layers.set_element_manager(self.element_manager)
-            self.tab_layers.set_mechanism_manager(self.mechanism_manager)
+            tab_ai.set_ai_assistant(self.ai_assistant)
 
     def _bind_mouse_events(self):
         """Привязывает события мыши к холсту"""
@@ -770,11 +850,8 @@ class PanelWithControl:
             real_x, real_y = self.zoom_system.screen_to_real(event.x, event.y)
             element = self.element_manager.on_create_end(real_x, real_y)
             if element:
-                self._update_elements_tab()
+                # Списки вкладок обновляются по событию element.created
                 self._update_size_fields()
-                # Обновляем вкладку слоёв
-                if hasattr(self, 'tab_layers') and self.tab_layers:
-                    self.tab_layers.update()
             self.canvas.config(cursor="arrow")
             return
         
@@ -925,7 +1002,6 @@ class PanelWithControl:
         """Удаляет выделенный элемент"""
         self.element_manager.delete_selected()
         self.selection_tool.deselect()
-        self._update_elements_tab()
 
     def save_project(self):
         """Сохраняет проект"""
@@ -1043,7 +1119,7 @@ class PanelWithControl:
 
     def _show_button_config(self, button_element):
         """Показывает диалог настройки кнопки"""
-        result = show_button_config(self.root, button_element)
+        result = dialogs.show_button_config(self.root, button_element)
         if result:
             print(f"Кнопка настроена: функция #{result['function_id']}, текст: '{result['text']}'")
             # Обновляем отображение
@@ -1051,7 +1127,7 @@ class PanelWithControl:
 
     def _show_action_config(self, button_element):
         """Показывает диалог настройки действий кнопки"""
-        result = show_action_config(
+        result = dialogs.show_action_config(
             self.root, 
             button_element, 
             self.element_manager, 
@@ -1064,7 +1140,7 @@ class PanelWithControl:
 
     def _show_frame_config(self, frame_element):
         """Показывает диалог настройки рамки"""
-        result = show_frame_config(self.root, frame_element)
+        result = dialogs.show_frame_config(self.root, frame_element)
         if result:
             points_count = len(result['spawn_points'])
             print(f"Рамка настроена: функция #{result['function_id']}, точек: {points_count}")
@@ -1073,7 +1149,7 @@ class PanelWithControl:
 
     def _show_panel_config(self, panel_element):
         """Показывает диалог настройки панели"""
-        result = show_panel_config(self.root, panel_element)
+        result = dialogs.show_panel_config(self.root, panel_element)
         if result:
             points_count = len(result['spawn_points'])
             print(f"Панель настроена: функция #{result['function_id']}, точек: {points_count}")
@@ -1082,19 +1158,19 @@ class PanelWithControl:
 
     def _show_image_config(self, image_element):
         """Показывает диалог настройки изображения"""
-        result = show_image_config(self.root, image_element)
+        result = dialogs.show_image_config(self.root, image_element)
         if result:
             self.selection_tool.update()
 
     def _show_scroll_area_config(self, scroll_area_element):
         """Показывает диалог настройки области прокрутки"""
-        result = show_scroll_area_config(self.root, scroll_area_element)
+        result = dialogs.show_scroll_area_config(self.root, scroll_area_element)
         if result:
             self.selection_tool.update()
 
     def _show_state_switcher_config(self, state_switcher_element):
         """Показывает диалог настройки переключателя состояний"""
-        result = show_state_switcher_config(
+        result = dialogs.show_state_switcher_config(
             self.root, 
             state_switcher_element, 
             self.element_manager, 
@@ -1125,7 +1201,7 @@ class PanelWithControl:
         element.set_element_manager(self.element_manager)
         element.set_mechanism_manager(self.mechanism_manager)
         
-        result = show_element_extended_dialog(
+        result = dialogs.show_element_extended_dialog(
             self.root,
             element,
             self.element_manager,
@@ -1138,7 +1214,7 @@ class PanelWithControl:
 
     def _show_visibility_dialog(self, element):
         """Показывает диалог настройки видимости"""
-        result = show_visibility_dialog(self.root, element, self.element_manager)
+        result = dialogs.show_visibility_dialog(self.root, element, self.element_manager)
         if result:
             self.selection_tool.update()
             if hasattr(self, 'tab_layers') and self.tab_layers:
@@ -1164,7 +1240,7 @@ class PanelWithControl:
             return
         
         # Показываем диалог сохранения
-        result = show_save_artifact_dialog(
+        result = dialogs.show_save_artifact_dialog(
             self.root,
             element_count=len(selected_elements),
             mechanism_count=len(selected_mechanisms)
@@ -1186,13 +1262,19 @@ class PanelWithControl:
             component.description = result.get('description', '')
             
             # Сохраняем артефакт
-            if self.artifact_manager.save_artifact(component):
+            if self._get_artifact_manager().save_artifact(component):
                 from tkinter import messagebox
                 messagebox.showinfo("Успех", f"Заготовка '{result['name']}' сохранена!")
 
+    def _get_artifact_manager(self):
+        """Библиотека артефактов; создаётся сразу, если этап запуска не выполнен"""
+        if not self.startup.ensure('artifact_library') and self.artifact_manager is None:
+            self.artifact_manager = NewArtifactManager()
+        return self.artifact_manager
+
     def show_artifact_library(self):
         """Показывает библиотеку артефактов"""
-        result = show_artifact_browser(self.root, self.artifact_manager)
+        result = dialogs.show_artifact_browser(self.root, self._get_artifact_manager())
         
         if result:
             # Размещаем выбранный артефакт
@@ -1231,15 +1313,11 @@ class PanelWithControl:
         """Перемещает элемент на передний план"""
         self.element_manager.bring_to_front(element)
         self.selection_tool.update()
-        if hasattr(self, 'tab_layers') and self.tab_layers:
-            self.tab_layers.update()
 
     def _send_element_to_back(self, element):
         """Перемещает элемент на задний план"""
         self.element_manager.send_to_back(element)
         self.selection_tool.update()
-        if hasattr(self, 'tab_layers') and self.tab_layers:
-            self.tab_layers.update()
 
     def _toggle_element_visibility(self, element):
         """Переключает видимость элемента"""
@@ -1387,14 +1465,6 @@ class PanelWithControl:
             element.set_properties(values)
             self.selection_tool.update()
 
-    def _update_elements_tab(self):
-        """Обновляет вкладку элементов"""
-        tab_system = self.ui.get_tab_system()
-        if tab_system:
-            tab_elements = tab_system.get_tab('elements')
-            if tab_elements:
-                tab_elements.refresh()
-
     def _update_mechanisms_tab(self):
         """Обновляет вкладку механизмов"""
         tab_system = self.ui.get_tab_system()
@@ -1518,29 +1588,6 @@ class PanelWithControl:
             else:
                 print(f"[Main] Главная панель найдена: {len(items)} items")
     
-    def _init_main_canvas(self):
-        """Инициализирует и отрисовывает главную панель"""
-        if self.main_canvas and self.canvas:
-            print("[Main] Инициализация главной панели")
-            
-            # Центрируем на холсте
-            canvas_width = self.canvas.winfo_width()
-            canvas_height = self.canvas.winfo_height()
-            
-            print(f"[Main] Размеры холста: {canvas_width}×{canvas_height}")
-            
-            if canvas_width > 1 and canvas_height > 1:
-                self.main_canvas.center_on_canvas()
-            else:
-                # Если размеры холста ещё не готовы, повторяем позже
-                self.root.after(100, self._init_main_canvas)
-                return
-            
-            # Принудительная отрисовка
-            self.main_canvas.draw()
-            
-            print("[Main] Главная панель инициализирована")
-
     def shutdown(self):
         """Корректное завершение приложения"""
         log.info("Завершение приложения...")
@@ -5,6 +5,10 @@
 Всегда на заднем плане, не является элементом
 """
 
+from .utils.logger import get_logger
+
+log = get_logger('MainCanvas')
+
 
 class MainCanvas:
     """Главная чёрная панель"""
@@ -61,7 +65,7 @@ class MainCanvas:
         
         # Проверяем что координаты корректные
         if x2 <= x1 or y2 <= y1:
-            print(f"[MainCanvas] Некорректные координаты: ({x1},{y1}) - ({x2},{y2})")
+            log.warning("Некорректные координаты: (%s,%s) - (%s,%s)", x1, y1, x2, y2)
             return
         
         stroke_width = self.properties['stroke_width']
@@ -88,6 +92,10 @@ class MainCanvas:
                 pass  # Canvas item already deleted
         self._canvas_items = []
 
+    def get_canvas_items(self):
+        """Объекты холста рабочей зоны"""
+        return list(self._canvas_items)
+
     def update(self):
         """Перерисовывает"""
         self.draw()
@@ -109,18 +117,18 @@ class MainCanvas:
         canvas_width = self.canvas.winfo_width()
         canvas_height = self.canvas.winfo_height()
         
-        print(f"[MainCanvas] Центрирование: холст {canvas_width}×{canvas_height}, панель {self.width}×{self.height}")
+        log.debug("Центрирование: холст %s×%s, панель %s×%s", canvas_width, canvas_height, self.width, self.height)
         
         if canvas_width > 1 and canvas_height > 1:
             self.x = (canvas_width - self.width) // 2
             self.y = (canvas_height - self.height) // 2
-            print(f"[MainCanvas] Новая позиция: ({self.x}, {self.y})")
+            log.debug("Новая позиция: (%s, %s)", self.x, self.y)
             self.update()
         else:
             # Если размеры холста ещё не известны - устанавливаем видимую позицию
             self.x = 50
             self.y = 50
-            print(f"[MainCanvas] Временная позиция: ({self.x}, {self.y})")
+            log.debug("Временная позиция: (%s, %s)", self.x, self.y)
             self.update()
 
     def contains_point(self, screen_x, screen_y):
@@ -2,13 +2,19 @@
 """
 Модуль механизмов
 Механизмы - это элементы для создания движения и анимации
+
+Классы загружаются при первом обращении (PEP 562), а не при импорте пакета
 """
-from .mechanism_base import MechanismBase
-from .mechanism_manager import MechanismManager
-from .move_track import MoveTrackMechanism
-from .rotator import RotatorMechanism
-from .scale_mechanism import ScaleMechanism
-from .fade_mechanism import FadeMechanism
-from .shake_mechanism import ShakeMechanism
-from .path_mechanism import PathMechanism
-from .pulse_mechanism import PulseMechanism
+from ..utils.lazy_import import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    '.mechanism_base': ('MechanismBase',),
+    '.mechanism_manager': ('MechanismManager',),
+    '.move_track': ('MoveTrackMechanism',),
+    '.rotator': ('RotatorMechanism',),
+    '.scale_mechanism': ('ScaleMechanism',),
+    '.fade_mechanism': ('FadeMechanism',),
+    '.shake_mechanism': ('ShakeMechanism',),
+    '.path_mechanism': ('PathMechanism',),
+    '.pulse_mechanism': ('PulseMechanism',),
+})
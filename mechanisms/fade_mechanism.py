@@ -234,7 +234,7 @@ class FadeMechanism(MechanismBase):
         self._update_attached_positions()
         
         self.update()
-        self._animation_id = self.canvas.after(16, self._run_animation)
+        self._animation_id = self._next_frame()
 
     def _apply_easing(self, t):
         easing = self.properties.get('easing', 'linear')
@@ -5,6 +5,8 @@
 """
 import uuid
 import tkinter as tk
+from ..scene.scene_model import DEFAULT_MECHANISM_PROPERTIES
+from ..utils.profiler import profiled
 
 
 class MechanismBase:
@@ -14,6 +16,12 @@ class MechanismBase:
     MECHANISM_SYMBOL = "⚙"
     MECHANISM_NAME = "Механизм"
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Кадры анимации всех механизмов попадают в профилировщик
+        if '_run_animation' in cls.__dict__:
+            cls._run_animation = profiled(f'mechanism.{cls.MECHANISM_TYPE}')(cls.__dict__['_run_animation'])
+
     def __init__(self, canvas, config):
         self.canvas = canvas
         self.config = config
@@ -41,14 +49,7 @@ class MechanismBase:
         self.trigger_function_id = 0    # Номер функции
         
         # Свойства механизма
-        self.properties = {
-            'speed': 100,            # Скорость (px/сек)
-            'duration': 0,           # Длительность (0 = бесконечно)
-            'loop': False,           # Зацикливание
-            'reverse_on_end': True,  # Обратное движение в конце
-            'easing': 'linear',      # Функция плавности
-            'start_delay': 0,        # Задержка перед стартом (мс)
-        }
+        self.properties = DEFAULT_MECHANISM_PROPERTIES.copy()
         
         # Canvas items
         self.canvas_items = []
@@ -60,6 +61,9 @@ class MechanismBase:
         self._animation_id = None
         self._animation_progress = 0.0  # 0.0 - 1.0
         self._animation_direction = 1   # 1 = вперёд, -1 = назад
+        
+        # Общий кадровый цикл (FrameClock режима просмотра) вместо своего таймера
+        self.frame_clock = None
 
     def set_zoom_system(self, zoom_system):
         """Устанавливает систему масштабирования"""
@@ -144,13 +148,20 @@ class MechanismBase:
         self._animation_progress = 0.0
         self._update_attached_positions()
         
+    def _next_frame(self):
+        """Планирует следующий кадр анимации (~60 FPS или кадр общего цикла)"""
+        if self.frame_clock is not None:
+            return self.frame_clock.request(self._run_animation)
+        return self.canvas.after(16, self._run_animation)
+
     def _cancel_animation(self):
         """Отменяет текущую анимацию (таймер)"""
         if self._animation_id is not None:
-            try:
-                self.canvas.after_cancel(self._animation_id)
-            except tk.TclError:
-                pass  # Canvas уже уничтожен
+            if self.frame_clock is None or not self.frame_clock.cancel(self._animation_id):
+                try:
+                    self.canvas.after_cancel(self._animation_id)
+                except tk.TclError:
+                    pass  # Canvas уже уничтожен
             self._animation_id = None
 
     def pause(self):
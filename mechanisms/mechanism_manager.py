@@ -11,6 +11,9 @@ from .fade_mechanism import FadeMechanism
 from .shake_mechanism import ShakeMechanism
 from .path_mechanism import PathMechanism
 from .pulse_mechanism import PulseMechanism
+from ..utils.logger import get_logger
+
+log = get_logger('MechanismManager')
 
 
 class MechanismGroup:
@@ -116,7 +119,7 @@ class MechanismManager:
     def create_mechanism(self, mech_type, x, y, width=200, height=10):
         """Создаёт новый механизм"""
         if mech_type not in self.MECHANISM_TYPES:
-            print(f"[MechanismManager] Неизвестный тип: {mech_type}")
+            log.warning("Неизвестный тип: %s", mech_type)
             return None
         
         mech_class = self.MECHANISM_TYPES[mech_type]
@@ -236,6 +239,13 @@ class MechanismManager:
         """Возвращает только видимые механизмы"""
         return [m for m in self.mechanisms if m.is_visible]
 
+    def get_canvas_items(self):
+        """Все объекты холста механизмов"""
+        items = []
+        for mechanism in self.mechanisms:
+            items.extend(mechanism.canvas_items)
+        return items
+
     # === Видимость и блокировка ===
     
     def set_visible(self, mechanism, visible):
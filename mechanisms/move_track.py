@@ -222,7 +222,7 @@ class MoveTrackMechanism(MechanismBase):
         self.update()
         
         # Следующий кадр
-        self._animation_id = self.canvas.after(16, self._run_animation)  # ~60 FPS
+        self._animation_id = self._next_frame()
 
     def _apply_easing(self, t):
         """Применяет функцию плавности"""
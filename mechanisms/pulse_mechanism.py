@@ -274,7 +274,7 @@ class PulseMechanism(MechanismBase):
         self._update_attached_positions()
         
         self.update()
-        self._animation_id = self.canvas.after(16, self._run_animation)
+        self._animation_id = self._next_frame()
 
     def _update_attached_positions(self):
         if not self.element_manager:
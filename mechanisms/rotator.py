@@ -272,7 +272,7 @@ class RotatorMechanism(MechanismBase):
         self.update()
         
         # Следующий кадр
-        self._animation_id = self.canvas.after(16, self._run_animation)
+        self._animation_id = self._next_frame()
 
     def _update_attached_positions(self):
         """Обновляет позиции прикреплённых элементов"""
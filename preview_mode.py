@@ -2,14 +2,36 @@
 """
 Режим предварительного просмотра
 Полноэкранный режим для тестирования интерфейса
+
+Статические элементы растеризуются (Pillow) в кэшированные слои-изображения,
+живыми объектами холста остаются только анимируемые и интерактивные.
+Механизмы, изменения из редактора и живые элементы обновляются
+одним кадровым циклом с целевой частотой.
 """
+import time
 import tkinter as tk
 from tkinter import ttk
+from . import preview_raster
+from .preview_raster import RasterCanvas
+from .zoom_system import ZoomSystem
+from .utils.debounce import FrameClock
+from .utils.event_bus import on as subscribe, off as unsubscribe
+from .utils.logger import get_logger
+
+log = get_logger('PreviewMode')
 
 
 class PreviewMode:
     """Управление режимом предварительного просмотра"""
     
+    # События, после которых сверяется список элементов
+    STRUCTURE_EVENTS = ('element.created', 'element.bulk_created', 'element.deleted',
+                        'element.reordered', 'element.cleared', 'element.loaded')
+    # События изменения одного элемента
+    ELEMENT_EVENTS = ('element.moved', 'element.resized', 'element.updated')
+    # Типы с обработчиками мыши в превью - всегда живые объекты
+    INTERACTIVE_TYPES = ('button',)
+    
     def __init__(self, app):
         """
         Args:
@@ -28,10 +50,35 @@ class PreviewMode:
         self.saved_geometry = None
         self.saved_state = None
         
-        # Элементы в превью
-        self.preview_elements = []
+        # Элементы в превью: id -> объекты холста и состояние отрисовки
+        self.preview_elements = {}
         self.preview_mechanisms = []
         
+        # Преобразование координат редактора в координаты превью
+        self.zoom = None
+        self.scale = 1.0
+        self.offset_x = 0
+        self.offset_y = 0
+        
+        # Накопленные изменения редактора (применяются в кадровом цикле)
+        self._dirty = set()
+        self._structure_dirty = False
+        self._canvas_dirty = False
+        self._hovered = None
+        
+        # Статические слои: [{'item', 'photo', 'elements'}], id элемента -> слой
+        self.static_cache = getattr(self.config, 'PREVIEW_STATIC_CACHE', True)
+        self._layers = []
+        self._static = {}
+        
+        # Кадровый цикл: механизмы запрашивают кадры у общих часов
+        self.target_fps = getattr(self.config, 'PREVIEW_TARGET_FPS', 60)
+        self.clock = FrameClock()
+        self._loop_id = None
+        self._frames = 0
+        self._over_budget = 0
+        self._loop_started = 0.0
+        
         # Активные таймеры (for cleanup)
         self._active_timers = []
         
@@ -56,8 +103,12 @@ class PreviewMode:
         # Копируем элементы на превью
         self._render_preview()
         
-        # Запускаем механизмы
+        # Дальше превью следит за изменениями в редакторе
+        self._subscribe()
+        
+        # Запускаем механизмы и кадровый цикл
         self._start_mechanisms()
+        self._start_loop()
         
         print("▶ Режим просмотра запущен (ESC для выхода)")
 
@@ -71,6 +122,14 @@ class PreviewMode:
         # Отменяем все активные таймеры
         self._cancel_all_timers()
         
+        # Отписываемся от изменений редактора
+        self._unsubscribe()
+        self._stop_loop()
+        self._dirty.clear()
+        self._structure_dirty = False
+        self._canvas_dirty = False
+        self._hovered = None
+        
         # Останавливаем механизмы
         self._stop_mechanisms()
         
@@ -79,6 +138,9 @@ class PreviewMode:
             self.preview_window.destroy()
             self.preview_window = None
             self.preview_canvas = None
+        self.preview_elements.clear()
+        self._layers.clear()
+        self._static.clear()
         
         # Восстанавливаем главное окно
         self.root.deiconify()
@@ -165,13 +227,15 @@ class PreviewMode:
         if not self.preview_canvas or not self.app.main_canvas:
             return
         
+        main_canvas = self.app.main_canvas
+        
         # Получаем размеры экрана
         screen_width = self.preview_window.winfo_screenwidth()
         screen_height = self.preview_window.winfo_screenheight()
         
         # Размеры главной панели
-        canvas_width = self.app.main_canvas.width
-        canvas_height = self.app.main_canvas.height
+        canvas_width = main_canvas.width
+        canvas_height = main_canvas.height
         
         # Вычисляем масштаб и позицию для центрирования
         scale_x = screen_width / canvas_width
@@ -184,8 +248,14 @@ class PreviewMode:
         self.offset_x = (screen_width - preview_width) / 2
         self.offset_y = (screen_height - preview_height) / 2
         
+        # Преобразование для draw() элементов: главная панель - в центре экрана
+        self.zoom = ZoomSystem(self.preview_canvas, self.config)
+        self.zoom.scale = self.scale
+        self.zoom.offset_x = self.offset_x - main_canvas.x * self.scale
+        self.zoom.offset_y = self.offset_y - main_canvas.y * self.scale
+        
         # Рисуем фон главной панели
-        main_color = self.app.main_canvas.properties.get('fill_color', '#000000')
+        main_color = main_canvas.properties.get('fill_color', '#000000')
         self.preview_canvas.create_rectangle(
             self.offset_x, self.offset_y,
             self.offset_x + preview_width,
@@ -197,94 +267,107 @@ class PreviewMode:
         )
         
         # Рисуем все элементы
-        if self.app.element_manager:
-            elements = self.app.element_manager.get_all_elements()
-            for element in elements:
-                self._render_element(element)
+        self._build_scene()
 
-    def _render_element(self, element):
-        """Отрисовывает один элемент"""
-        # Позиция с учётом масштаба и смещения
-        x1 = self.offset_x + element.x * self.scale
-        y1 = self.offset_y + element.y * self.scale
-        x2 = x1 + element.width * self.scale
-        y2 = y1 + element.height * self.scale
-        
-        props = element.properties
-        elem_type = element.ELEMENT_TYPE
+    # === Статические слои ===
+
+    def _build_scene(self):
+        """
+        Рисует элементы по порядку глубины: подряд идущие статические
+        собираются в один слой-изображение, остальные - живые объекты.
+        """
+        canvas = self.preview_canvas
+        for record in self.preview_elements.values():
+            canvas.delete(record['tag'])
+        for layer in self._layers:
+            canvas.delete(layer['item'])
+        self.preview_elements.clear()
+        self._layers.clear()
+        self._static.clear()
+        if not self.app.element_manager:
+            return
         
-        # Цвета
-        fill_color = props.get('fill_color', '#ffffff')
-        stroke_color = props.get('stroke_color', '#ffffff')
-        stroke_width = props.get('stroke_width', 1) * self.scale
+        use_cache = self.static_cache and preview_raster.ensure_pil()
+        animated = self._animated_ids() if use_cache else set()
+        raster, run = None, []
+        for element in self.app.element_manager.get_all_elements():
+            if use_cache and self._is_static(element, animated):
+                if raster is None:
+                    raster = RasterCanvas(self.preview_window.winfo_screenwidth(),
+                                          self.preview_window.winfo_screenheight())
+                if raster.render(element, self.zoom):
+                    run.append(element.id)
+                    continue
+            if raster is not None:
+                self._add_layer(raster, run)
+                raster, run = None, []
+            self._render_element(element)
+        if raster is not None:
+            self._add_layer(raster, run)
+        
+        if self._layers:
+            log.debug("Превью: слоёв %d (элементов %d), живых элементов %d",
+                      len(self._layers), len(self._static), len(self.preview_elements))
+
+    def _add_layer(self, raster, element_ids):
+        """Кладёт растеризованную серию элементов на холст одним изображением"""
+        layer = {'item': None, 'photo': None, 'elements': list(element_ids)}
+        result = raster.crop()
+        if result is not None:
+            image, (x, y) = result
+            layer['photo'] = preview_raster.ImageTk.PhotoImage(image)
+            layer['item'] = self.preview_canvas.create_image(
+                x, y, image=layer['photo'], anchor='nw', tags='static_layer'
+            )
+        self._layers.append(layer)
+        for element_id in element_ids:
+            self._static[element_id] = layer
+
+    def _animated_ids(self):
+        """ID элементов, которые двигают механизмы или встроенная анимация"""
+        ids = set()
+        if self.app.mechanism_manager:
+            for mech in self.app.mechanism_manager.get_all_mechanisms():
+                ids.update(getattr(mech, 'attached_elements', ()))
+        for element in self.app.element_manager.get_all_elements():
+            if getattr(element, 'attached_mechanisms', None) or \
+                    element.properties.get('animation_enabled'):
+                ids.add(element.id)
+        return ids
+
+    def _is_static(self, element, animated):
+        return (hasattr(element, 'render_to')
+                and element.ELEMENT_TYPE not in self.INTERACTIVE_TYPES
+                and element.id not in animated)
+
+    def _render_element(self, element, overrides=None):
+        """
+        Отрисовывает один элемент (тем же draw(), что и редактор).
+        Уже нарисованный элемент перерисовывается на своём месте по глубине.
         
-        # Тег для элемента
+        Args:
+            element: Элемент редактора
+            overrides: Временные свойства (цвет наведения/нажатия)
+        """
         tag = f"elem_{element.id}"
+        old = self.preview_elements.get(element.id)
         
-        if elem_type == 'frame':
-            # Рамка (только контур)
-            corner_radius = props.get('corner_radius', 0) * self.scale
-            if corner_radius > 0:
-                self._draw_rounded_rect(
-                    x1, y1, x2, y2, corner_radius,
-                    outline=stroke_color,
-                    width=stroke_width,
-                    fill='',
-                    tags=tag
-                )
-            else:
-                self.preview_canvas.create_rectangle(
-                    x1, y1, x2, y2,
-                    outline=stroke_color,
-                    width=stroke_width,
-                    fill='',
-                    tags=tag
-                )
-        
-        elif elem_type == 'panel':
-            # Панель (заполненная)
-            corner_radius = props.get('corner_radius', 0) * self.scale
-            if corner_radius > 0:
-                self._draw_rounded_rect(
-                    x1, y1, x2, y2, corner_radius,
-                    outline=stroke_color,
-                    width=stroke_width,
-                    fill=fill_color,
-                    tags=tag
-                )
+        if hasattr(element, 'render_to'):
+            items, state = element.render_to(self.preview_canvas, self.zoom, overrides)
+        else:
+            items, state = self._render_fallback(element), {}
+        for item in items:
+            self.preview_canvas.addtag_withtag(tag, item)
+        
+        if old is not None:
+            # Новые объекты - на место старых
+            if old['items']:
+                for item in items:
+                    self.preview_canvas.tag_lower(item, old['items'][0])
+                self.preview_canvas.delete(*old['items'])
             else:
-                self.preview_canvas.create_rectangle(
-                    x1, y1, x2, y2,
-                    outline=stroke_color,
-                    width=stroke_width,
-                    fill=fill_color,
-                    tags=tag
-                )
-        
-        elif elem_type == 'button':
-            # Кнопка
-            corner_radius = props.get('corner_radius', 4) * self.scale
-            self._draw_rounded_rect(
-                x1, y1, x2, y2, corner_radius,
-                outline=stroke_color,
-                width=stroke_width,
-                fill=fill_color,
-                tags=tag
-            )
-            
-            # Текст кнопки
-            text = props.get('text', 'Кнопка')
-            text_color = props.get('text_color', '#ffffff')
-            font_size = int(props.get('font_size', 12) * self.scale)
-            
-            self.preview_canvas.create_text(
-                (x1 + x2) / 2, (y1 + y2) / 2,
-                text=text,
-                fill=text_color,
-                font=("Arial", font_size),
-                tags=tag
-            )
-            
+                self._restack(element)
+        elif element.ELEMENT_TYPE == 'button':
             # Привязка клика для кнопки
             self.preview_canvas.tag_bind(tag, '<Button-1>', 
                 lambda e, el=element: self._on_button_click(el))
@@ -293,111 +376,189 @@ class PreviewMode:
             self.preview_canvas.tag_bind(tag, '<Leave>',
                 lambda e, el=element: self._on_button_hover(el, False))
         
-        elif elem_type == 'text':
-            # Текст
-            text = props.get('text', 'Текст')
-            text_color = props.get('text_color', props.get('fill_color', '#ffffff'))
-            font_family = props.get('font_family', 'Arial')
-            font_size = int(props.get('font_size', 16) * self.scale)
-            
-            self.preview_canvas.create_text(
-                x1, y1,
-                text=text,
-                fill=text_color,
-                font=(font_family, font_size),
-                anchor='nw',
-                width=(x2 - x1),
-                tags=tag
-            )
-        
-        elif elem_type == 'image':
-            # Изображение (если загружено)
-            if hasattr(element, 'preview_image') and element.preview_image:
-                # Масштабируем изображение
-                from PIL import Image, ImageTk
-                img = element.original_image
-                new_width = int(element.width * self.scale)
-                new_height = int(element.height * self.scale)
-                img_resized = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(img_resized)
-                
-                self.preview_canvas.create_image(
-                    x1, y1,
-                    image=photo,
-                    anchor='nw',
-                    tags=tag
-                )
-                
-                # Сохраняем ссылку
-                if not hasattr(self, '_preview_images'):
-                    self._preview_images = []
-                self._preview_images.append(photo)
-            else:
-                # Плейсхолдер
-                self.preview_canvas.create_rectangle(
-                    x1, y1, x2, y2,
-                    fill='#2a2a2a',
-                    outline='#4a4a4a',
-                    tags=tag
-                )
-                self.preview_canvas.create_text(
-                    (x1 + x2) / 2, (y1 + y2) / 2,
-                    text="🖼",
-                    font=("Arial", int(24 * self.scale)),
-                    fill='#6a6a6a',
-                    tags=tag
-                )
-        
-        else:
-            # Базовый прямоугольник для неизвестных типов
-            self.preview_canvas.create_rectangle(
-                x1, y1, x2, y2,
-                outline=stroke_color,
-                width=stroke_width,
-                fill=fill_color,
-                tags=tag
-            )
-        
-        # Сохраняем ссылку на элемент
-        self.preview_elements.append({
+        # Сохраняем ссылку на элемент (и его PhotoImage, пока объекты на холсте)
+        x1, y1 = self.zoom.real_to_screen(element.x, element.y)
+        self.preview_elements[element.id] = {
             'element': element,
             'tag': tag,
-            'x1': x1, 'y1': y1, 'x2': x2, 'y2': y2
-        })
-
-    def _draw_rounded_rect(self, x1, y1, x2, y2, radius, **kwargs):
-        """Рисует прямоугольник с закруглёнными углами"""
-        tags = kwargs.pop('tags', '')
-        fill = kwargs.pop('fill', '')
-        outline = kwargs.pop('outline', '#ffffff')
-        width = kwargs.pop('width', 1)
-        
-        # Упрощённая версия - используем polygon
-        r = min(radius, (x2-x1)/2, (y2-y1)/2)
-        
-        points = [
-            x1+r, y1,
-            x2-r, y1,
-            x2, y1,
-            x2, y1+r,
-            x2, y2-r,
-            x2, y2,
-            x2-r, y2,
-            x1+r, y2,
-            x1, y2,
-            x1, y2-r,
-            x1, y1+r,
+            'items': items,
+            'state': state,
+            'signature': self._signature(element),
+            'x1': x1, 'y1': y1,
+            'x2': x1 + self.zoom.scale_value(element.width),
+            'y2': y1 + self.zoom.scale_value(element.height),
+        }
+
+    def _render_fallback(self, element):
+        """Прямоугольник для элементов без render_to()"""
+        if not getattr(element, 'is_visible', True):
+            return []
+        props = getattr(element, 'properties', {})
+        x1, y1 = self.zoom.real_to_screen(element.x, element.y)
+        item = self.preview_canvas.create_rectangle(
             x1, y1,
-        ]
-        
-        self.preview_canvas.create_polygon(
-            points,
-            fill=fill,
-            outline=outline,
-            width=width,
-            smooth=True,
-            tags=tags
+            x1 + self.zoom.scale_value(element.width),
+            y1 + self.zoom.scale_value(element.height),
+            outline=props.get('stroke_color', getattr(element, 'border_color', '#ffffff')),
+            width=self.zoom.scale_value(props.get('stroke_width', 1)),
+            fill=props.get('fill_color', getattr(element, 'fill_color', '#ffffff')),
         )
+        return [item]
+
+    @staticmethod
+    def _signature(element):
+        """Всё, от чего зависит отрисовка элемента (для опроса живых элементов)"""
+        return (element.x, element.y, element.width, element.height,
+                element.is_visible, tuple(element.properties.values()))
+
+    def _restack(self, element):
+        """Ставит элемент без прежних объектов под следующий по глубине"""
+        elements = self.app.element_manager.get_all_elements()
+        if element not in elements:
+            return
+        for above in elements[elements.index(element) + 1:]:
+            record = self.preview_elements.get(above.id)
+            if record and record['items']:
+                self.preview_canvas.tag_lower(f"elem_{element.id}", record['items'][0])
+                return
+            layer = self._static.get(above.id)
+            if layer and layer['item']:
+                self.preview_canvas.tag_lower(f"elem_{element.id}", layer['item'])
+                return
+
+    # === Инкрементальное обновление ===
+
+    def _subscribe(self):
+        for event in self.STRUCTURE_EVENTS:
+            subscribe(event, self._on_elements_changed)
+        for event in self.ELEMENT_EVENTS:
+            subscribe(event, self._on_element_changed)
+        subscribe('main_canvas.updated', self._on_canvas_changed)
+
+    def _unsubscribe(self):
+        for event in self.STRUCTURE_EVENTS:
+            unsubscribe(event, self._on_elements_changed)
+        for event in self.ELEMENT_EVENTS:
+            unsubscribe(event, self._on_element_changed)
+        unsubscribe('main_canvas.updated', self._on_canvas_changed)
+
+    def _on_elements_changed(self, data=None):
+        """Элементы созданы/удалены/переставлены - сверка списка в ближайшем кадре"""
+        self._structure_dirty = True
+
+    def _on_element_changed(self, data=None):
+        """Изменён один элемент - перерисовывается только он"""
+        element = (data or {}).get('element')
+        if element is None:
+            self._structure_dirty = True
+        else:
+            self._dirty.add(element.id)
+
+    def _on_canvas_changed(self, data=None):
+        """Изменилась главная панель (размер/цвет) - полная перерисовка"""
+        self._canvas_dirty = True
+
+    def _sync(self):
+        """Применяет накопленные изменения к превью"""
+        if not self.is_active or not self.preview_canvas or not self.app.element_manager:
+            return
+        if self._canvas_dirty:
+            self.refresh()
+            return
+        dirty, self._dirty = self._dirty, set()
+        structure, self._structure_dirty = self._structure_dirty, False
+        
+        # Изменения в слоях - слои собираются заново
+        if self._static and (structure or any(element_id in self._static for element_id in dirty)):
+            self._build_scene()
+            return
+        
+        elements = self.app.element_manager.get_all_elements()
+        if structure:
+            current = {element.id for element in elements}
+            for element_id in [eid for eid in self.preview_elements if eid not in current]:
+                record = self.preview_elements.pop(element_id)
+                self.preview_canvas.delete(record['tag'])
+                if self._hovered == element_id:
+                    self._hovered = None
+            for element in elements:
+                if element.id not in self.preview_elements:
+                    self._render_element(element)
+                    dirty.discard(element.id)
+            # Порядок по глубине: каждый следующий - поверх предыдущих
+            for element in elements:
+                self.preview_canvas.tag_raise(f"elem_{element.id}")
+        
+        by_id = {element.id: element for element in elements}
+        for element_id in dirty:
+            element = by_id.get(element_id)
+            if element is not None and element_id in self.preview_elements:
+                self._render_element(element, self._state_overrides(element))
+
+    def _state_overrides(self, element):
+        """Свойства, которыми отличается кнопка под курсором"""
+        if element.id == self._hovered:
+            return {'fill_color': element.properties.get('hover_color', '#4a4a4a')}
+        return None
+
+    # === Кадровый цикл ===
+
+    def _start_loop(self):
+        self._frames = 0
+        self._over_budget = 0
+        self._loop_started = time.perf_counter()
+        self._loop_id = self.preview_window.after(1, self._tick)
+
+    def _stop_loop(self):
+        if self._loop_id is not None:
+            try:
+                self.preview_window.after_cancel(self._loop_id)
+            except (tk.TclError, AttributeError):
+                pass
+            self._loop_id = None
+        stats = self.frame_stats()
+        if stats['frames']:
+            log.debug("Превью: %d кадров, %.1f FPS, сверх бюджета %d",
+                      stats['frames'], stats['fps'], stats['over_budget'])
+
+    def _tick(self):
+        """Кадр: механизмы, изменения редактора, живые элементы"""
+        self._loop_id = None
+        if not self.is_active or not self.preview_canvas:
+            return
+        frame_ms = 1000 / max(1, self.target_fps)
+        started = time.perf_counter()
+        
+        self.clock.tick()
+        self._sync()
+        self._update_live()
+        
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._frames += 1
+        if elapsed_ms > frame_ms:
+            self._over_budget += 1
+        # Следующий кадр - с учётом времени, потраченного на этот
+        if self.is_active and self.preview_window:
+            self._loop_id = self.preview_window.after(max(1, int(frame_ms - elapsed_ms)), self._tick)
+
+    def _update_live(self):
+        """Перерисовывает живые элементы, изменённые механизмами/анимацией"""
+        for record in list(self.preview_elements.values()):
+            element = record['element']
+            if self._signature(element) != record['signature']:
+                self._render_element(element, self._state_overrides(element))
+
+    def frame_stats(self):
+        """Статистика кадрового цикла"""
+        seconds = time.perf_counter() - self._loop_started if self._loop_started else 0
+        return {
+            'frames': self._frames,
+            'fps': self._frames / seconds if seconds > 0 else 0.0,
+            'over_budget': self._over_budget,
+            'layers': len(self._layers),
+            'static_elements': len(self._static),
+            'live_elements': len(self.preview_elements),
+        }
 
     def _start_mechanisms(self):
         """Запускает все механизмы"""
@@ -405,6 +566,9 @@ class PreviewMode:
             return
         
         mechanisms = self.app.mechanism_manager.get_all_mechanisms()
+        for mech in mechanisms:
+            # Кадры анимации - из общего цикла превью
+            mech.frame_clock = self.clock
         for mech in mechanisms:
             if mech.properties.get('autostart', False):
                 mech.start()
@@ -415,45 +579,45 @@ class PreviewMode:
         for mech in self.preview_mechanisms:
             mech.stop()
         self.preview_mechanisms.clear()
+        
+        # Запущенные в превью кнопками продолжают на своих таймерах
+        if self.app.mechanism_manager:
+            for mech in self.app.mechanism_manager.get_all_mechanisms():
+                if getattr(mech, 'frame_clock', None) is not self.clock:
+                    continue
+                mech.frame_clock = None
+                if self.clock.cancel(mech._animation_id):
+                    mech._animation_id = mech._next_frame()
 
     def _on_button_click(self, element):
         """Обработчик клика по кнопке"""
         props = element.properties
-        func_id = props.get('function_id', 0)
+        func_id = props.get('button_function_id', 0)
         
         print(f"🖱 Клик по кнопке: {element.id}, функция #{func_id}")
         
         # Вызываем функцию если есть
         if hasattr(self.app, 'button_functions') and self.app.button_functions:
-            self.app.button_functions.execute(func_id)
+            self.app.button_functions.call(func_id)
         
-        # Визуальный отклик
-        tag = f"elem_{element.id}"
-        original_fill = props.get('fill_color', '#ffffff')
+        # Визуальный отклик: цвет нажатия, через 100мс - обычный
+        self._render_element(element, {'fill_color': props.get('active_color', '#555555')})
         
-        # Затемняем
-        self.preview_canvas.itemconfig(tag, fill='#555555')
+        def restore():
+            if self.preview_canvas and element.id in self.preview_elements:
+                self._render_element(element, self._state_overrides(element))
         
-        # Восстанавливаем через 100мс
-        timer_id = self.preview_window.after(100, 
-            lambda: self.preview_canvas.itemconfig(tag, fill=original_fill) if self.preview_canvas else None)
+        timer_id = self.preview_window.after(100, restore)
         self._active_timers.append(timer_id)
 
     def _on_button_hover(self, element, entering):
         """Обработчик наведения на кнопку"""
-        tag = f"elem_{element.id}"
-        props = element.properties
-        
-        if entering:
-            # Подсветка при наведении
-            hover_color = props.get('hover_color', '#4a4a4a')
-            self.preview_canvas.itemconfig(tag, fill=hover_color)
-            self.preview_canvas.config(cursor='hand2')
-        else:
-            # Возврат к исходному
-            fill_color = props.get('fill_color', '#ffffff')
-            self.preview_canvas.itemconfig(tag, fill=fill_color)
-            self.preview_canvas.config(cursor='')
+        # Перерисовка под курсором снова вызывает <Enter> - повтор пропускается
+        if entering == (self._hovered == element.id):
+            return
+        self._hovered = element.id if entering else None
+        self._render_element(element, self._state_overrides(element))
+        self.preview_canvas.config(cursor='hand2' if entering else '')
 
     def _on_click(self, event):
         """Общий обработчик клика"""
@@ -475,9 +639,15 @@ class PreviewMode:
         return "break"
 
     def refresh(self):
-        """Обновляет отображение"""
+        """Полностью перерисовывает превью"""
         if self.is_active and self.preview_canvas:
             self.preview_canvas.delete('all')
             self.preview_elements.clear()
+            self._layers.clear()
+            self._static.clear()
+            self._dirty.clear()
+            self._structure_dirty = False
+            self._canvas_dirty = False
+            self._hovered = None
             self._render_preview()
 
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Растеризация статических элементов режима просмотра (Pillow)
+RasterCanvas повторяет часть API tk.Canvas, поэтому элементы рисуются
+своим draw() (через render_to) прямо в изображение. Элемент, которому
+нужен текст, картинка или привязки событий, в слой не попадает -
+он остаётся живым объектом холста.
+"""
+from typing import List, Optional, Tuple
+
+from .utils.logger import get_logger
+
+log = get_logger('PreviewRaster')
+
+# PIL импортируется при первом построении слоя, а не при старте
+PIL_AVAILABLE = None  # None - ещё не проверяли
+Image = None
+ImageDraw = None
+ImageColor = None
+ImageTk = None
+
+
+def ensure_pil() -> bool:
+    """Импортирует PIL при первом вызове; False если он не установлен"""
+    global PIL_AVAILABLE, Image, ImageDraw, ImageColor, ImageTk
+    if PIL_AVAILABLE is None:
+        try:
+            from PIL import Image as PILImage
+            from PIL import ImageDraw as PILImageDraw
+            from PIL import ImageColor as PILImageColor
+            from PIL import ImageTk as PILImageTk
+            Image = PILImage
+            ImageDraw = PILImageDraw
+            ImageColor = PILImageColor
+            ImageTk = PILImageTk
+            PIL_AVAILABLE = True
+        except ImportError:
+            PIL_AVAILABLE = False
+            log.warning("PIL не установлен - статические слои превью не кэшируются")
+    return PIL_AVAILABLE
+
+
+class Unsupported(Exception):
+    """Элемент рисует то, что не растеризуется (текст, картинка, события)"""
+
+
+def _smooth_points(points: List[float], steps: int = 8) -> List[Tuple[float, float]]:
+    """
+    Сглаживание как у Tk (smooth=True): парабола между серединами
+    соседних отрезков, вершины - контрольные точки.
+    """
+    pts = list(zip(points[0::2], points[1::2]))
+    closed = len(pts) > 2 and pts[0] == pts[-1]
+    if closed:
+        pts = pts[:-1]
+    count = len(pts)
+    if count < 3:
+        return pts
+
+    result = []
+    segments = range(count) if closed else range(1, count - 1)
+    for i in segments:
+        p0, p1, p2 = pts[i - 1], pts[i], pts[(i + 1) % count]
+        start = ((p0[0] + p1[0]) / 2, (p0[1] + p1[1]) / 2)
+        end = ((p1[0] + p2[0]) / 2, (p1[1] + p2[1]) / 2)
+        if not closed:
+            if i == 1:
+                start = p0
+            if i == count - 2:
+                end = p2
+        for step in range(steps):
+            t = step / steps
+            a, b, c = (1 - t) ** 2, 2 * t * (1 - t), t ** 2
+            result.append((a * start[0] + b * p1[0] + c * end[0],
+                           a * start[1] + b * p1[1] + c * end[1]))
+    if not closed:
+        result.append(pts[-1])
+    return result
+
+
+class RasterCanvas:
+    """
+    Холст-изображение с интерфейсом tk.Canvas для render_to().
+
+    Использование:
+        raster = RasterCanvas(width, height)
+        for element in static_elements:
+            if raster.render(element, zoom):      # False - элемент остаётся живым
+                ...
+        image, (x, y) = raster.crop()             # None если слой пуст
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = int(width)
+        self.height = int(height)
+        # Команды рисования: (метод ImageDraw, аргументы, параметры)
+        self._ops = []
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._ops)
+
+    # === Элементы ===
+
+    def render(self, element, zoom_system) -> bool:
+        """
+        Рисует элемент в слой.
+
+        Returns:
+            False если элемент нельзя растеризовать (его команды отброшены)
+        """
+        mark = len(self._ops)
+        try:
+            element.render_to(self, zoom_system)
+        except Unsupported:
+            del self._ops[mark:]
+            return False
+        except Exception as e:
+            log.debug("Элемент %s не растеризован: %s", getattr(element, 'id', element), e)
+            del self._ops[mark:]
+            return False
+        return True
+
+    def crop(self):
+        """
+        Рисует слой и обрезает прозрачные поля.
+
+        Returns:
+            (PIL Image, (x, y) левого верхнего угла) или None если слой пуст
+        """
+        if not self._ops:
+            return None
+        image = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+        for method, args, kwargs in self._ops:
+            getattr(draw, method)(*args, **kwargs)
+        bbox = image.getbbox()
+        if bbox is None:
+            return None
+        return image.crop(bbox), (bbox[0], bbox[1])
+
+    # === API tk.Canvas ===
+
+    def _add(self, method: Optional[str], *args, **kwargs) -> int:
+        """Запоминает команду (None - пустой объект) и возвращает id объекта"""
+        if method:
+            self._ops.append((method, args, kwargs))
+        self._next_id += 1
+        return self._next_id
+
+    @staticmethod
+    def _color(value) -> Optional[Tuple[int, ...]]:
+        if not value:
+            return None
+        try:
+            return ImageColor.getrgb(value)
+        except ValueError:
+            raise Unsupported(f"цвет {value!r}")
+
+    @staticmethod
+    def _check(kwargs):
+        if kwargs.get('dash') or kwargs.get('stipple'):
+            raise Unsupported("пунктир/штриховка")
+
+    def _outline_width(self, kwargs, outline) -> int:
+        if outline is None:
+            return 0
+        return max(1, int(round(float(kwargs.get('width', 1) or 1))))
+
+    def create_rectangle(self, x1, y1, x2, y2, **kwargs):
+        self._check(kwargs)
+        fill = self._color(kwargs.get('fill', ''))
+        outline = self._color(kwargs.get('outline', '#000000'))
+        x1, x2 = sorted((x1, x2))
+        y1, y2 = sorted((y1, y2))
+        return self._add('rectangle', [x1, y1, x2, y2], fill=fill, outline=outline,
+                         width=self._outline_width(kwargs, outline))
+
+    def create_oval(self, x1, y1, x2, y2, **kwargs):
+        self._check(kwargs)
+        fill = self._color(kwargs.get('fill', ''))
+        outline = self._color(kwargs.get('outline', '#000000'))
+        x1, x2 = sorted((x1, x2))
+        y1, y2 = sorted((y1, y2))
+        return self._add('ellipse', [x1, y1, x2, y2], fill=fill, outline=outline,
+                         width=self._outline_width(kwargs, outline))
+
+    def create_polygon(self, *points, **kwargs):
+        self._check(kwargs)
+        if len(points) == 1:
+            points = points[0]
+        points = [float(value) for value in points]
+        if kwargs.get('smooth'):
+            # Многоугольник Tk всегда замкнут
+            if points[:2] != points[-2:]:
+                points = points + points[:2]
+            pts = _smooth_points(points)
+        else:
+            pts = list(zip(points[0::2], points[1::2]))
+        if len(pts) < 2:
+            return self._add(None)
+        fill = self._color(kwargs.get('fill', '#000000'))
+        outline = self._color(kwargs.get('outline', ''))
+        item = self._add('polygon', pts, fill=fill)
+        if outline is not None:
+            # Контур отдельной линией: толщина polygon() есть не во всех версиях Pillow
+            item = self._add('line', pts + [pts[0]], fill=outline,
+                             width=self._outline_width(kwargs, outline), joint='curve')
+        return item
+
+    def create_line(self, *points, **kwargs):
+        self._check(kwargs)
+        if len(points) == 1:
+            points = points[0]
+        points = [float(value) for value in points]
+        if kwargs.get('arrow'):
+            raise Unsupported("стрелки")
+        pts = _smooth_points(points) if kwargs.get('smooth') else list(zip(points[0::2], points[1::2]))
+        fill = self._color(kwargs.get('fill', '#000000'))
+        if fill is None or len(pts) < 2:
+            return self._add(None)
+        return self._add('line', pts, fill=fill,
+                         width=max(1, int(round(float(kwargs.get('width', 1) or 1)))), joint='curve')
+
+    def create_text(self, *args, **kwargs):
+        raise Unsupported("текст")
+
+    def create_image(self, *args, **kwargs):
+        raise Unsupported("изображение")
+
+    def create_arc(self, *args, **kwargs):
+        raise Unsupported("дуга")
+
+    def create_window(self, *args, **kwargs):
+        raise Unsupported("виджет")
+
+    def tag_bind(self, *args, **kwargs):
+        raise Unsupported("привязка событий")
+
+    def itemconfig(self, *args, **kwargs):
+        raise Unsupported("изменение объекта")
+
+    def after(self, *args, **kwargs):
+        raise Unsupported("анимация")
+
+    # Порядок и удаление объектов слоя не меняют (команды уже в порядке отрисовки)
+    def delete(self, *args):
+        pass
+
+    def tag_raise(self, *args):
+        pass
+
+    def tag_lower(self, *args):
+        pass
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Сервер живого превью
+Раздаёт сгенерированный проект из памяти через http.server
+и отправляет изменения в браузер через Server-Sent Events.
+Браузер получает только изменённые CSS правила и узлы элементов
+"""
+import json
+import queue
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from .utils.logger import get_logger
+
+log = get_logger('PreviewServer')
+
+
+# Клиентский скрипт: применяет патчи без перезагрузки страницы.
+# Версия страницы берётся из атрибута тега <script>; пропуск версии
+# (переподключение, патчи разошлись с загруженной страницей) - полная перезагрузка
+LIVE_RELOAD_SCRIPT = '''(function() {
+    var version = Number(document.currentScript.getAttribute("data-pwc-version"));
+    var source = new EventSource("/events");
+    function sync(next) {
+        if (next > version + 1) {
+            location.reload();
+            return false;
+        }
+        version = Math.max(version, next);
+        return true;
+    }
+    function runJs(code) {
+        if (!code) return;
+        try { new Function(code)(); } catch (e) { console.error(e); }
+    }
+    function styleFor(id) {
+        var style = document.querySelector('style[data-pwc="' + id + '"]');
+        if (!style) {
+            style = document.createElement("style");
+            style.setAttribute("data-pwc", id);
+            document.head.appendChild(style);
+        }
+        return style;
+    }
+    function container() {
+        return document.getElementById("main-container") || document.body;
+    }
+    source.addEventListener("version", function(event) {
+        // Первое событие соединения: текущая версия сервера
+        if (JSON.parse(event.data).version !== version) location.reload();
+    });
+    source.addEventListener("patch", function(event) {
+        var patch = JSON.parse(event.data);
+        if (!sync(patch.version)) return;
+        if (patch.type === "reload") {
+            location.reload();
+        } else if (patch.type === "base") {
+            document.getElementById("pwc-base").textContent = patch.css;
+        } else if (patch.type === "css") {
+            styleFor(patch.id).textContent = patch.css;
+        } else if (patch.type === "node") {
+            var tpl = document.createElement("template");
+            tpl.innerHTML = patch.html;
+            var node = tpl.content.firstElementChild;
+            var old = document.getElementById(patch.id);
+            if (old) { old.replaceWith(node); } else { container().appendChild(node); }
+            runJs(patch.js);
+        } else if (patch.type === "remove") {
+            var el = document.getElementById(patch.id);
+            if (el) el.remove();
+            var st = document.querySelector('style[data-pwc="' + patch.id + '"]');
+            if (st) st.remove();
+        } else if (patch.type === "order") {
+            var parent = container();
+            patch.ids.forEach(function(id) {
+                var el = document.getElementById(id);
+                if (el) parent.appendChild(el);
+            });
+        }
+    });
+})();'''
+
+
+class PreviewBundle:
+    """
+    Снимок сгенерированного проекта в памяти.
+
+    Хранит фрагменты по элементам, чтобы вычислять минимальный набор патчей.
+    """
+
+    def __init__(self, version: int = 0):
+        self.version = version
+        self.base_css = ""
+        self.order: List[str] = []
+        # el_id -> (html, css, js)
+        self.fragments: Dict[str, Tuple[str, str, str]] = {}
+        self.files: Dict[str, bytes] = {}
+
+    @classmethod
+    def build(cls, code_generator, version: int = 0) -> 'PreviewBundle':
+        """Строит снимок из CodeGenerator (version - номер, под которым его получат клиенты)"""
+        bundle = cls(version)
+        bundle.base_css = code_generator.generate_base_css()
+
+        for element in code_generator.elements:
+            el_id = element.id.replace('_', '-')
+            bundle.order.append(el_id)
+            bundle.fragments[el_id] = (
+                code_generator._element_to_html(element) or '',
+                code_generator._element_to_css(element) or '',
+                code_generator._element_to_js(element) or '',
+            )
+
+        bundle.files = {
+            '/': bundle._render_index(code_generator).encode('utf-8'),
+            '/style.css': code_generator.generate_css().encode('utf-8'),
+            '/script.js': code_generator.generate_js().encode('utf-8'),
+        }
+        bundle.files['/index.html'] = bundle.files['/']
+        return bundle
+
+    def _render_index(self, code_generator) -> str:
+        """Страница превью: каждое CSS правило - отдельный <style>, чтобы его можно было заменить"""
+        parts = [
+            '<!DOCTYPE html>',
+            '<html lang="ru">',
+            '<head>',
+            '<meta charset="UTF-8">',
+            '<title>Live Preview</title>',
+            f'<style id="pwc-base">\n{self.base_css}\n</style>',
+        ]
+        for el_id in self.order:
+            parts.append(f'<style data-pwc="{el_id}">\n{self.fragments[el_id][1]}\n</style>')
+        parts.append('</head>')
+        parts.append('<body>')
+        if code_generator.main_canvas:
+            parts.append('<div class="main-container" id="main-container">')
+        for el_id in self.order:
+            parts.append(self.fragments[el_id][0])
+        if code_generator.main_canvas:
+            parts.append('</div>')
+        parts.append(f'<script>\n{code_generator.generate_js()}\n</script>')
+        parts.append(f'<script data-pwc-version="{self.version}">\n{LIVE_RELOAD_SCRIPT}\n</script>')
+        parts.append('</body>')
+        parts.append('</html>')
+        return '\n'.join(parts)
+
+    def diff(self, previous: Optional['PreviewBundle']) -> List[dict]:
+        """Вычисляет патчи для перехода от previous к текущему снимку"""
+        if previous is None:
+            return [{'type': 'reload'}]
+
+        patches = []
+        if self.base_css != previous.base_css:
+            patches.append({'type': 'base', 'css': self.base_css})
+
+        for el_id in previous.order:
+            if el_id not in self.fragments:
+                patches.append({'type': 'remove', 'id': el_id})
+
+        for el_id in self.order:
+            html, css, js = self.fragments[el_id]
+            old = previous.fragments.get(el_id)
+            if old is None or old[1] != css:
+                patches.append({'type': 'css', 'id': el_id, 'css': css})
+            if old is None or old[0] != html or old[2] != js:
+                patches.append({'type': 'node', 'id': el_id, 'html': html, 'js': js})
+
+        # Порядок слоёв (z-order = порядок в DOM, новые узлы добавляются в конец)
+        kept = [el_id for el_id in previous.order if el_id in self.fragments]
+        added = [el_id for el_id in self.order if el_id not in previous.fragments]
+        if kept + added != self.order:
+            patches.append({'type': 'order', 'ids': list(self.order)})
+
+        return patches
+
+
+class PreviewServer:
+    """
+    Локальный сервер превью с live reload.
+
+    Использование:
+        server = PreviewServer(port=0)
+        url = server.start()
+        server.update(code_generator)   # после каждой регенерации
+        server.stop()
+    """
+
+    # Интервал keep-alive для SSE (сек)
+    KEEPALIVE_INTERVAL = 15
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        self.host = host
+        self.port = port
+
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self._bundle: Optional[PreviewBundle] = None
+        self._version = 0
+        self._clients: List[queue.Queue] = []
+
+    @property
+    def is_running(self) -> bool:
+        return self._httpd is not None
+
+    @property
+    def url(self) -> Optional[str]:
+        if not self._httpd:
+            return None
+        return f"http://{self.host}:{self._httpd.server_address[1]}/"
+
+    def start(self) -> str:
+        """Запускает сервер в фоновом потоке, возвращает URL"""
+        if self._httpd:
+            return self.url
+
+        self._httpd = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name='PreviewServer', daemon=True
+        )
+        self._thread.start()
+        log.info(f"Сервер превью запущен: {self.url}")
+        return self.url
+
+    def stop(self):
+        """Останавливает сервер и закрывает SSE соединения"""
+        if not self._httpd:
+            return
+        with self._lock:
+            clients = list(self._clients)
+            self._clients.clear()
+        for client in clients:
+            client.put(None)
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._httpd = None
+        self._thread = None
+        log.info("Сервер превью остановлен")
+
+    def update(self, code_generator):
+        """Пересобирает снимок и рассылает клиентам только изменения"""
+        bundle = PreviewBundle.build(code_generator, self._version + 1)
+        with self._lock:
+            patches = bundle.diff(self._bundle)
+            if not patches:
+                # Снимок не изменился - страница текущей версии остаётся
+                return
+            self._bundle = bundle
+            self._version = bundle.version
+            clients = list(self._clients)
+
+        for patch in patches:
+            patch['version'] = bundle.version
+            message = f"event: patch\ndata: {json.dumps(patch, ensure_ascii=False)}\n\n".encode('utf-8')
+            for client in clients:
+                client.put(message)
+
+        log.debug("Превью: %d патч(ей) для %d клиент(ов)", len(patches), len(clients))
+
+    def get_file(self, path: str) -> Optional[bytes]:
+        with self._lock:
+            if not self._bundle:
+                return None
+            return self._bundle.files.get(path)
+
+    # === HTTP ===
+
+    def _subscribe(self) -> queue.Queue:
+        """Новый клиент SSE; первым сообщением в очереди - текущая версия"""
+        client = queue.Queue()
+        with self._lock:
+            version = json.dumps({'version': self._version})
+            client.put(f"event: version\ndata: {version}\n\n".encode('utf-8'))
+            self._clients.append(client)
+        return client
+
+    def _unsubscribe(self, client: queue.Queue):
+        with self._lock:
+            if client in self._clients:
+                self._clients.remove(client)
+
+    def _make_handler(self):
+        server = self
+
+        class PreviewRequestHandler(BaseHTTPRequestHandler):
+            CONTENT_TYPES = {
+                '/': 'text/html; charset=utf-8',
+                '/index.html': 'text/html; charset=utf-8',
+                '/style.css': 'text/css; charset=utf-8',
+                '/script.js': 'application/javascript; charset=utf-8',
+            }
+
+            def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                if path == '/events':
+                    self._serve_events()
+                    return
+
+                body = server.get_file(path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', self.CONTENT_TYPES.get(path, 'text/plain'))
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Cache-Control', 'no-store')
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _serve_events(self):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Cache-Control', 'no-store')
+                self.send_header('Connection', 'keep-alive')
+                self.end_headers()
+
+                client = server._subscribe()
+                try:
+                    self.wfile.write(b": connected\n\n")
+                    self.wfile.flush()
+                    while True:
+                        try:
+                            message = client.get(timeout=server.KEEPALIVE_INTERVAL)
+                        except queue.Empty:
+                            message = b": keep-alive\n\n"
+                        if message is None:
+                            break
+                        self.wfile.write(message)
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # Браузер закрыл вкладку
+                finally:
+                    server._unsubscribe(client)
+
+            def log_message(self, format, *args):
+                log.debug(format, *args)
+
+        return PreviewRequestHandler
@@ -224,21 +224,12 @@ class ProjectManager:
         self.app.main_canvas.properties['fill_color'] = canvas_data.get('fill_color', '#000000')
         self.app.main_canvas.update()
         
-        # Загружаем элементы
+        # Загружаем элементы (одной пачкой, с сохранёнными ID)
         elements_data = data.get('elements', [])
-        for elem_data in elements_data:
-            elem_type = elem_data.get('type')
-            if elem_type:
-                element = self.app.element_manager.create_element(
-                    elem_type,
-                    elem_data.get('x', 0),
-                    elem_data.get('y', 0),
-                    elem_data.get('width', 100),
-                    elem_data.get('height', 100)
-                )
-                if element:
-                    element.from_dict(elem_data)
-                    element.update()
+        self.app.element_manager.create_elements_bulk(
+            [elem_data for elem_data in elements_data if elem_data.get('type')],
+            select=False, validate=False
+        )
         
         # Загружаем механизмы
         mechanisms_data = data.get('mechanisms', [])
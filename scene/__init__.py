@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+"""
+Модель сцены без Tk
+Позволяет загружать, изменять, проверять и экспортировать проекты без дисплея.
+Отрисовка на холсте - отдельный слой (SceneCanvasView)
+"""
+from .scene_model import (
+    SceneModel, ElementModel, MechanismModel, GroupModel, StateModel, CanvasModel,
+    DEFAULT_ELEMENT_PROPERTIES, DEFAULT_MECHANISM_PROPERTIES, DEFAULT_CANVAS_PROPERTIES
+)
+from .canvas_view import SceneCanvasView, scene_from_managers
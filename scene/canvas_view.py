@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Представление сцены на холсте
+Связывает SceneModel (чистые данные) с менеджерами Tk:
+render() материализует модель в элементы/механизмы холста,
+capture() снимает текущее состояние холста обратно в модель
+"""
+from .scene_model import SceneModel
+
+
+class SceneCanvasView:
+    """Слой отображения SceneModel через ElementManager/MechanismManager"""
+
+    def __init__(self, element_manager, mechanism_manager=None, main_canvas=None):
+        self.element_manager = element_manager
+        self.mechanism_manager = mechanism_manager
+        self.main_canvas = main_canvas
+
+    def render(self, scene: SceneModel):
+        """Заменяет содержимое холста содержимым сцены"""
+        if self.main_canvas:
+            self.main_canvas.x = scene.canvas.x
+            self.main_canvas.y = scene.canvas.y
+            self.main_canvas.width = scene.canvas.width
+            self.main_canvas.height = scene.canvas.height
+            self.main_canvas.properties.update(scene.canvas.properties)
+            self.main_canvas.update()
+
+        self.element_manager.from_dict([el.to_dict() for el in scene.elements])
+        for element in self.element_manager.elements:
+            element.set_element_manager(self.element_manager)
+            if self.mechanism_manager:
+                element.set_mechanism_manager(self.mechanism_manager)
+
+        if self.mechanism_manager:
+            for mech in self.mechanism_manager.get_all_mechanisms():
+                mech.destroy()
+            self.mechanism_manager.mechanisms = []
+            self.mechanism_manager.groups = []
+            self.mechanism_manager.selected_mechanism = None
+            self.mechanism_manager.from_dict(scene.to_dict()['mechanisms'])
+
+    def capture(self) -> SceneModel:
+        """Снимает текущее состояние холста в модель"""
+        return scene_from_managers(self.element_manager, self.mechanism_manager, self.main_canvas)
+
+
+def scene_from_managers(element_manager, mechanism_manager=None, main_canvas=None) -> SceneModel:
+    """Собирает SceneModel из менеджеров холста"""
+    data = {
+        'elements': [el.to_dict() for el in element_manager.get_all_elements()],
+        'mechanisms': mechanism_manager.to_dict() if mechanism_manager else [],
+    }
+    if main_canvas:
+        data['canvas'] = {
+            'x': main_canvas.x,
+            'y': main_canvas.y,
+            'width': main_canvas.width,
+            'height': main_canvas.height,
+            **main_canvas.properties,
+        }
+    return SceneModel.from_dict(data)
@@ -0,0 +1,665 @@
+#!/usr/bin/env python3
+"""
+Модель сцены (без Tk)
+Чистые данные проекта: элементы, механизмы, группы, состояния
+Формат to_dict/from_dict совпадает с форматом project.json,
+поэтому модель можно загрузить, изменить и экспортировать без дисплея
+"""
+import copy
+import json
+import uuid
+from typing import Dict, List, Optional, Any, Iterator
+
+
+# Единая система свойств элемента (все возможные свойства)
+# ElementBase берёт значения по умолчанию отсюда
+DEFAULT_ELEMENT_PROPERTIES = {
+    # === Основные цвета ===
+    'fill_color': '',           # Цвет заливки (пустой = прозрачный)
+    'stroke_color': '#ffffff',  # Цвет обводки
+    'stroke_width': 2,          # Толщина обводки
+    'opacity': 100,             # Прозрачность (0-100)
+
+    # === Геометрия ===
+    'shape': 'rectangle',       # rectangle, rounded, pill, chamfer
+    'display_mode': 'stroke',   # stroke, fill, both
+    'line_style': 'solid',      # solid, dashed, dotted, dash_dot, long_dash
+
+    # === Углы ===
+    'corner_radius': 0,
+    'corner_tl': None,
+    'corner_tr': None,
+    'corner_bl': None,
+    'corner_br': None,
+    'chamfer_size': 10,
+
+    # === Двойная рамка ===
+    'double_border': False,
+    'double_border_gap': 3,
+    'double_border_color': '',
+
+    # === Тень ===
+    'shadow_enabled': False,
+    'shadow_x': 2,
+    'shadow_y': 2,
+    'shadow_color': '#000000',
+
+    # === Внутренняя тень ===
+    'inset_shadow': False,
+    'inset_shadow_size': 5,
+    'inset_shadow_color': '#000000',
+
+    # === Свечение ===
+    'glow_enabled': False,
+    'glow_radius': 5,
+    'glow_color': '#ffffff',
+
+    # === Встроенный текст ===
+    'label_enabled': False,
+    'label_text': '',
+    'label_font': 'Arial',
+    'label_size': 12,
+    'label_color': '#ffffff',
+    'label_bold': False,
+    'label_italic': False,
+    'label_position': 'center',  # center, top, bottom, left, right, top-left, top-right, bottom-left, bottom-right
+    'label_offset_x': 0,
+    'label_offset_y': 0,
+
+    # === Трансформации ===
+    'rotation': 0,              # Угол поворота (градусы)
+    'scale_x': 1.0,             # Масштаб по X
+    'scale_y': 1.0,             # Масштаб по Y
+    'flip_h': False,            # Отразить горизонтально
+    'flip_v': False,            # Отразить вертикально
+
+    # === Анимация (базовая) ===
+    'animation_enabled': False,
+    'animation_type': 'none',   # none, pulse, bounce, shake, glow
+    'animation_speed': 1.0,
+    'animation_loop': True,
+}
+
+# Базовые свойства механизма (MechanismBase берёт их отсюда)
+DEFAULT_MECHANISM_PROPERTIES = {
+    'speed': 100,            # Скорость (px/сек)
+    'duration': 0,           # Длительность (0 = бесконечно)
+    'loop': False,           # Зацикливание
+    'reverse_on_end': True,  # Обратное движение в конце
+    'easing': 'linear',      # Функция плавности
+    'start_delay': 0,        # Задержка перед стартом (мс)
+}
+
+# Свойства главной панели (совместимы с MainCanvas)
+DEFAULT_CANVAS_PROPERTIES = {
+    'fill_color': '#000000',
+    'stroke_color': '#333333',
+    'stroke_width': 1,
+}
+
+
+class StateModel:
+    """Состояние переключателя (аналог ElementState)"""
+
+    def __init__(self, name="Состояние"):
+        self.id = f"state_{uuid.uuid4().hex[:6]}"
+        self.name = name
+        self.is_default = False
+        self.element_states = {}    # element_id -> {properties}
+        self.mechanism_states = {}  # mechanism_id -> {is_active, properties}
+        self.color = "#4a9fff"
+        self.icon = "●"
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'name': self.name,
+            'is_default': self.is_default,
+            'element_states': copy.deepcopy(self.element_states),
+            'mechanism_states': copy.deepcopy(self.mechanism_states),
+            'color': self.color,
+            'icon': self.icon,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'StateModel':
+        state = cls(data.get('name', 'Состояние'))
+        state.id = data.get('id', state.id)
+        state.is_default = data.get('is_default', False)
+        state.element_states = copy.deepcopy(data.get('element_states', {}))
+        state.mechanism_states = copy.deepcopy(data.get('mechanism_states', {}))
+        state.color = data.get('color', '#4a9fff')
+        state.icon = data.get('icon', '●')
+        return state
+
+
+class ElementModel:
+    """
+    Данные элемента без привязки к холсту.
+
+    Имеет те же атрибуты, что читает CodeGenerator
+    (ELEMENT_TYPE, id, x, y, width, height, properties),
+    поэтому модель можно передавать генератору напрямую.
+    """
+
+    # Ключи, которые хранятся в атрибутах, остальные уходят в extra
+    _KNOWN_KEYS = (
+        'type', 'id', 'x', 'y', 'width', 'height', 'properties',
+        'is_visible', 'is_protected', 'size_locked', 'position_locked',
+        'attached_mechanisms', 'parent_group', 'children', 'is_group',
+        'state_switcher_id', 'states',
+    )
+
+    def __init__(self, element_type: str, element_id: Optional[str] = None):
+        self.type = element_type
+        self.id = element_id or f"{element_type}_{uuid.uuid4().hex[:8]}"
+
+        # Позиция и размеры
+        self.x = 0
+        self.y = 0
+        self.width = 100
+        self.height = 100
+
+        # Свойства
+        self.properties = DEFAULT_ELEMENT_PROPERTIES.copy()
+
+        # Состояние
+        self.is_visible = True
+        self.is_protected = False
+        self.size_locked = False
+        self.position_locked = False
+
+        # Механизмы и группировка
+        self.attached_mechanisms = []
+        self.parent_group = None
+        self.children = []
+        self.is_group = False
+        self.state_switcher_id = None
+
+        # Состояния (только для state_switcher)
+        self.states = []  # List[StateModel]
+
+        # Поля конкретных типов (artifact_type, tree_data, bound_elements...)
+        self.extra = {}
+
+    @property
+    def ELEMENT_TYPE(self) -> str:
+        return self.type
+
+    # === Координаты ===
+
+    def get_bounds(self) -> tuple:
+        return (self.x, self.y, self.x + self.width, self.y + self.height)
+
+    def get_center(self) -> tuple:
+        return (self.x + self.width / 2, self.y + self.height / 2)
+
+    def contains_point(self, x, y) -> bool:
+        x1, y1, x2, y2 = self.get_bounds()
+        return x1 <= x <= x2 and y1 <= y <= y2
+
+    # === Свойства ===
+
+    def get_property(self, key):
+        return self.properties.get(key)
+
+    def set_property(self, key, value):
+        self.properties[key] = value
+
+    def set_properties(self, props: dict):
+        self.properties.update(props)
+
+    # === Сериализация ===
+
+    def to_dict(self) -> dict:
+        data = {
+            'type': self.type,
+            'id': self.id,
+            'x': self.x,
+            'y': self.y,
+            'width': self.width,
+            'height': self.height,
+            'properties': copy.deepcopy(self.properties),
+            'is_visible': self.is_visible,
+            'is_protected': self.is_protected,
+            'size_locked': self.size_locked,
+            'position_locked': self.position_locked,
+            'attached_mechanisms': self.attached_mechanisms.copy(),
+            'parent_group': self.parent_group,
+            'children': self.children.copy(),
+            'is_group': self.is_group,
+            'state_switcher_id': self.state_switcher_id,
+        }
+        if self.states:
+            data['states'] = [s.to_dict() for s in self.states]
+        data.update(copy.deepcopy(self.extra))
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ElementModel':
+        element = cls(data.get('type', 'frame'), data.get('id'))
+        element.x = data.get('x', 0)
+        element.y = data.get('y', 0)
+        element.width = data.get('width', 100)
+        element.height = data.get('height', 100)
+        element.properties.update(copy.deepcopy(data.get('properties', {})))
+        element.is_visible = data.get('is_visible', True)
+        element.is_protected = data.get('is_protected', False)
+        element.size_locked = data.get('size_locked', False)
+        element.position_locked = data.get('position_locked', False)
+        element.attached_mechanisms = list(data.get('attached_mechanisms', []))
+        element.parent_group = data.get('parent_group')
+        element.children = list(data.get('children', []))
+        element.is_group = data.get('is_group', False)
+        element.state_switcher_id = data.get('state_switcher_id')
+        element.states = [StateModel.from_dict(s) for s in data.get('states', [])]
+        element.extra = {
+            key: copy.deepcopy(value)
+            for key, value in data.items() if key not in cls._KNOWN_KEYS
+        }
+        return element
+
+    def clone(self) -> 'ElementModel':
+        """Создаёт независимую копию с новым ID (как ElementBase.clone)"""
+        data = self.to_dict()
+        data['id'] = f"{self.type}_{uuid.uuid4().hex[:8]}"
+        data['parent_group'] = None
+        data['children'] = []
+        data['attached_mechanisms'] = []
+        return ElementModel.from_dict(data)
+
+
+class MechanismModel:
+    """Данные механизма без привязки к холсту"""
+
+    _KNOWN_KEYS = (
+        'id', 'type', 'x', 'y', 'width', 'height', 'properties',
+        'attached_elements', 'trigger_button_id', 'trigger_function_id',
+    )
+
+    def __init__(self, mechanism_type: str, mechanism_id: Optional[str] = None):
+        self.type = mechanism_type
+        self.id = mechanism_id or f"mech_{mechanism_type}_{uuid.uuid4().hex[:6]}"
+
+        self.x = 0
+        self.y = 0
+        self.width = 100
+        self.height = 20
+
+        self.properties = DEFAULT_MECHANISM_PROPERTIES.copy()
+        self.attached_elements = []
+
+        # Привязка к кнопке
+        self.trigger_button_id = None
+        self.trigger_function_id = 0
+
+        # Поля конкретных типов
+        self.extra = {}
+
+    @property
+    def MECHANISM_TYPE(self) -> str:
+        return self.type
+
+    def to_dict(self) -> dict:
+        data = {
+            'id': self.id,
+            'type': self.type,
+            'x': self.x,
+            'y': self.y,
+            'width': self.width,
+            'height': self.height,
+            'properties': copy.deepcopy(self.properties),
+            'attached_elements': self.attached_elements.copy(),
+            'trigger_button_id': self.trigger_button_id,
+            'trigger_function_id': self.trigger_function_id,
+        }
+        data.update(copy.deepcopy(self.extra))
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'MechanismModel':
+        mech = cls(data.get('type', 'move_track'), data.get('id'))
+        mech.x = data.get('x', 0)
+        mech.y = data.get('y', 0)
+        mech.width = data.get('width', 100)
+        mech.height = data.get('height', 20)
+        mech.properties.update(copy.deepcopy(data.get('properties', {})))
+        mech.attached_elements = list(data.get('attached_elements', []))
+        mech.trigger_button_id = data.get('trigger_button_id')
+        mech.trigger_function_id = data.get('trigger_function_id', 0)
+        mech.extra = {
+            key: copy.deepcopy(value)
+            for key, value in data.items() if key not in cls._KNOWN_KEYS
+        }
+        return mech
+
+
+class GroupModel:
+    """Группа механизмов (аналог MechanismGroup)"""
+
+    def __init__(self, name="Группа", group_id: Optional[str] = None):
+        self.id = group_id or f"mech_group_{uuid.uuid4().hex[:6]}"
+        self.name = name
+        self.mechanism_ids = []
+        self.is_expanded = True
+        self.is_locked = False
+        self.is_visible = True
+
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'name': self.name,
+            'mechanism_ids': self.mechanism_ids.copy(),
+            'is_expanded': self.is_expanded,
+            'is_locked': self.is_locked,
+            'is_visible': self.is_visible,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'GroupModel':
+        group = cls(data.get('name', 'Группа'), data.get('id'))
+        group.mechanism_ids = list(data.get('mechanism_ids', []))
+        group.is_expanded = data.get('is_expanded', True)
+        group.is_locked = data.get('is_locked', False)
+        group.is_visible = data.get('is_visible', True)
+        return group
+
+
+class CanvasModel:
+    """Главная панель без привязки к холсту (совместима с MainCanvas для генератора)"""
+
+    def __init__(self, width=1920, height=1080):
+        self.x = 0
+        self.y = 0
+        self.width = width
+        self.height = height
+        self.properties = DEFAULT_CANVAS_PROPERTIES.copy()
+        self.is_visible = True
+
+    def get_bounds(self) -> tuple:
+        return (self.x, self.y, self.x + self.width, self.y + self.height)
+
+    def to_dict(self) -> dict:
+        data = {
+            'width': self.width,
+            'height': self.height,
+            'x': self.x,
+            'y': self.y,
+        }
+        data.update(self.properties)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CanvasModel':
+        canvas = cls(data.get('width', 1920), data.get('height', 1080))
+        canvas.x = data.get('x', 0)
+        canvas.y = data.get('y', 0)
+        for key in canvas.properties:
+            if key in data:
+                canvas.properties[key] = data[key]
+        return canvas
+
+
+class SceneModel:
+    """
+    Сцена проекта: главная панель, элементы, механизмы и их группы.
+
+    Использование:
+        scene = SceneModel.load('projects/demo/project.json')
+        for element in scene.elements:
+            element.set_property('stroke_color', '#ff0000')
+
+        generator = CodeGenerator()
+        generator.set_scene(scene)
+        html = generator.generate_all()
+    """
+
+    # Ключи верхнего уровня, которыми управляет модель
+    _KNOWN_KEYS = ('canvas', 'elements', 'mechanisms')
+
+    def __init__(self):
+        self.canvas = CanvasModel()
+        self.elements: List[ElementModel] = []
+        self.mechanisms: List[MechanismModel] = []
+        self.groups: List[GroupModel] = []
+
+        # Метаданные проекта (name, created, modified, ...)
+        self.meta: Dict[str, Any] = {}
+
+        # Индекс id -> модель
+        self._element_index: Dict[str, ElementModel] = {}
+        self._mechanism_index: Dict[str, MechanismModel] = {}
+
+    # === Элементы ===
+
+    def add_element(self, element: ElementModel) -> ElementModel:
+        self.elements.append(element)
+        self._element_index[element.id] = element
+        return element
+
+    def create_element(self, element_type: str, x=0, y=0, width=100, height=100, **properties) -> ElementModel:
+        """Создаёт элемент и добавляет его в сцену"""
+        element = ElementModel(element_type)
+        element.x = x
+        element.y = y
+        element.width = width
+        element.height = height
+        element.properties.update(properties)
+        return self.add_element(element)
+
+    def remove_element(self, element_id: str) -> Optional[ElementModel]:
+        """Удаляет элемент и отвязывает его от группы и механизмов"""
+        element = self._element_index.pop(element_id, None)
+        if element is None:
+            return None
+        self.elements.remove(element)
+
+        parent = self.get_element(element.parent_group) if element.parent_group else None
+        if parent and element_id in parent.children:
+            parent.children.remove(element_id)
+            parent.is_group = bool(parent.children)
+
+        for child in self.get_children(element):
+            child.parent_group = None
+
+        for mech in self.mechanisms:
+            if element_id in mech.attached_elements:
+                mech.attached_elements.remove(element_id)
+        return element
+
+    def get_element(self, element_id: str) -> Optional[ElementModel]:
+        return self._element_index.get(element_id)
+
+    def get_elements_by_type(self, element_type: str) -> List[ElementModel]:
+        return [el for el in self.elements if el.type == element_type]
+
+    # === Группировка элементов ===
+
+    def group_elements(self, parent_id: str, child_ids: List[str]):
+        """Делает элементы дочерними для parent_id"""
+        parent = self.get_element(parent_id)
+        if parent is None:
+            return
+        for child_id in child_ids:
+            child = self.get_element(child_id)
+            if child is None or child_id == parent_id:
+                continue
+            if child_id not in parent.children:
+                parent.children.append(child_id)
+            child.parent_group = parent_id
+        parent.is_group = bool(parent.children)
+
+    def get_children(self, element: ElementModel) -> List[ElementModel]:
+        children = []
+        for child_id in element.children:
+            child = self.get_element(child_id)
+            if child:
+                children.append(child)
+        return children
+
+    def iter_tree(self, element: ElementModel) -> Iterator[ElementModel]:
+        """Обходит элемент и всех его потомков"""
+        stack = [element]
+        seen = set()
+        while stack:
+            current = stack.pop()
+            if current.id in seen:
+                continue
+            seen.add(current.id)
+            yield current
+            stack.extend(reversed(self.get_children(current)))
+
+    def get_group_bounds(self, element: ElementModel) -> tuple:
+        """Границы группы (включая потомков)"""
+        min_x, min_y, max_x, max_y = element.get_bounds()
+        for node in self.iter_tree(element):
+            x1, y1, x2, y2 = node.get_bounds()
+            min_x = min(min_x, x1)
+            min_y = min(min_y, y1)
+            max_x = max(max_x, x2)
+            max_y = max(max_y, y2)
+        return (min_x, min_y, max_x, max_y)
+
+    # === Трансформации ===
+
+    def move_element(self, element_id: str, dx, dy):
+        """Смещает элемент вместе с потомками (как ElementBase.move_to)"""
+        element = self.get_element(element_id)
+        if element is None or element.position_locked:
+            return
+        for node in self.iter_tree(element):
+            node.x += dx
+            node.y += dy
+
+    def translate(self, dx, dy):
+        """Смещает всю сцену"""
+        for element in self.elements:
+            element.x += dx
+            element.y += dy
+        for mech in self.mechanisms:
+            mech.x += dx
+            mech.y += dy
+
+    def scale(self, factor: float):
+        """Масштабирует сцену относительно главной панели"""
+        ox, oy = self.canvas.x, self.canvas.y
+        for item in list(self.elements) + list(self.mechanisms):
+            item.x = ox + (item.x - ox) * factor
+            item.y = oy + (item.y - oy) * factor
+            item.width *= factor
+            item.height *= factor
+        self.canvas.width *= factor
+        self.canvas.height *= factor
+
+    # === Механизмы ===
+
+    def add_mechanism(self, mechanism: MechanismModel) -> MechanismModel:
+        self.mechanisms.append(mechanism)
+        self._mechanism_index[mechanism.id] = mechanism
+        return mechanism
+
+    def remove_mechanism(self, mechanism_id: str) -> Optional[MechanismModel]:
+        mechanism = self._mechanism_index.pop(mechanism_id, None)
+        if mechanism is None:
+            return None
+        self.mechanisms.remove(mechanism)
+        for element in self.elements:
+            if mechanism_id in element.attached_mechanisms:
+                element.attached_mechanisms.remove(mechanism_id)
+        for group in self.groups:
+            if mechanism_id in group.mechanism_ids:
+                group.mechanism_ids.remove(mechanism_id)
+        return mechanism
+
+    def get_mechanism(self, mechanism_id: str) -> Optional[MechanismModel]:
+        return self._mechanism_index.get(mechanism_id)
+
+    def attach(self, mechanism_id: str, element_id: str):
+        """Привязывает механизм к элементу с обеих сторон"""
+        mechanism = self.get_mechanism(mechanism_id)
+        element = self.get_element(element_id)
+        if mechanism is None or element is None:
+            return
+        if element_id not in mechanism.attached_elements:
+            mechanism.attached_elements.append(element_id)
+        if mechanism_id not in element.attached_mechanisms:
+            element.attached_mechanisms.append(mechanism_id)
+
+    # === Проверка ===
+
+    def validate(self) -> List[str]:
+        """
+        Проверяет сцену без отрисовки.
+
+        Returns:
+            Список описаний проблем (пустой если всё в порядке)
+        """
+        from ..size_constraints import SizeConstraints
+
+        problems = []
+        for element in self.elements:
+            ok, message = SizeConstraints.validate_size(element.type, element.width, element.height)
+            if not ok:
+                problems.append(f"{element.id}: {message}")
+            if element.parent_group and element.parent_group not in self._element_index:
+                problems.append(f"{element.id}: родитель {element.parent_group} не найден")
+            for child_id in element.children:
+                if child_id not in self._element_index:
+                    problems.append(f"{element.id}: дочерний {child_id} не найден")
+            for mech_id in element.attached_mechanisms:
+                if mech_id not in self._mechanism_index:
+                    problems.append(f"{element.id}: механизм {mech_id} не найден")
+        for mechanism in self.mechanisms:
+            for element_id in mechanism.attached_elements:
+                if element_id not in self._element_index:
+                    problems.append(f"{mechanism.id}: элемент {element_id} не найден")
+        return problems
+
+    # === Сериализация ===
+
+    def to_dict(self) -> dict:
+        """Сериализует сцену в формате project.json"""
+        data = copy.deepcopy(self.meta)
+        data['canvas'] = self.canvas.to_dict()
+        data['elements'] = [el.to_dict() for el in self.elements]
+        data['mechanisms'] = {
+            'mechanisms': [mech.to_dict() for mech in self.mechanisms],
+            'groups': [group.to_dict() for group in self.groups],
+        }
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SceneModel':
+        """Загружает сцену из словаря формата project.json"""
+        scene = cls()
+        scene.meta = {
+            key: copy.deepcopy(value)
+            for key, value in data.items() if key not in cls._KNOWN_KEYS
+        }
+        scene.canvas = CanvasModel.from_dict(data.get('canvas', {}))
+
+        for element_data in data.get('elements', []):
+            scene.add_element(ElementModel.from_dict(element_data))
+
+        # Механизмы хранятся списком (старый формат) или словарём с группами
+        mechanisms_data = data.get('mechanisms', [])
+        if isinstance(mechanisms_data, dict):
+            groups_data = mechanisms_data.get('groups', [])
+            mechanisms_data = mechanisms_data.get('mechanisms', [])
+        else:
+            groups_data = []
+        for mech_data in mechanisms_data:
+            scene.add_mechanism(MechanismModel.from_dict(mech_data))
+        scene.groups = [GroupModel.from_dict(g) for g in groups_data]
+        return scene
+
+    @classmethod
+    def load(cls, path: str) -> 'SceneModel':
+        """Загружает сцену из project.json"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def save(self, path: str):
+        """Сохраняет сцену в project.json"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
@@ -5,6 +5,8 @@
 Не является частью элемента - это независимый инструмент
 """
 
+from .utils.profiler import profiled
+
 
 class SelectionTool:
     """Инструмент для отображения рамки выделения"""
@@ -85,6 +87,7 @@ class SelectionTool:
                 pass  # Canvas destroyed
             self._animation_id = None
 
+    @profiled('selection.animate')
     def _animate(self):
         """Кадр анимации"""
         if not self.selected_element:
@@ -113,6 +116,10 @@ class SelectionTool:
                 pass  # Item already deleted
         self._size_label_items = []
 
+    def get_canvas_items(self):
+        """Объекты холста рамки выделения и метки размеров"""
+        return self.selection_items + self._size_label_items
+
     def _get_element_screen_bounds(self):
         """Получает экранные границы элемента (с учётом zoom)"""
         el = self.selected_element
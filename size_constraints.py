@@ -233,7 +233,7 @@ class SizeConstraints:
             width = min(width, max_canvas_width)
             height = min(height, max_canvas_height)
         
-        log.debug(f"Размеры {element_type}: {requested_width}×{requested_height} → {width}×{height}")
+        log.debug("Размеры %s: %s×%s → %s×%s", element_type, requested_width, requested_height, width, height)
         
         return width, height
     
@@ -1,9 +1,19 @@
 #!/usr/bin/env python3
 """
 Система вкладок с горизонтальной прокруткой
+
+Вкладки регистрируются фабриками: экземпляр создаётся при первом
+обращении, а дерево виджетов строится при первой активации
+(или заранее - по одной вкладке в паузах цикла событий, prebuild)
 """
 import tkinter as tk
+from typing import Callable, Dict, List, Optional
+
 from modules.config import Config
+from modules.utils.logger import get_logger
+from modules.utils.profiler import get_profiler
+
+log = get_logger('TabSystem')
 
 
 class TabSystem:
@@ -17,12 +27,20 @@ class TabSystem:
     COLOR_TEXT_MUTED = '#8d96a0'
     COLOR_ACCENT = '#2f81f7'
 
+    # Пауза между построениями вкладок в фоне (мс)
+    PREBUILD_GAP_MS = 50
+
     def __init__(self, parent, config: Config):
         self.parent = parent
         self.config = config
+        # ID вкладки -> фабрика (класс вкладки), в порядке кнопок
+        self._factories: Dict[str, Callable] = {}
+        # Созданные экземпляры
         self.tabs = {}
         self.tab_buttons = {}
         self.active_tab = None
+        self._prebuild_queue: List[str] = []
+        self._prebuild_id = None
 
     def build(self):
         """Создаёт систему вкладок"""
@@ -73,8 +91,9 @@ class TabSystem:
         self._create_tabs()
         self._create_buttons()
 
-        if self.tabs:
-            self.switch_to(list(self.tabs.keys())[0])
+        # Строится только первая (видимая) вкладка
+        if self._factories:
+            self.switch_to(next(iter(self._factories)))
 
     def _on_frame_configure(self, e):
         self.canvas.configure(scrollregion=self.canvas.bbox("all"))
@@ -122,7 +141,7 @@ class TabSystem:
             pass  # Widget not ready yet
 
     def _create_tabs(self):
-        """Создаёт экземпляры вкладок"""
+        """Регистрирует вкладки (экземпляры и виджеты создаются лениво)"""
         from modules.tabs.tab_elements import TabElements
         from modules.tabs.tab_mechanisms import TabMechanisms
         from modules.tabs.tab_layers import TabLayers
@@ -141,14 +160,74 @@ class TabSystem:
         ]
 
         for TabClass in tab_classes:
-            tab = TabClass(self.content_frame, self.config)
+            self.register_tab(TabClass.TAB_ID, TabClass)
+
+    def register_tab(self, tab_id: str, factory: Callable):
+        """
+        Регистрирует вкладку.
+
+        Args:
+            tab_id: ID вкладки
+            factory: Класс вкладки или функция (parent, config) -> вкладка;
+                     символ кнопки берётся из её TAB_SYMBOL
+        """
+        self._factories[tab_id] = factory
+
+    def _instance(self, tab_id):
+        """Экземпляр вкладки (создаётся при первом обращении, без виджетов)"""
+        tab = self.tabs.get(tab_id)
+        if tab is None and tab_id in self._factories:
+            tab = self._factories[tab_id](self.content_frame, self.config)
+            self.tabs[tab_id] = tab
+        return tab
+
+    def _build_tab(self, tab_id):
+        """Строит виджеты вкладки, если они ещё не построены"""
+        tab = self._instance(tab_id)
+        if tab is None or tab.built:
+            return tab
+        if tab_id in self._prebuild_queue:
+            self._prebuild_queue.remove(tab_id)
+        with get_profiler().span(f'tab.build.{tab_id}'):
             tab.build()
-            self.tabs[TabClass.TAB_ID] = tab
+        return tab
+
+    def prebuild(self, tab_ids: Optional[List[str]] = None):
+        """
+        Ставит вкладки в очередь фонового построения:
+        по одной за паузу цикла событий, чтобы не блокировать ввод.
+        """
+        if tab_ids is None:
+            tab_ids = list(self._factories)
+        for tab_id in tab_ids:
+            tab = self.tabs.get(tab_id)
+            if tab_id in self._factories and tab_id not in self._prebuild_queue \
+                    and not (tab and tab.built):
+                self._prebuild_queue.append(tab_id)
+        self._schedule_prebuild()
+
+    def _schedule_prebuild(self):
+        if self._prebuild_queue and self._prebuild_id is None:
+            self._prebuild_id = self.parent.after(
+                self.PREBUILD_GAP_MS,
+                lambda: self.parent.after_idle(self._prebuild_next)
+            )
+
+    def _prebuild_next(self):
+        self._prebuild_id = None
+        if not self._prebuild_queue:
+            return
+        tab_id = self._prebuild_queue.pop(0)
+        try:
+            self._build_tab(tab_id)
+        except Exception as e:
+            log.error("Вкладка %s не построена: %s", tab_id, e)
+        self._schedule_prebuild()
 
     def _create_buttons(self):
         """Создаёт кнопки вкладок"""
-        for tab_id, tab in self.tabs.items():
-            symbol = getattr(tab, 'TAB_SYMBOL', '○')
+        for tab_id, factory in self._factories.items():
+            symbol = getattr(factory, 'TAB_SYMBOL', '○')
             
             btn = tk.Button(
                 self.buttons_frame,
@@ -167,9 +246,10 @@ class TabSystem:
             self.tab_buttons[tab_id] = btn
 
     def switch_to(self, tab_id):
-        """Переключает на вкладку"""
-        if tab_id not in self.tabs:
+        """Переключает на вкладку (при первой активации строит её виджеты)"""
+        if tab_id not in self._factories:
             return
+        self._build_tab(tab_id)
 
         # Деактивировать предыдущую
         if self.active_tab and self.active_tab in self.tabs:
@@ -215,9 +295,17 @@ class TabSystem:
         except (tk.TclError, TypeError, ZeroDivisionError):
             pass  # Widget geometry not ready
 
-    def get_tab(self, tab_id):
-        """Возвращает вкладку по ID"""
-        return self.tabs.get(tab_id)
+    def get_tab(self, tab_id, build: bool = True):
+        """
+        Возвращает вкладку по ID.
+
+        Args:
+            build: Построить виджеты, если вкладка ещё не показывалась.
+                   False - только для установки ссылок (set_*), без обращения к виджетам
+        """
+        if build:
+            return self._build_tab(tab_id)
+        return self._instance(tab_id)
 
     def get_active_tab(self):
         """Возвращает активную вкладку"""
@@ -1,15 +1,21 @@
 #!/usr/bin/env python3
 """
 Модуль вкладок боковой панели
+
+Вкладки загружаются при первом обращении (PEP 562), а не при импорте пакета
 """
-from .tab_base import TabBase
-from .tab_menu import TabMenu
-from .tab_elements import TabElements
-from .tab_mechanisms import TabMechanisms
-from .tab_layers import TabLayers
-from .tab_settings import TabSettings
-from .tab_color import TabColor
-from .tab_text import TabText
-from .tab_code import TabCode
-from .tab_filters import TabFilters
-from .tab_ai import TabAI
+from ..utils.lazy_import import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(__name__, {
+    '.tab_base': ('TabBase',),
+    '.tab_menu': ('TabMenu',),
+    '.tab_elements': ('TabElements',),
+    '.tab_mechanisms': ('TabMechanisms',),
+    '.tab_layers': ('TabLayers',),
+    '.tab_settings': ('TabSettings',),
+    '.tab_color': ('TabColor',),
+    '.tab_text': ('TabText',),
+    '.tab_code': ('TabCode',),
+    '.tab_filters': ('TabFilters',),
+    '.tab_ai': ('TabAI',),
+})
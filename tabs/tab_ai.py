@@ -30,7 +30,13 @@ class TabAI(TabBase):
         self.main_canvas = None
         self.settings_tab = None
         self.app = None
+        self.ai_assistant = None
         self.chat_history = []
+        # Текущая генерация локальной модели (AIRequest) и номер ответа в чате
+        self._request = None
+        self._stream_id = 0
+        # Описания элементов последней генерации (до «Применить»)
+        self._generated = []
 
     def set_element_manager(self, manager):
         self.element_manager = manager
@@ -44,6 +50,10 @@ class TabAI(TabBase):
     def set_app(self, app):
         self.app = app
 
+    def set_ai_assistant(self, assistant):
+        """Локальная модель (GPT4All) для провайдера GPT4All"""
+        self.ai_assistant = assistant
+
     def _build_content(self):
         self.content = self._scroll_container(self.frame)
         
@@ -102,6 +112,8 @@ class TabAI(TabBase):
         input_entry.bind('<Return>', lambda e: self._send_message())
         
         self._button(input_frame, "→", self._send_message, 'primary').pack(side=tk.RIGHT)
+        self.stop_btn = self._button(input_frame, "■", self._stop_generation, 'danger')
+        self._tooltip(self.stop_btn, 'Остановить генерацию')
         
         # Быстрые действия
         row = self._row(sec)
@@ -186,10 +198,79 @@ class TabAI(TabBase):
         # Получить контекст
         context = self._get_context()
         
+        # Локальная модель - ответ по мере генерации
+        if self._uses_local_model():
+            self._stream_local(msg)
+            return
+        
         # Отправить запрос (заглушка)
         response = self._call_ai(msg, context)
         self._add_message('ai', response)
 
+    def _uses_local_model(self):
+        return self.ai_assistant is not None and self.provider_var.get() == 'GPT4All'
+
+    def _stream_local(self, msg):
+        """Запрос к локальной модели: токены дописываются в чат по мере генерации"""
+        assistant = self.ai_assistant
+        if not assistant.is_loaded:
+            self._add_message('system', 'Загрузка модели...')
+            
+            def on_loaded(ok):
+                if ok:
+                    self._stream_local(msg)
+                else:
+                    self._add_message('system', 'Модель не загружена')
+            assistant.load_model(on_loaded)
+            return
+        
+        # Новый вопрос отменяет ещё идущий ответ
+        self._stop_generation()
+        self._stream_id += 1
+        stream_id = self._stream_id
+        
+        self.chat_text.config(state='normal')
+        self.chat_text.insert(tk.END, "\nAI: ", 'ai')
+        self.chat_text.config(state='disabled')
+        
+        # Ответ из кэша приходит сразу, ещё внутри submit()
+        def on_token(chunk):
+            if stream_id != self._stream_id:
+                return
+            self.chat_text.config(state='normal')
+            self.chat_text.insert(tk.END, chunk, 'ai')
+            self.chat_text.config(state='disabled')
+            self.chat_text.see(tk.END)
+        
+        def on_done(response):
+            if stream_id != self._stream_id:
+                return
+            self._stream_id += 1
+            self._request = None
+            self.stop_btn.pack_forget()
+            self.chat_text.config(state='normal')
+            if response.cancelled:
+                self.chat_text.insert(tk.END, " [остановлено]", 'system')
+            elif not response.success:
+                self.chat_text.insert(tk.END, f"⚠ {response.error}", 'system')
+            self.chat_text.insert(tk.END, "\n", 'ai')
+            self.chat_text.config(state='disabled')
+            self.chat_text.see(tk.END)
+            self.chat_history.append({'role': 'ai', 'content': response.text})
+        
+        self.stop_btn.pack(side=tk.RIGHT, padx=(0, 4))
+        request = assistant.submit(
+            msg, 'general', on_done, on_token, priority=assistant.PRIORITY_HIGH
+        )
+        if stream_id == self._stream_id:
+            self._request = request
+
+    def _stop_generation(self):
+        """Остановить генерацию ответа"""
+        if self._request:
+            self._request.cancel()
+            self._request = None
+
     def _add_message(self, role, text):
         """Добавить сообщение в чат"""
         self.chat_text.config(state='normal')
@@ -264,6 +345,9 @@ class TabAI(TabBase):
 
     def _clear_chat(self):
         """Очистить чат"""
+        self._stop_generation()
+        self._stream_id += 1
+        self.stop_btn.pack_forget()
         self.chat_text.config(state='normal')
         self.chat_text.delete('1.0', tk.END)
         self.chat_text.config(state='disabled')
@@ -292,9 +376,54 @@ class TabAI(TabBase):
         gen_type = self.gen_type.get()
         self._add_message('user', f"Сгенерируй {gen_type}: {desc}")
         
-        response = f"Генерация {gen_type} по описанию '{desc}' (в разработке)"
-        self._add_message('ai', response)
+        if gen_type not in ('element', 'layout') or not self._uses_local_model():
+            response = f"Генерация {gen_type} по описанию '{desc}' (в разработке)"
+            self._add_message('ai', response)
+            return
+        
+        assistant = self.ai_assistant
+        if not assistant.is_loaded:
+            self._add_message('system', 'Загрузка модели...')
+            
+            def on_loaded(ok):
+                if ok:
+                    self._generate()
+                else:
+                    self._add_message('system', 'Модель не загружена')
+            assistant.load_model(on_loaded)
+            return
+        
+        def on_result(result):
+            self._generated = self._generated_specs(result)
+            if self._generated:
+                self._add_message('ai', f"Готово элементов: {len(self._generated)}. Нажмите «Применить»")
+            else:
+                self._add_message('system', 'Не удалось разобрать ответ модели')
+        
+        self._generated = []
+        if gen_type == 'layout':
+            size = (int(self.main_canvas.width), int(self.main_canvas.height)) if self.main_canvas else (800, 600)
+            assistant.generate_layout(desc, size, on_result)
+        else:
+            assistant.generate_element(desc, on_result)
+
+    @staticmethod
+    def _generated_specs(result):
+        """Описания элементов из JSON ответа (макет или один элемент)"""
+        if not isinstance(result, dict):
+            return []
+        items = result.get('elements', [result])
+        return [item for item in items if isinstance(item, dict) and item.get('type')]
 
     def _apply_generated(self):
         """Применить сгенерированное"""
-        self._add_message('system', 'Применение результата генерации...')
+        if not self._generated or not self.element_manager:
+            self._add_message('system', 'Нет результата генерации')
+            return
+        
+        # Весь результат - одна пачка: проверка размеров, одна перерисовка
+        created = self.element_manager.create_elements_bulk(self._generated)
+        self._add_message('system', f"Добавлено элементов: {len(created)}")
+        if len(created) < len(self._generated):
+            self._add_message('system', f"Пропущено некорректных: {len(self._generated) - len(created)}")
+        self._generated = []
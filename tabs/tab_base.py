@@ -4,6 +4,23 @@
 """
 import tkinter as tk
 from tkinter import ttk
+from functools import wraps
+
+from ..utils.debounce import FrameThrottler
+
+
+def when_built(method):
+    """
+    Декоратор для колбэков вкладки: пока виджеты не построены
+    (вкладка ещё не показывалась), вызов пропускается -
+    актуальное состояние вкладка подтянет в on_activate.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self.built:
+            return None
+        return method(self, *args, **kwargs)
+    return wrapper
 
 
 class TabBase:
@@ -31,11 +48,14 @@ class TabBase:
         self.config = config
         self.frame = None
         self.content = None
+        # Виджеты строятся при первой активации (TabSystem)
+        self.built = False
 
     def build(self):
         """Создаёт фрейм вкладки"""
         self.frame = tk.Frame(self.parent, bg=self.COLOR_BG_SECONDARY)
         self._build_content()
+        self.built = True
 
     def _build_content(self):
         """Переопределяется в подклассах"""
@@ -66,9 +86,12 @@ class TabBase:
         canvas = tk.Canvas(parent, bg=self.COLOR_BG_SECONDARY, highlightthickness=0)
         content = tk.Frame(canvas, bg=self.COLOR_BG_SECONDARY)
         
-        def on_configure(e):
+        # При resize <Configure> приходит пачками - пересчёт раз в кадр
+        frame = FrameThrottler(canvas)
+        
+        def update_region():
             canvas.configure(scrollregion=canvas.bbox("all"))
-        content.bind("<Configure>", on_configure)
+        content.bind("<Configure>", lambda e: frame.call(update_region))
         
         canvas.create_window((0, 0), window=content, anchor="nw", tags="content")
         canvas.bind('<Configure>', lambda e: canvas.itemconfig("content", width=e.width))
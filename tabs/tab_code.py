@@ -6,9 +6,15 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import os
 import subprocess
-from .tab_base import TabBase
+import time
+from .tab_base import TabBase, when_built
+from ..code_emitter import iter_text_chunks
+from ..utils.syntax_highlight import TextHighlighter
 from ..live_project_manager import get_live_project_manager
 from ..utils.event_bus import event_bus, on as subscribe
+from ..utils.logger import get_logger
+
+log = get_logger('TabCode')
 
 
 class TabCode(TabBase):
@@ -17,6 +23,12 @@ class TabCode(TabBase):
     TAB_ID = "code"
     TAB_SYMBOL = "</>"
 
+    # Бюджет одного среза потоковой вставки кода (мс)
+    STREAM_SLICE_MS = 8
+
+    # Язык подсветки по типу кода
+    CODE_LANGUAGES = {'html': 'html', 'css': 'css', 'js': 'javascript', 'react': 'javascript'}
+
     def __init__(self, parent, config):
         super().__init__(parent, config)
         self.element_manager = None
@@ -25,6 +37,10 @@ class TabCode(TabBase):
         self.live_project_manager = get_live_project_manager(config)
         self.auto_update_enabled = True
         
+        # Потоковый вывод кода: номер текущего потока и показанный кеш
+        self._stream_token = 0
+        self._displayed_code = None
+        
         # Подписка на события обновления кода
         subscribe('project.code_updated', self._on_code_updated)
 
@@ -87,6 +103,12 @@ class TabCode(TabBase):
         self.code_text.tag_configure('attr', foreground='#79c0ff')
         self.code_text.tag_configure('value', foreground='#a5d6ff')
         self.code_text.tag_configure('comment', foreground='#8b949e')
+        self.code_text.tag_configure('keyword', foreground='#ff7b72')
+        self.code_text.tag_configure('string', foreground='#a5d6ff')
+        self.code_text.tag_configure('number', foreground='#79c0ff')
+        
+        self._highlighter = TextHighlighter(self.code_text)
+        self.code_text.config(yscrollcommand=self._highlighter.view_changed)
         
         # === Опции ===
         sec = self._section(self.content, "Опции")
@@ -188,9 +210,7 @@ class TabCode(TabBase):
         code_type = self.code_type.get()
         code = self._generate_element_code(elem, code_type)
         
-        self.code_text.delete('1.0', tk.END)
-        self.code_text.insert('1.0', code)
-        self._highlight_syntax()
+        self._stream_code((code,))
 
     def _generate_all(self):
         """Генерировать код для всего интерфейса"""
@@ -199,20 +219,54 @@ class TabCode(TabBase):
         
         code_type = self.code_type.get()
         
-        if code_type == 'html':
-            code = self._generate_html()
-        elif code_type == 'css':
-            code = self._generate_css()
-        elif code_type == 'js':
-            code = self._generate_js()
+        if code_type in ('html', 'css', 'js') and self.live_project_manager:
+            # Тот же генератор, что пишет файлы проекта (элементы - текущие)
+            generator = self.live_project_manager.code_generator
+            generator.set_elements(self.element_manager.get_all_elements(), self.main_canvas)
+            chunks = generator.iter_chunks(code_type)
         elif code_type == 'react':
-            code = self._generate_react()
+            chunks = (self._generate_react(),)
         else:
-            code = "// Неизвестный тип"
+            chunks = ("// Неизвестный тип",)
         
+        self._stream_code(chunks)
+
+    def _stream_code(self, chunks, source=None):
+        """
+        Показывает код по кускам: вставка идёт срезами через after_idle,
+        чтобы панель не зависала на больших проектах.
+        
+        Args:
+            chunks: Итератор кусков кода
+            source: Полный текст, если он уже есть (для сравнения при автообновлении)
+        """
+        # Новый поток отменяет предыдущий
+        self._stream_token += 1
+        self._displayed_code = source
         self.code_text.delete('1.0', tk.END)
-        self.code_text.insert('1.0', code)
-        self._highlight_syntax()
+        self._stream_slice(iter(chunks), self._stream_token)
+
+    def _stream_slice(self, chunks, token):
+        """Вставляет куски, пока не исчерпан бюджет среза"""
+        if token != self._stream_token or not self.code_text.winfo_exists():
+            return
+        
+        deadline = time.perf_counter() + self.STREAM_SLICE_MS / 1000
+        parts = []
+        finished = True
+        for chunk in chunks:
+            parts.append(chunk)
+            if time.perf_counter() >= deadline:
+                finished = False
+                break
+        
+        if parts:
+            self.code_text.insert(tk.END, ''.join(parts))
+        
+        if finished:
+            self._highlight_syntax()
+        else:
+            self.frame.after_idle(self._stream_slice, chunks, token)
 
     def _generate_element_code(self, elem, code_type):
         """Генерирует код для элемента"""
@@ -252,41 +306,18 @@ class TabCode(TabBase):
         
         return f"// Код для {etype}"
 
-    def _generate_html(self):
-        """Генерирует HTML"""
-        elements = self.element_manager.get_all_elements()
-        canvas = self.main_canvas
-        
-        html = f'''<!DOCTYPE html>
-<html lang="ru">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Generated Interface</title>
-    <link rel="stylesheet" href="styles.css">
-</head>
-<body>
-    <div class="container" style="width: {int(canvas.width)}px; height: {int(canvas.height)}px;">
-'''
-        
-        for elem in elements:
-            etype = getattr(elem, 'ELEMENT_TYPE', 'div')
-            html += f'        <div class="{etype}" id="{elem.id[:8]}"></div>\n'
-        
-        html += '''    </div>
-    <script src="script.js"></script>
-</body>
-</html>'''
-        
-        return html
-    
     # === Новые методы для Live Project ===
     
+    @when_built
     def _on_code_updated(self, event_data=None):
         """Обработчик обновления кода"""
         if self.auto_update_enabled and self.code_type.get() in ['html', 'css', 'js']:
             self._update_code_display()
         self._update_stats()
+
+    def on_activate(self):
+        """Код мог обновиться, пока вкладка не была построена"""
+        self._on_code_updated()
     
     def _toggle_auto_update(self):
         """Переключает автообновление"""
@@ -320,15 +351,13 @@ class TabCode(TabBase):
             else:
                 return
             
-            # Обновляем только если изменился
-            current_code = self.code_text.get('1.0', 'end-1c')
-            if current_code != code:
-                self.code_text.delete('1.0', tk.END)
-                self.code_text.insert('1.0', code)
-                self._highlight_syntax()
+            # Обновляем только если изменился (сравниваем с показанным кешем,
+            # а не с содержимым виджета)
+            if self._displayed_code != code:
+                self._stream_code(iter_text_chunks(code), source=code)
                 
         except Exception as e:
-            print(f"[TabCode] Ошибка обновления кода: {e}")
+            log.error("Ошибка обновления кода: %s", e)
     
     def _update_stats(self):
         """Обновляет статистику проекта"""
@@ -343,7 +372,7 @@ class TabCode(TabBase):
             self.stats_lbl.config(text=f"Элементов: {elements}, Строк кода: {lines}")
             
         except Exception as e:
-            print(f"[TabCode] Ошибка обновления статистики: {e}")
+            log.error("Ошибка обновления статистики: %s", e)
     
     def _browse_project_folder(self):
         """Выбор папки проекта"""
@@ -481,7 +510,7 @@ class TabCode(TabBase):
                 else:  # Linux
                     subprocess.run(['xdg-open', path])
         except Exception as e:
-            print(f"[TabCode] Не удалось открыть папку: {e}")
+            log.error("Не удалось открыть папку: %s", e)
     
     def set_managers_extended(self, element_manager, main_canvas):
         """Расширенная установка менеджеров"""
@@ -492,54 +521,6 @@ class TabCode(TabBase):
         if self.live_project_manager:
             self.live_project_manager.set_managers(element_manager, main_canvas)
 
-    def _generate_css(self):
-        """Генерирует CSS"""
-        elements = self.element_manager.get_all_elements()
-        canvas = self.main_canvas
-        
-        css = f'''/* Generated CSS */
-.container {{
-    position: relative;
-    width: {int(canvas.width)}px;
-    height: {int(canvas.height)}px;
-    background: {canvas.properties.get('fill_color', '#0d1117')};
-}}
-
-'''
-        
-        for elem in elements:
-            etype = getattr(elem, 'ELEMENT_TYPE', 'div')
-            props = getattr(elem, 'properties', {})
-            
-            css += f'''.{etype}#{elem.id[:8]} {{
-    position: absolute;
-    left: {int(elem.x)}px;
-    top: {int(elem.y)}px;
-    width: {int(elem.width)}px;
-    height: {int(elem.height)}px;
-    background: {props.get('fill_color', 'transparent')};
-    border: {props.get('stroke_width', 1)}px solid {props.get('stroke_color', '#30363d')};
-    border-radius: {props.get('corner_radius', 0)}px;
-}}
-
-'''
-        
-        return css
-
-    def _generate_js(self):
-        """Генерирует JavaScript"""
-        return '''// Generated JavaScript
-document.addEventListener('DOMContentLoaded', () => {
-    console.log('Interface loaded');
-    
-    // Add event listeners
-    document.querySelectorAll('.button').forEach(btn => {
-        btn.addEventListener('click', (e) => {
-            console.log('Button clicked:', e.target.id);
-        });
-    });
-});'''
-
     def _generate_react(self):
         """Генерирует React компонент"""
         return '''// Generated React Component
@@ -557,9 +538,9 @@ const Interface = () => {
 export default Interface;'''
 
     def _highlight_syntax(self):
-        """Подсветка синтаксиса"""
-        # Простая подсветка
-        pass
+        """Подсветка синтаксиса (видимые строки, догружается при прокрутке)"""
+        language = self.CODE_LANGUAGES.get(self.code_type.get(), 'text')
+        self._highlighter.set_language(language)
 
     def _copy_code(self):
         """Копировать код"""
@@ -587,21 +568,23 @@ export default Interface;'''
 
     def _clear_code(self):
         """Очистить код"""
+        self._stream_token += 1
+        self._displayed_code = None
         self.code_text.delete('1.0', tk.END)
 
     def _preview_browser(self):
-        """Открыть в браузере"""
-        import tempfile
+        """Открыть живое превью в браузере"""
         import webbrowser
         
-        html = self._generate_html()
-        css = self._generate_css()
-        
-        full_html = html.replace('<link rel="stylesheet" href="styles.css">', f'<style>\n{css}\n</style>')
+        if not self.live_project_manager:
+            return
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as f:
-            f.write(full_html)
-            webbrowser.open(f'file://{f.name}')
+        try:
+            self.live_project_manager.set_managers(self.element_manager, self.main_canvas)
+            url = self.live_project_manager.start_preview_server()
+            webbrowser.open(url)
+        except OSError as e:
+            messagebox.showerror("Ошибка", f"Не удалось запустить сервер превью:\n{e}", parent=self.frame)
 
     def _preview_inline(self):
         """Встроенное превью"""
@@ -4,7 +4,13 @@
 """
 import tkinter as tk
 from tkinter import ttk
-from .tab_base import TabBase
+from .tab_base import TabBase, when_built
+from .tree_sync import TreeSync
+from ..utils.debounce import FrameThrottler
+from ..utils.event_bus import on as subscribe
+from ..utils.logger import get_logger
+
+log = get_logger('TabElements')
 
 
 class TabElements(TabBase):
@@ -33,6 +39,11 @@ class TabElements(TabBase):
         self.selected_artifact = None
         self._updating = False  # Защита от рекурсии
         
+        # Список элементов (iid строки = id элемента)
+        self.tree = None
+        self._rows = None
+        self._sync_frame = None
+        
         # Ссылки на frames (инициализируются в _build_content)
         self.artifacts_frame = None
         self.artifact_elements_frame = None
@@ -47,6 +58,13 @@ class TabElements(TabBase):
         # Для артефактов
         self.artifact_manager_integrated = None
         self._pending_artifact_type = None
+        
+        # Состав и порядок строк меняются только по событиям элементов
+        for event in ('element.created', 'element.bulk_created', 'element.deleted',
+                      'element.reordered', 'element.cleared', 'element.loaded'):
+            subscribe(event, self._on_elements_changed)
+        for event in ('element.resized', 'element.updated'):
+            subscribe(event, self._on_element_changed)
 
     def set_element_manager(self, manager):
         self.element_manager = manager
@@ -120,6 +138,8 @@ class TabElements(TabBase):
         self.tree.pack(fill=tk.BOTH, expand=True)
         # НЕ привязываем <<TreeviewSelect>> - вызывает бесконечный цикл
         self.tree.bind('<ButtonRelease-1>', self._on_tree_click)
+        self._rows = TreeSync(self.tree)
+        self._sync_frame = FrameThrottler(self.tree)
         
         # === Свойства ===
         sec = self._section(self.content, "Свойства")
@@ -473,15 +493,13 @@ class TabElements(TabBase):
             return
         self._updating = True
         try:
-            sel = self.tree.selection()
-            if sel:
-                for elem in self.element_manager.get_all_elements():
-                    if elem.id == sel[0]:
-                        self.element_manager.select_element(elem)
-                        break
+            elem = self._rows.selected()
+            if elem:
+                self.element_manager.select_element(elem)
         finally:
             self._updating = False
 
+    @when_built
     def _on_selection(self, elem):
         """Callback выбора элемента"""
         if self._updating:
@@ -489,7 +507,10 @@ class TabElements(TabBase):
         self._updating = True
         
         try:
-            self._refresh()
+            # Выбор не меняет строк - только выделение
+            if elem and elem.id not in self._rows:
+                self._refresh()
+            self._select_row(elem)
             self.status_lbl.config(text="")
             
             for btn in self.btns.values():
@@ -648,7 +669,7 @@ class TabElements(TabBase):
                 self._app.selection_tool.update()
                 
         except ValueError as e:
-            print(f"[TabElements] Ошибка применения свойств: {e}")
+            log.warning("Ошибка применения свойств: %s", e)
     
     def _show_extended(self):
         """Показать расширенные настройки элемента"""
@@ -675,28 +696,44 @@ class TabElements(TabBase):
             if result:
                 self._refresh()
         except ImportError as e:
-            print(f"[TabElements] Ошибка импорта диалога: {e}")
+            log.error("Ошибка импорта диалога: %s", e)
+
+    def _row_values(self, elem):
+        sym = getattr(elem, 'ELEMENT_SYMBOL', '?')
+        return (sym, elem.id[:12], f"{int(elem.width)}×{int(elem.height)}")
 
     def _refresh(self):
-        """Обновить список"""
+        """Синхронизирует список с менеджером (применяется только разница)"""
         if not self.tree or not self.element_manager:
             return
-        
-        sel = self.tree.selection()
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        for elem in self.element_manager.get_all_elements():
-            sym = getattr(elem, 'ELEMENT_SYMBOL', '?')
-            name = elem.id[:12]
-            size = f"{int(elem.width)}×{int(elem.height)}"
-            self.tree.insert('', 'end', iid=elem.id, values=(sym, name, size))
-        
-        if sel:
-            try:
-                self.tree.selection_set(sel)
-            except tk.TclError:
-                pass  # Item not found
+        self._rows.sync(
+            (elem.id, self._row_values(elem), elem)
+            for elem in self.element_manager.elements
+        )
+
+    def _select_row(self, elem):
+        """Выделяет строку элемента и прокручивает к ней"""
+        try:
+            if elem and elem.id in self._rows:
+                if tuple(self.tree.selection()) != (elem.id,):
+                    self.tree.selection_set(elem.id)
+                self.tree.see(elem.id)
+            elif self.tree.selection():
+                self.tree.selection_set(())
+        except tk.TclError:
+            pass  # Item not found
+
+    @when_built
+    def _on_elements_changed(self, data=None):
+        """Элемент создан/удалён/перемещён по слоям - синхронизация списка"""
+        self._sync_frame.call(self._refresh)
+
+    @when_built
+    def _on_element_changed(self, data=None):
+        """Изменён один элемент - обновляется только его строка"""
+        elem = (data or {}).get('element')
+        if elem is None or not self._rows.update_row(elem.id, self._row_values(elem)):
+            self._sync_frame.call(self._refresh)
 
     def _up(self):
         if self.element_manager and self.element_manager.selected_element:
@@ -721,6 +758,8 @@ class TabElements(TabBase):
 
     def on_activate(self):
         self._refresh()
+        if self.element_manager:
+            self._select_row(self.element_manager.selected_element)
         self._refresh_artifacts()
     
     # === Методы артефактов ===
@@ -897,6 +936,7 @@ class TabElements(TabBase):
         if self.artifact_manager:
             self.artifact_manager.select_artifact(artifact)
     
+    @when_built
     def _on_artifact_selected(self, artifact):
         """Колбэк выбора артефакта"""
         self.selected_artifact = artifact
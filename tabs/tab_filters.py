@@ -5,6 +5,9 @@
 import tkinter as tk
 from tkinter import ttk, colorchooser
 from .tab_base import TabBase
+from ..utils.logger import get_logger
+
+log = get_logger('TabFilters')
 
 
 class TabFilters(TabBase):
@@ -232,7 +235,7 @@ class TabFilters(TabBase):
             # Загружаем цвета
             self.vars['bg_color'].set(props.get('filter_bg_color', '#000000'))
             
-            print(f"[TabFilters] Загружены настройки для {element.ELEMENT_TYPE}")
+            log.debug("Загружены настройки для %s", element.ELEMENT_TYPE)
             
         finally:
             self._updating = False
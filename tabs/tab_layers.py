@@ -4,7 +4,10 @@
 """
 import tkinter as tk
 from tkinter import ttk
-from .tab_base import TabBase
+from .tab_base import TabBase, when_built
+from .tree_sync import TreeSync
+from ..utils.debounce import FrameThrottler
+from ..utils.event_bus import on as subscribe
 
 
 class TabLayers(TabBase):
@@ -25,6 +28,19 @@ class TabLayers(TabBase):
         self.element_manager = None
         self.mechanism_manager = None
         self._updating = False
+        self.elem_tree = None
+        self.mech_tree = None
+        # Модели строк (iid = id элемента/механизма)
+        self._elem_rows = None
+        self._mech_rows = None
+        self._sync_frame = None
+
+        # Состав и порядок строк меняются только по событиям элементов
+        for event in ('element.created', 'element.bulk_created', 'element.deleted',
+                      'element.reordered', 'element.cleared', 'element.loaded'):
+            subscribe(event, self._on_elements_changed)
+        for event in ('element.moved', 'element.resized', 'element.updated'):
+            subscribe(event, self._on_element_changed)
 
     def set_element_manager(self, manager):
         self.element_manager = manager
@@ -75,6 +91,9 @@ class TabLayers(TabBase):
         # НЕ используем <<TreeviewSelect>> - вызывает бесконечный цикл
         self.elem_tree.bind('<ButtonRelease-1>', self._on_elem_click)
         self.elem_tree.bind('<Double-Button-1>', self._on_elem_double_click)
+        self._elem_rows = TreeSync(self.elem_tree)
+        # Пачка событий (вставка заготовки, загрузка) - одна синхронизация за кадр
+        self._sync_frame = FrameThrottler(self.elem_tree)
         
         # === Механизмы ===
         sec = self._section(self.content, "Механизмы")
@@ -102,6 +121,7 @@ class TabLayers(TabBase):
         self.mech_tree.column('status', width=30)
         self.mech_tree.pack(fill=tk.BOTH, expand=True)
         self.mech_tree.bind('<<TreeviewSelect>>', self._on_mech_select)
+        self._mech_rows = TreeSync(self.mech_tree)
         
         # === Информация ===
         sec = self._section(self.content, "Выбранный слой")
@@ -122,30 +142,55 @@ class TabLayers(TabBase):
                                 bg=self.COLOR_BG_OVERLAY, fg=self.COLOR_TEXT)
         self.size_lbl.pack(side=tk.LEFT)
 
+    @when_built
     def _on_selection(self, elem):
         if self._updating:
             return
         self._updating = True
         try:
-            self._refresh()
+            # Выбор не меняет строк - только выделение
+            if elem and elem.id not in self._elem_rows:
+                self._refresh()
+            self._select_row(elem)
             if elem:
                 self._update_info(elem)
         finally:
             self._updating = False
 
+    def _select_row(self, elem):
+        """Выделяет строку элемента и прокручивает к ней"""
+        try:
+            if elem and elem.id in self._elem_rows:
+                if tuple(self.elem_tree.selection()) != (elem.id,):
+                    self.elem_tree.selection_set(elem.id)
+                self.elem_tree.see(elem.id)
+            elif self.elem_tree.selection():
+                self.elem_tree.selection_set(())
+        except tk.TclError:
+            pass  # Item not found
+
+    @when_built
+    def _on_elements_changed(self, data=None):
+        """Элемент создан/удалён/перемещён по слоям - синхронизация списка"""
+        self._sync_frame.call(self._refresh)
+
+    @when_built
+    def _on_element_changed(self, data=None):
+        """Изменён один элемент - обновляется только его строка"""
+        elem = (data or {}).get('element')
+        if elem is None or not self._elem_rows.update_row(elem.id, self._elem_values(elem)):
+            self._sync_frame.call(self._refresh)
+
     def _on_elem_click(self, e=None):
         """Клик по списку элементов"""
         if self._updating or not self.element_manager:
             return
         self._updating = True
         try:
-            sel = self.elem_tree.selection()
-            if sel:
-                for elem in self.element_manager.get_all_elements():
-                    if elem.id == sel[0]:
-                        self.element_manager.select_element(elem)
-                        self._update_info(elem)
-                        break
+            elem = self._elem_rows.selected()
+            if elem:
+                self.element_manager.select_element(elem)
+                self._update_info(elem)
         finally:
             self._updating = False
 
@@ -156,12 +201,9 @@ class TabLayers(TabBase):
     def _on_mech_select(self, e=None):
         if not self.mechanism_manager:
             return
-        sel = self.mech_tree.selection()
-        if sel:
-            for mech in self.mechanism_manager.get_all_mechanisms():
-                if mech.id == sel[0]:
-                    self.mechanism_manager.select_mechanism(mech)
-                    break
+        mech = self._mech_rows.selected()
+        if mech:
+            self.mechanism_manager.select_mechanism(mech)
 
     def _update_info(self, elem):
         sym = self.ICONS.get(getattr(elem, 'ELEMENT_TYPE', ''), '?')
@@ -169,57 +211,43 @@ class TabLayers(TabBase):
         self.pos_lbl.config(text=f"{int(elem.x)}, {int(elem.y)}")
         self.size_lbl.config(text=f"{int(elem.width)} × {int(elem.height)}")
 
+    def _elem_values(self, elem):
+        icon = self.ICONS.get(getattr(elem, 'ELEMENT_TYPE', ''), '?')
+        vis = '◉' if getattr(elem, 'visible', True) else '○'
+        lock = '🔒' if getattr(elem, 'size_locked', False) else '🔓'
+        return (icon, elem.id[:10], vis, lock)
+
+    def _mech_values(self, mech):
+        icon = self.ICONS.get(mech.MECHANISM_TYPE, '⚙')
+        status = '▶' if mech.is_active else '○'
+        return (icon, mech.id[:10], status)
+
     def _refresh(self):
-        # Элементы
+        """Синхронизирует списки с менеджерами (применяется только разница)"""
+        # Элементы - сверху передний план
         if self.elem_tree and self.element_manager:
-            sel = self.elem_tree.selection()
-            for item in self.elem_tree.get_children():
-                self.elem_tree.delete(item)
-            
-            for elem in reversed(self.element_manager.get_all_elements()):
-                icon = self.ICONS.get(getattr(elem, 'ELEMENT_TYPE', ''), '?')
-                name = elem.id[:10]
-                vis = '◉' if getattr(elem, 'visible', True) else '○'
-                lock = '🔒' if getattr(elem, 'size_locked', False) else '🔓'
-                self.elem_tree.insert('', 'end', iid=elem.id, values=(icon, name, vis, lock))
-            
-            if sel:
-                try:
-                    self.elem_tree.selection_set(sel)
-                except tk.TclError:
-                    pass  # Item not found
+            self._elem_rows.sync(
+                (elem.id, self._elem_values(elem), elem)
+                for elem in reversed(self.element_manager.elements)
+            )
         
         # Механизмы
         if self.mech_tree and self.mechanism_manager:
-            for item in self.mech_tree.get_children():
-                self.mech_tree.delete(item)
-            
-            for mech in self.mechanism_manager.get_all_mechanisms():
-                icon = self.ICONS.get(mech.MECHANISM_TYPE, '⚙')
-                name = mech.id[:10]
-                status = '▶' if mech.is_active else '○'
-                self.mech_tree.insert('', 'end', iid=mech.id, values=(icon, name, status))
+            self._mech_rows.sync(
+                (mech.id, self._mech_values(mech), mech)
+                for mech in self.mechanism_manager.mechanisms
+            )
 
     def _elem_up(self):
         if self.element_manager and self.element_manager.selected_element:
             # Переместить вверх в списке (ближе к наблюдателю)
-            elems = self.element_manager.get_all_elements()
-            elem = self.element_manager.selected_element
-            idx = elems.index(elem) if elem in elems else -1
-            if idx < len(elems) - 1:
-                elems[idx], elems[idx + 1] = elems[idx + 1], elems[idx]
-                self.element_manager.redraw_all()
-                self._refresh()
+            self.element_manager.move_up(self.element_manager.selected_element)
+            self._refresh()
 
     def _elem_down(self):
         if self.element_manager and self.element_manager.selected_element:
-            elems = self.element_manager.get_all_elements()
-            elem = self.element_manager.selected_element
-            idx = elems.index(elem) if elem in elems else -1
-            if idx > 0:
-                elems[idx], elems[idx - 1] = elems[idx - 1], elems[idx]
-                self.element_manager.redraw_all()
-                self._refresh()
+            self.element_manager.move_down(self.element_manager.selected_element)
+            self._refresh()
 
     def _elem_top(self):
         if self.element_manager and self.element_manager.selected_element:
@@ -256,6 +284,7 @@ class TabLayers(TabBase):
                 mech.stop()
             self._refresh()
 
+    @when_built
     def update(self):
         """Обновить список слоёв"""
         if not self._updating:
@@ -263,3 +292,5 @@ class TabLayers(TabBase):
 
     def on_activate(self):
         self._refresh()
+        if self.element_manager:
+            self._select_row(self.element_manager.selected_element)
@@ -4,7 +4,10 @@
 """
 import tkinter as tk
 from tkinter import ttk
-from .tab_base import TabBase
+from .tab_base import TabBase, when_built
+from ..utils.logger import get_logger
+
+log = get_logger('TabMechanisms')
 
 
 class TabMechanisms(TabBase):
@@ -199,6 +202,7 @@ class TabMechanisms(TabBase):
         finally:
             self._updating = False
 
+    @when_built
     def _on_selection(self, mech):
         """Колбэк выбора механизма"""
         if self._updating:
@@ -460,7 +464,7 @@ class TabMechanisms(TabBase):
             mech.update()
             
         except (ValueError, AttributeError) as e:
-            print(f"[TabMechanisms] Ошибка применения настроек: {e}")
+            log.warning("Ошибка применения настроек: %s", e)
     
     def _attach_to_selected(self):
         """Привязывает выбранный механизм к выбранному элементу"""
@@ -621,6 +625,7 @@ class TabMechanisms(TabBase):
             self.mechanism_manager.delete_selected()
             self._refresh()
 
+    @when_built
     def refresh(self):
         """Публичный метод обновления"""
         self._refresh()
@@ -241,7 +241,9 @@ class TabSettings(TabBase):
                 var.set('')
 
     def _clear_cache(self):
-        """Очистить кэш"""
+        """Очистить кэш (в т.ч. сохранённые ответы ИИ)"""
+        from modules.ai_assistant import get_ai_assistant
+        get_ai_assistant().clear_cache()
         messagebox.showinfo("Кэш", "Кэш очищен", parent=self.frame)
 
     def _export_settings(self):
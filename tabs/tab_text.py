@@ -5,6 +5,9 @@
 import tkinter as tk
 from tkinter import ttk, colorchooser, font as tkfont
 from .tab_base import TabBase
+from ..utils.logger import get_logger
+
+log = get_logger('TabText')
 
 
 class TabText(TabBase):
@@ -254,7 +257,7 @@ class TabText(TabBase):
                 # Обновляем кнопки цвета
                 self.text_color_btn.config(bg=self.vars['text_color'].get())
                 
-                print(f"[TabText] Загружены настройки текста")
+                log.debug("Загружены настройки текста")
                 
             finally:
                 self._updating = False
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Синхронизация плоского Treeview со списком объектов
+Вместо удаления и повторной вставки всех строк применяется только
+разница: вставки, удаления, перемещения и изменённые значения.
+Выделение и положение прокрутки сохраняются.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+def _stable_positions(positions: Sequence[int]) -> List[int]:
+    """
+    Индексы наибольшей возрастающей подпоследовательности positions:
+    строки, которые можно оставить на месте (остальные перемещаются).
+    """
+    tails: List[int] = []      # индекс в positions - хвост цепочки длины k+1
+    previous = [-1] * len(positions)
+    for index, value in enumerate(positions):
+        lo, hi = 0, len(tails)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if positions[tails[mid]] < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo:
+            previous[index] = tails[lo - 1]
+        if lo == len(tails):
+            tails.append(index)
+        else:
+            tails[lo] = index
+
+    result = []
+    index = tails[-1] if tails else -1
+    while index >= 0:
+        result.append(index)
+        index = previous[index]
+    result.reverse()
+    return result
+
+
+class TreeSync:
+    """
+    Модель строк плоского Treeview: iid строки -> объект.
+
+    Использование:
+        rows = TreeSync(tree)
+        rows.sync((elem.id, (sym, name), elem) for elem in elements)
+        rows.update_row(elem.id, (sym, new_name))   # одна строка
+        elem = rows.get(tree.selection()[0])        # без перебора списка
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self._order: List[str] = []
+        self._values: Dict[str, Tuple] = {}
+        self._objects: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, iid) -> bool:
+        return iid in self._values
+
+    def get(self, iid) -> Optional[Any]:
+        """Объект строки"""
+        return self._objects.get(iid)
+
+    def selected(self) -> Optional[Any]:
+        """Объект выделенной строки"""
+        selection = self.tree.selection()
+        return self._objects.get(selection[0]) if selection else None
+
+    def update_row(self, iid, values: Tuple) -> bool:
+        """
+        Обновляет значения одной строки (если изменились).
+
+        Returns:
+            False если строки нет - нужна полная синхронизация
+        """
+        if iid not in self._values:
+            return False
+        values = tuple(values)
+        if self._values[iid] != values:
+            self._values[iid] = values
+            self.tree.item(iid, values=values)
+        return True
+
+    def sync(self, rows: Iterable[Tuple[str, Tuple, Any]]) -> bool:
+        """
+        Приводит дерево к списку строк (iid, значения, объект).
+
+        Returns:
+            True если изменился состав или порядок строк
+        """
+        tree = self.tree
+        new_order: List[str] = []
+        new_values: Dict[str, Tuple] = {}
+        objects: Dict[str, Any] = {}
+        for iid, values, obj in rows:
+            new_order.append(iid)
+            new_values[iid] = tuple(values)
+            objects[iid] = obj
+        self._objects = objects
+
+        old_order = self._order
+        old_values = self._values
+
+        # Изменённые значения оставшихся строк
+        for iid, values in new_values.items():
+            if iid in old_values and old_values[iid] != values:
+                tree.item(iid, values=values)
+
+        if new_order == old_order:
+            self._values = new_values
+            return False
+
+        selection = tree.selection()
+        anchor = self._top_row()
+
+        removed = [iid for iid in old_order if iid not in new_values]
+        if removed:
+            tree.delete(*removed)
+
+        # Порядок оставшихся строк: что не входит в возрастающую
+        # цепочку, отцепляется и вставляется обратно на своё место
+        old_index = {iid: index for index, iid in enumerate(old_order)}
+        kept = [iid for iid in new_order if iid in old_index]
+        stable = {kept[index] for index in _stable_positions([old_index[iid] for iid in kept])}
+        moved = [iid for iid in kept if iid not in stable]
+        if moved:
+            tree.detach(*moved)
+
+        # Отцеплённые строки не занимают позиций - индекс однозначен
+        for index, iid in enumerate(new_order):
+            if iid in stable:
+                continue
+            if iid in old_index:
+                tree.move(iid, '', index)
+            else:
+                tree.insert('', index, iid=iid, values=new_values[iid])
+
+        self._order = new_order
+        self._values = new_values
+
+        kept_selection = [iid for iid in selection if iid in new_values]
+        if kept_selection and tuple(tree.selection()) != tuple(kept_selection):
+            tree.selection_set(kept_selection)
+        self._restore_top_row(anchor)
+        return True
+
+    def clear(self):
+        """Удаляет все строки"""
+        if self._order:
+            self.tree.delete(*self._order)
+        self._order = []
+        self._values = {}
+        self._objects = {}
+
+    # === Прокрутка ===
+
+    def _top_row(self) -> Optional[Tuple[str, int]]:
+        """Первая видимая строка и её индекс (yview Treeview - в строках)"""
+        if not self._order:
+            return None
+        first = self.tree.yview()[0]
+        index = min(len(self._order) - 1, int(round(first * len(self._order))))
+        return self._order[index], index
+
+    def _restore_top_row(self, anchor: Optional[Tuple[str, int]]):
+        """Оставляет первую видимую строку на месте после вставок/удалений выше неё"""
+        if anchor is None or not self._order:
+            return
+        iid, old_index = anchor
+        if iid not in self._values:
+            return
+        index = self._order.index(iid)
+        if index != old_index:
+            self.tree.yview_moveto(index / len(self._order))
@@ -0,0 +1,6 @@
+"""
+Тесты (без Tk и без моделей)
+
+Запуск из каталога, содержащего пакет modules:
+    python -m unittest discover -s modules/tests -t .
+"""
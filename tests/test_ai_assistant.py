@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Тесты очереди генерации AIAssistant на локальной заглушке модели:
+приоритеты, отмена посреди потока, откат истории сессии, склейка токенов для on_token
+"""
+import contextlib
+import threading
+import unittest
+from unittest import mock
+
+from ..ai_assistant import AIAssistant, AIModelType
+from ..utils.event_bus import event_bus
+
+WAIT = 5
+
+
+class StubModel:
+    """
+    Заглушка с интерфейсом GPT4All: chat_session() и
+    generate(streaming=True, callback=...) -> итератор токенов.
+
+    Ответ на запрос - список токенов из replies (по умолчанию сам запрос).
+    Перед токеном с индексом pause_at генерация ждёт gate.
+    История сессии - current_chat_session, как у GPT4All.
+    """
+
+    def __init__(self, replies=None, pause_at=None):
+        self.replies = replies or {}
+        self.pause_at = pause_at
+        self.paused = threading.Event()
+        self.gate = threading.Event()
+        self.prompts = []
+        self.sessions = 0
+        self.current_chat_session = None
+        # История, которую видела модель при каждом запросе
+        self.seen_history = []
+
+    @contextlib.contextmanager
+    def chat_session(self, system_prompt=''):
+        self.sessions += 1
+        self.current_chat_session = [{'role': 'system', 'content': system_prompt}]
+        try:
+            yield
+        finally:
+            self.current_chat_session = None
+
+    def generate(self, prompt, streaming=False, callback=None, **kwargs):
+        self.prompts.append(prompt)
+        history = self.current_chat_session
+        self.seen_history.append([message['role'] for message in history])
+        history.append({'role': 'user', 'content': prompt})
+        tokens = self.replies.get(prompt, [prompt])
+        return self._stream(tokens, callback, history)
+
+    def _stream(self, tokens, callback, history):
+        reply = []
+        for index, token in enumerate(tokens):
+            if index == self.pause_at:
+                self.paused.set()
+                self.gate.wait(WAIT)
+            if callback is not None and not callback(index, token):
+                break
+            reply.append(token)
+            yield token
+        history.append({'role': 'assistant', 'content': ''.join(reply)})
+
+
+class FakeRoot:
+    """Корневое окно для насоса шины: такты не планируются, очередь разбирает тест"""
+
+    def after(self, delay, func, *args):
+        return 'after#1'
+
+    def after_cancel(self, after_id):
+        pass
+
+
+class AIAssistantQueueTest(unittest.TestCase):
+
+    def setUp(self):
+        # Кэш только в памяти: тесты не трогают ~/.panel_editor_ai_cache.db
+        patcher = mock.patch.object(AIAssistant, 'CACHE_FILE', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_assistant(self, model):
+        assistant = AIAssistant(AIModelType.TINY, model=model)
+        assistant.idle_unload_seconds = 0
+        self.addCleanup(assistant.cancel_all)
+        return assistant
+
+    def test_higher_priority_runs_first(self):
+        model = StubModel(replies={'busy': ['a', 'b']}, pause_at=1)
+        assistant = self.make_assistant(model)
+
+        busy = assistant.submit('busy')
+        self.assertTrue(model.paused.wait(WAIT))
+        # Поток генерации занят - остальные запросы ждут в очереди
+        low = assistant.submit('low', priority=AIAssistant.PRIORITY_LOW)
+        normal = assistant.submit('normal')
+        high = assistant.submit('high', priority=AIAssistant.PRIORITY_HIGH)
+        normal_2 = assistant.submit('normal 2')
+        model.gate.set()
+
+        for request in (busy, low, normal, high, normal_2):
+            self.assertIsNotNone(request.wait(WAIT))
+        # Больший приоритет - раньше, при равном - в порядке постановки
+        self.assertEqual(model.prompts, ['busy', 'high', 'normal', 'normal 2', 'low'])
+
+    def test_cancel_mid_stream_keeps_partial_text(self):
+        model = StubModel(replies={'long': ['one ', 'two ', 'three ', 'four']}, pause_at=2)
+        assistant = self.make_assistant(model)
+
+        request = assistant.submit('long')
+        self.assertTrue(model.paused.wait(WAIT))
+        request.cancel()
+        model.gate.set()
+        response = request.wait(WAIT)
+
+        self.assertIsNotNone(response)
+        self.assertTrue(response.cancelled)
+        self.assertFalse(response.success)
+        self.assertEqual(response.text, 'one two ')
+        # Оборванный ответ не кэшируется
+        self.assertIsNone(assistant.response_cache.get(request.cache_key))
+
+        # Повторный запрос генерируется заново, а не берётся из кэша
+        model.pause_at = None
+        again = assistant.submit('long').wait(WAIT)
+        self.assertFalse(again.cancelled)
+        self.assertEqual(again.text, 'one two three four')
+        self.assertEqual(model.prompts, ['long', 'long'])
+
+    def test_session_history_rewound_after_each_request(self):
+        model = StubModel()
+        assistant = self.make_assistant(model)
+
+        for prompt in ('first', 'second', 'third'):
+            self.assertTrue(assistant.submit(prompt, 'code_generator').wait(WAIT).success)
+
+        # Системный промпт обработан один раз, прошлые запросы модель не видит
+        self.assertEqual(model.sessions, 1)
+        self.assertEqual(model.seen_history, [['system']] * 3)
+        self.assertEqual(assistant.session_stats['reused'], 2)
+
+    def test_tokens_coalesced_into_one_ui_call(self):
+        tokens = ['<div', ' class', '="panel"', '>', '</div>']
+        model = StubModel(replies={'html': tokens})
+        assistant = self.make_assistant(model)
+
+        # Насос шины подключён к потоку теста: call_on_ui из потока генерации
+        # только ставит вызовы в очередь
+        event_bus.attach_ui(FakeRoot())
+        self.addCleanup(event_bus.detach_ui)
+        received = []
+        responses = []
+
+        request = assistant.submit('html', callback=responses.append, on_token=received.append)
+        self.assertIsNotNone(request.wait(WAIT))
+        self.assertEqual(received, [])
+
+        event_bus.drain_ui()
+        self.assertEqual(received, [''.join(tokens)])
+        self.assertEqual(len(responses), 1)
+        self.assertEqual(responses[0].text, ''.join(tokens))
+        self.assertEqual(responses[0].tokens_used, len(tokens))
+
+
+if __name__ == '__main__':
+    unittest.main()
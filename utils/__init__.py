@@ -2,21 +2,37 @@
 Утилиты проекта
 """
 
+# Логгер, шина событий и дебаунс нужны почти всем модулям - импортируются сразу
+# (имена safe_exec, event_bus и debounce совпадают с подмодулями, лениво их не загрузить)
 from .safe_exec import SafeExecutor, safe_exec
 from .logger import Logger, get_logger
-from .event_bus import EventBus, event_bus, on, off, emit, once
+from .event_bus import EventBus, event_bus, on, off, emit, once, emit_async, call_on_ui
 from .debounce import (
-    Debouncer, Throttler, TkDebouncer, TkThrottler,
-    debounce, throttle,
+    Debouncer, Throttler, FrameThrottler, FrameClock, TkDebouncer, TkThrottler,
+    debounce, throttle, frame_throttle,
     DEBOUNCE_UI, DEBOUNCE_SEARCH, DEBOUNCE_SAVE, DEBOUNCE_RESIZE,
+    DEBOUNCE_CODEGEN, DEBOUNCE_CODEGEN_MAX_WAIT,
     THROTTLE_SCROLL, THROTTLE_DRAG, THROTTLE_MOUSE
 )
-from .hotkeys import HotkeyManager, init_hotkeys, get_hotkey_manager
+from .lazy_import import lazy_exports
+
+# Остальное - при первом обращении (sandbox тянет multiprocessing)
+__getattr__, __dir__, _ = lazy_exports(__name__, {
+    '.sandbox_pool': ('SandboxPool', 'get_sandbox_pool'),
+    '.hotkeys': ('HotkeyManager', 'init_hotkeys', 'get_hotkey_manager'),
+    '.syntax_highlight': ('SyntaxLexer', 'TextHighlighter', 'get_lexer'),
+    '.profiler': ('Profiler', 'ProfilerHUD', 'get_profiler', 'profiled'),
+    '.canvas_audit': ('CanvasAudit', 'CanvasAuditReport'),
+    '.startup': ('StartupGraph', 'StartupStage'),
+    '.response_cache': ('ResponseCache', 'normalize_prompt'),
+})
 
 __all__ = [
     # Safe exec
     'SafeExecutor',
     'safe_exec',
+    'SandboxPool',
+    'get_sandbox_pool',
     # Logger
     'Logger',
     'get_logger',
@@ -27,17 +43,24 @@ __all__ = [
     'off', 
     'emit',
     'once',
+    'emit_async',
+    'call_on_ui',
     # Debounce/Throttle
     'Debouncer',
     'Throttler',
+    'FrameThrottler',
+    'FrameClock',
     'TkDebouncer',
     'TkThrottler',
     'debounce',
     'throttle',
+    'frame_throttle',
     'DEBOUNCE_UI',
     'DEBOUNCE_SEARCH',
     'DEBOUNCE_SAVE',
     'DEBOUNCE_RESIZE',
+    'DEBOUNCE_CODEGEN',
+    'DEBOUNCE_CODEGEN_MAX_WAIT',
     'THROTTLE_SCROLL',
     'THROTTLE_DRAG',
     'THROTTLE_MOUSE',
@@ -45,5 +68,25 @@ __all__ = [
     'HotkeyManager',
     'init_hotkeys',
     'get_hotkey_manager',
+    # Syntax highlight
+    'SyntaxLexer',
+    'TextHighlighter',
+    'get_lexer',
+    # Profiler
+    'Profiler',
+    'ProfilerHUD',
+    'get_profiler',
+    'profiled',
+    # Canvas audit
+    'CanvasAudit',
+    'CanvasAuditReport',
+    # Startup
+    'StartupGraph',
+    'StartupStage',
+    # Response cache
+    'ResponseCache',
+    'normalize_prompt',
+    # Lazy import
+    'lazy_exports',
 ]
 
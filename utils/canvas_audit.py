@@ -0,0 +1,197 @@
+"""
+Контроль объектов холста (отладка)
+Периодически сверяет canvas.find_all() с объектами, которыми владеют
+элементы, механизмы, сетка и выделение: объекты без владельца - утечки,
+которые замедляют каждую операцию Tk canvas. Предупреждает о превышении
+бюджета объектов на сцену.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .logger import get_logger
+
+log = get_logger('CanvasAudit')
+
+
+class CanvasAuditReport:
+    """Результат одной проверки холста"""
+
+    def __init__(self, total: int, budget: Optional[int],
+                 owned: Dict[str, int], stale: Dict[str, int],
+                 orphans: List[Tuple[int, str, Tuple[str, ...]]]):
+        self.total = total
+        self.budget = budget
+        # Владелец -> количество живых объектов
+        self.owned = owned
+        # Владелец -> id в списках владельца, которых уже нет на холсте
+        self.stale = stale
+        # (id, тип, теги) объектов без владельца
+        self.orphans = orphans
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.total > self.budget
+
+    def orphan_groups(self) -> List[Tuple[str, Tuple[str, ...], int, List[int]]]:
+        """Потерянные объекты, сгруппированные по (тип, теги): [(тип, теги, кол-во, примеры id)]"""
+        groups: Dict[Tuple[str, Tuple[str, ...]], List[int]] = {}
+        for item, item_type, tags in self.orphans:
+            groups.setdefault((item_type, tags), []).append(item)
+        ranked = sorted(groups.items(), key=lambda entry: len(entry[1]), reverse=True)
+        return [(item_type, tags, len(items), items[:5]) for (item_type, tags), items in ranked]
+
+    def to_dict(self) -> dict:
+        return {
+            'total': self.total,
+            'budget': self.budget,
+            'owned': dict(self.owned),
+            'stale': dict(self.stale),
+            'orphans': len(self.orphans),
+            'orphan_groups': [
+                {'type': item_type, 'tags': list(tags), 'count': count, 'sample': sample}
+                for item_type, tags, count, sample in self.orphan_groups()
+            ],
+        }
+
+
+class CanvasAudit:
+    """
+    Детектор утечек объектов холста.
+
+    Использование:
+        audit = CanvasAudit(canvas, budget=lambda: 5000 + 40 * len(manager.elements))
+        audit.register_owner('elements', element_manager.get_canvas_items)
+        audit.register_tag('grid', 'grid')
+        audit.start()            # проверка каждые interval_ms
+
+        report = audit.scan()    # разовая проверка
+    """
+
+    INTERVAL_MS = 5000
+    # Сколько групп потерянных объектов выводить в лог
+    REPORT_GROUPS = 10
+
+    def __init__(self, canvas, budget: Union[int, Callable[[], int], None] = None,
+                 interval_ms: Optional[int] = None):
+        """
+        Args:
+            canvas: Tkinter Canvas
+            budget: Бюджет объектов на сцену (число или функция от текущей сцены)
+            interval_ms: Период проверки
+        """
+        self.canvas = canvas
+        self.budget = budget
+        self.interval_ms = interval_ms or self.INTERVAL_MS
+        self._owners: Dict[str, Callable[[], Iterable[int]]] = {}
+        self._tags: Dict[str, str] = {}
+        self._after_id = None
+        self._reported_orphans = set()
+        self._over_budget = False
+        self.last_report: Optional[CanvasAuditReport] = None
+
+    # === Владельцы ===
+
+    def register_owner(self, name: str, provider: Callable[[], Iterable[int]]):
+        """Регистрирует владельца: функция возвращает id его объектов"""
+        self._owners[name] = provider
+
+    def register_tag(self, tag: str, owner: Optional[str] = None):
+        """Объекты с тегом считаются принадлежащими owner (по умолчанию - самому тегу)"""
+        self._tags[tag] = owner or tag
+
+    def unregister(self, name: str):
+        self._owners.pop(name, None)
+        for tag in [tag for tag, owner in self._tags.items() if owner == name]:
+            del self._tags[tag]
+
+    # === Проверка ===
+
+    def _current_budget(self) -> Optional[int]:
+        if callable(self.budget):
+            return self.budget()
+        return self.budget
+
+    def scan(self) -> CanvasAuditReport:
+        """Сверяет объекты холста с владельцами и пишет итог в лог"""
+        canvas = self.canvas
+        alive = set(canvas.find_all())
+
+        owned_ids = set()
+        owned: Dict[str, int] = {}
+        stale: Dict[str, int] = {}
+        for name, provider in self._owners.items():
+            try:
+                ids = set(provider())
+            except Exception as e:
+                log.warning("Владелец %s недоступен: %s", name, e)
+                continue
+            live = ids & alive
+            owned[name] = owned.get(name, 0) + len(live)
+            if len(live) != len(ids):
+                stale[name] = len(ids) - len(live)
+            owned_ids |= live
+        for tag, name in self._tags.items():
+            live = set(canvas.find_withtag(tag)) - owned_ids
+            owned[name] = owned.get(name, 0) + len(live)
+            owned_ids |= live
+
+        orphans = [(item, canvas.type(item), tuple(canvas.gettags(item)))
+                   for item in sorted(alive - owned_ids)]
+        report = CanvasAuditReport(len(alive), self._current_budget(), owned, stale, orphans)
+        self._log_report(report)
+        self.last_report = report
+        return report
+
+    def _log_report(self, report: CanvasAuditReport):
+        """Пишет в лог только новые потерянные объекты и смену состояния бюджета"""
+        orphan_ids = {item for item, _, _ in report.orphans}
+        new_orphans = orphan_ids - self._reported_orphans
+        # Удалённые объекты больше не отслеживаем (id в Tk не переиспользуются)
+        self._reported_orphans = orphan_ids
+
+        if new_orphans:
+            log.warning("Объекты холста без владельца: %d новых, всего %d из %d",
+                        len(new_orphans), len(orphan_ids), report.total)
+            for item_type, tags, count, sample in report.orphan_groups()[:self.REPORT_GROUPS]:
+                log.warning("  %5d × %-10s теги=%s пример id=%s",
+                            count, item_type, ','.join(tags) or '-', sample)
+        for name, count in report.stale.items():
+            log.debug("%s: %d id в списке уже удалены с холста", name, count)
+
+        if report.over_budget and not self._over_budget:
+            log.warning("Превышен бюджет объектов холста: %d > %d (%s)",
+                        report.total, report.budget,
+                        ', '.join(f"{name}={count}" for name, count in report.owned.items()))
+        elif self._over_budget and not report.over_budget:
+            log.info("Объектов холста снова в пределах бюджета: %d <= %d",
+                     report.total, report.budget)
+        self._over_budget = report.over_budget
+
+    # === Периодическая проверка ===
+
+    def start(self):
+        """Запускает периодическую проверку"""
+        if self._after_id is None:
+            self._after_id = self.canvas.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        if self._after_id is not None:
+            try:
+                self.canvas.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    @property
+    def running(self) -> bool:
+        return self._after_id is not None
+
+    def _tick(self):
+        self._after_id = None
+        try:
+            self.scan()
+        except Exception as e:
+            # Холст уничтожен
+            log.debug("Проверка холста остановлена: %s", e)
+            return
+        self._after_id = self.canvas.after(self.interval_ms, self._tick)
@@ -1,260 +1,456 @@
 """
 Утилиты для дебаунса и троттлинга функций
 Предотвращает избыточные вызовы при частых событиях
+
+Все таймеры работают на цикле событий Tk (after), без потоков:
+функции выполняются в потоке Tk. Виджет для after() можно не передавать -
+тогда используется окно, подключённое к шине событий (event_bus.attach_ui).
+Без цикла Tk (скрипты, экспорт из консоли) отложенные вызовы выполняются сразу.
 """
 
+import math
 import time
-import threading
-from typing import Callable, Any, Optional
+from typing import Callable, Any, Optional, Tuple
 from functools import wraps
 
+from .event_bus import event_bus, call_on_ui
+from .logger import get_logger
+
+log = get_logger('Debounce')
+
+
+def _now_ms() -> float:
+    return time.perf_counter() * 1000
+
+
+class _AfterScheduler:
+    """Общая часть: один таймер after() и отложенный вызов"""
+
+    def __init__(self, widget=None):
+        """
+        Args:
+            widget: Tkinter виджет для after() (None - окно шины событий)
+        """
+        self.widget = widget
+        self._host = None
+        self._after_id: Optional[str] = None
+        self._pending: Optional[Tuple[Callable, tuple, dict]] = None
+
+    @property
+    def pending(self) -> bool:
+        """Есть ли отложенный вызов"""
+        return self._pending is not None
+
+    def _schedule(self, delay_ms: float) -> bool:
+        """
+        Ставит таймер.
+
+        Returns:
+            False если цикла Tk нет (вызывающий выполняет вызов сразу)
+        """
+        host = self.widget if self.widget is not None else event_bus.get_ui_root()
+        if host is None:
+            return False
+        try:
+            self._after_id = host.after(max(1, int(math.ceil(delay_ms))), self._on_timer)
+            self._host = host
+        except Exception:
+            # Виджет уничтожен - отложенный вызов теряет смысл
+            self._after_id = None
+            self._pending = None
+        return True
 
-class Debouncer:
+    def _unschedule(self):
+        if self._after_id is not None:
+            try:
+                self._host.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _on_timer(self):
+        self._after_id = None
+        self.flush()
+
+    def flush(self):
+        """Немедленно выполняет отложенный вызов (если есть)"""
+        self._unschedule()
+        pending, self._pending = self._pending, None
+        if pending:
+            func, args, kwargs = pending
+            func(*args, **kwargs)
+
+    def cancel(self):
+        """Отменяет отложенный вызов"""
+        self._unschedule()
+        self._pending = None
+
+
+class Debouncer(_AfterScheduler):
     """
     Дебаунсер - откладывает выполнение до прекращения вызовов.
-    
+
     Использование:
         debouncer = Debouncer(500)  # 500ms
-        
+
         def update_ui():
             print("Updating...")
-        
+
         # Вызывается много раз, но выполнится только один раз
         # через 500ms после последнего вызова
         for i in range(100):
             debouncer.call(update_ui)
+
+        # Не реже раза в секунду, даже если вызовы не прекращаются
+        debouncer = Debouncer(150, max_wait_ms=1000)
+
+    Серия вызовов держит один таймер: новый вызов только запоминает
+    аргументы и время, таймер при срабатывании доводит ожидание.
     """
-    
-    def __init__(self, delay_ms: int = 50):
+
+    def __init__(self, delay_ms: int = 50, widget=None, leading: bool = False,
+                 trailing: bool = True, max_wait_ms: Optional[int] = None):
         """
         Args:
             delay_ms: Задержка в миллисекундах
+            widget: Tkinter виджет для after() (None - окно шины событий)
+            leading: Выполнять первый вызов серии сразу
+            trailing: Выполнять последний вызов серии после паузы
+            max_wait_ms: Максимальная задержка выполнения при непрерывных вызовах
         """
+        super().__init__(widget)
         self.delay_ms = delay_ms
-        self._timer: Optional[threading.Timer] = None
-        self._lock = threading.Lock()
-        
+        self.leading = leading
+        self.trailing = trailing
+        self.max_wait_ms = max_wait_ms
+        self._first_call = 0.0
+        self._last_call = 0.0
+
     def call(self, func: Callable, *args, **kwargs):
         """
         Отложенный вызов функции.
-        
+
         Args:
             func: Функция для вызова
             *args, **kwargs: Аргументы функции
         """
-        with self._lock:
-            # Отменяем предыдущий таймер
-            if self._timer:
-                self._timer.cancel()
-                
-            # Создаём новый таймер
-            self._timer = threading.Timer(
-                self.delay_ms / 1000.0,
-                func,
-                args=args,
-                kwargs=kwargs
-            )
-            self._timer.start()
-            
-    def cancel(self):
-        """Отменяет отложенный вызов"""
-        with self._lock:
-            if self._timer:
-                self._timer.cancel()
-                self._timer = None
-                
-    def flush(self):
-        """Немедленно выполняет отложенный вызов (если есть)"""
-        with self._lock:
-            if self._timer:
-                self._timer.cancel()
-                # Таймер хранит функцию и аргументы
-                # Но threading.Timer не предоставляет к ним доступ
-                # Поэтому flush работает только как cancel
-                self._timer = None
+        if not event_bus.is_ui_thread():
+            call_on_ui(self.call, func, *args, **kwargs)
+            return
+
+        now = _now_ms()
+        self._last_call = now
+        if self._after_id is not None:
+            # Серия продолжается - таймер уже стоит
+            self._pending = (func, args, kwargs)
+            return
+
+        self._first_call = now
+        if self.leading:
+            self._pending = None
+            self._schedule(self.delay_ms)
+            func(*args, **kwargs)
+            return
+
+        self._pending = (func, args, kwargs)
+        if not self._schedule(self.delay_ms):
+            self.flush()
+
+    def _on_timer(self):
+        self._after_id = None
+        now = _now_ms()
+        wait = self.delay_ms - (now - self._last_call)
+        if self.max_wait_ms is not None and self._pending:
+            wait = min(wait, self.max_wait_ms - (now - self._first_call))
+        if wait > 0:
+            self._schedule(wait)
+        elif self.trailing:
+            self.flush()
+        else:
+            self._pending = None
 
 
-class Throttler:
+class Throttler(_AfterScheduler):
     """
     Троттлер - ограничивает частоту вызовов.
-    
+
     Использование:
         throttler = Throttler(100)  # Максимум раз в 100ms
-        
+
         def on_scroll():
             print("Scrolling...")
-        
-        # Вызывается много раз, но выполнится максимум 10 раз в секунду
+
+        # Вызывается много раз, но выполнится максимум 10 раз в секунду;
+        # последний вызов не теряется (trailing)
         for i in range(100):
             throttler.call(on_scroll)
     """
-    
-    def __init__(self, interval_ms: int = 16):
+
+    def __init__(self, interval_ms: int = 16, widget=None,
+                 leading: bool = True, trailing: bool = True):
         """
         Args:
             interval_ms: Минимальный интервал между вызовами (мс)
+            widget: Tkinter виджет для after() (None - окно шины событий)
+            leading: Выполнять вызов сразу, если интервал уже прошёл
+            trailing: Выполнять пропущенный последний вызов в конце интервала
         """
+        super().__init__(widget)
         self.interval_ms = interval_ms
-        self._last_call = 0.0
-        self._lock = threading.Lock()
-        
+        self.leading = leading
+        self.trailing = trailing
+        self._last_run = -math.inf
+
     def call(self, func: Callable, *args, **kwargs) -> bool:
         """
-        Вызывает функцию если прошло достаточно времени.
-        
+        Вызывает функцию если прошло достаточно времени,
+        иначе (trailing) откладывает её до конца интервала.
+
         Args:
             func: Функция для вызова
             *args, **kwargs: Аргументы функции
-            
+
         Returns:
-            True если функция была вызвана
+            True если функция была вызвана сразу
         """
-        with self._lock:
-            now = time.time() * 1000  # В миллисекунды
-            
-            if now - self._last_call >= self.interval_ms:
-                self._last_call = now
-                func(*args, **kwargs)
-                return True
+        if not event_bus.is_ui_thread():
+            call_on_ui(self.call, func, *args, **kwargs)
             return False
-            
+
+        now = _now_ms()
+        remaining = self.interval_ms - (now - self._last_run)
+        if remaining <= 0 and self.leading and self._after_id is None:
+            self._pending = None
+            self._last_run = now
+            func(*args, **kwargs)
+            return True
+
+        if self.trailing:
+            self._pending = (func, args, kwargs)
+            if self._after_id is None:
+                if not self._schedule(remaining if remaining > 0 else self.interval_ms):
+                    # Нет цикла Tk - выполняем сразу
+                    self.flush()
+                    return True
+        return False
+
+    def flush(self):
+        """Немедленно выполняет отложенный вызов (если есть)"""
+        if self._pending:
+            self._last_run = _now_ms()
+        super().flush()
+
     def reset(self):
         """Сбрасывает таймер"""
-        with self._lock:
-            self._last_call = 0.0
+        self.cancel()
+        self._last_run = -math.inf
+
+
+class FrameThrottler(_AfterScheduler):
+    """
+    Троттлинг по кадрам (аналог requestAnimationFrame):
+    все вызовы за кадр схлопываются в один - с последними аргументами.
+
+    Использование:
+        frame = FrameThrottler(canvas)
+
+        def on_drag(event):
+            frame.call(apply_drag, event)
+
+        def on_release(event):
+            frame.flush()   # Применяем последнее положение сразу
+    """
+
+    def __init__(self, widget=None, fps: int = 60):
+        """
+        Args:
+            widget: Tkinter виджет для after() (None - окно шины событий)
+            fps: Частота кадров
+        """
+        super().__init__(widget)
+        self.frame_ms = 1000 / fps
+        self._last_frame = -math.inf
+
+    def call(self, func: Callable, *args, **kwargs):
+        """Ставит вызов на ближайший кадр (заменяя уже поставленный)"""
+        if not event_bus.is_ui_thread():
+            call_on_ui(self.call, func, *args, **kwargs)
+            return
+
+        self._pending = (func, args, kwargs)
+        if self._after_id is None:
+            delay = max(0.0, self.frame_ms - (_now_ms() - self._last_frame))
+            if not self._schedule(delay):
+                self.flush()
 
+    def _on_timer(self):
+        self._after_id = None
+        self._last_frame = _now_ms()
+        self.flush()
+
+
+class FrameClock:
+    """
+    Общий кадровый цикл: подписчики просят следующий кадр у часов,
+    а не ставят собственные after(). Цикл (один таймер) вызывает tick().
+
+    Использование:
+        clock = FrameClock()
+        mech.frame_clock = clock          # механизм: self._next_frame()
 
-def debounce(delay_ms: int = 50):
+        def loop():
+            clock.tick()                  # все кадры, запрошенные к этому моменту
+            widget.after(16, loop)
+    """
+
+    def __init__(self):
+        self._callbacks = {}
+        self._next_token = 0
+
+    def __len__(self) -> int:
+        return len(self._callbacks)
+
+    def request(self, callback: Callable[[], Any]) -> Tuple[str, int]:
+        """Ставит вызов на следующий кадр; возвращает токен для cancel()"""
+        self._next_token += 1
+        token = ('frame', self._next_token)
+        self._callbacks[token] = callback
+        return token
+
+    def cancel(self, token) -> bool:
+        """Отменяет запрошенный кадр; False если токен не от этих часов"""
+        return self._callbacks.pop(token, None) is not None
+
+    def tick(self) -> int:
+        """
+        Выполняет запрошенные кадры (запрошенные во время tick - в следующем).
+
+        Returns:
+            Количество выполненных вызовов
+        """
+        callbacks, self._callbacks = self._callbacks, {}
+        for callback in callbacks.values():
+            try:
+                callback()
+            except Exception as e:
+                # Ошибка одного подписчика не останавливает остальных
+                log.error("Ошибка в кадре %s: %s", callback, e)
+        return len(callbacks)
+
+
+def debounce(delay_ms: int = 50, leading: bool = False, max_wait_ms: Optional[int] = None):
     """
     Декоратор для дебаунса функции.
-    
+
     Использование:
         @debounce(300)
         def update_preview():
             ...
     """
     def decorator(func: Callable):
-        debouncer = Debouncer(delay_ms)
-        
+        debouncer = Debouncer(delay_ms, leading=leading, max_wait_ms=max_wait_ms)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             debouncer.call(func, *args, **kwargs)
-            
+
         wrapper.cancel = debouncer.cancel
         wrapper.flush = debouncer.flush
         return wrapper
-        
+
     return decorator
 
 
-def throttle(interval_ms: int = 16):
+def throttle(interval_ms: int = 16, trailing: bool = False):
     """
     Декоратор для троттлинга функции.
-    
+    Как и раньше, вызовы внутри интервала отбрасываются;
+    trailing=True - последний из них выполняется в конце интервала.
+
     Использование:
         @throttle(100)
         def on_mouse_move(x, y):
             ...
     """
     def decorator(func: Callable):
-        throttler = Throttler(interval_ms)
-        
+        throttler = Throttler(interval_ms, trailing=trailing)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             return throttler.call(func, *args, **kwargs)
-            
+
         wrapper.reset = throttler.reset
+        wrapper.flush = throttler.flush
         return wrapper
-        
+
     return decorator
 
 
-class TkDebouncer:
+def frame_throttle(fps: int = 60):
     """
-    Дебаунсер для Tkinter - использует after() вместо threading.
-    Безопаснее для UI операций.
-    
+    Декоратор: не больше одного вызова за кадр (с последними аргументами).
+
+    Использование:
+        @frame_throttle()
+        def redraw_selection(x, y):
+            ...
+    """
+    def decorator(func: Callable):
+        throttler = FrameThrottler(fps=fps)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            throttler.call(func, *args, **kwargs)
+
+        wrapper.cancel = throttler.cancel
+        wrapper.flush = throttler.flush
+        return wrapper
+
+    return decorator
+
+
+class TkDebouncer(Debouncer):
+    """
+    Дебаунсер с явным виджетом для after().
+
     Использование:
         debouncer = TkDebouncer(root, 300)
-        
+
         def highlight_syntax():
             ...
-        
+
         # В обработчике события
         debouncer.call(highlight_syntax)
     """
-    
-    def __init__(self, widget, delay_ms: int = 50):
+
+    def __init__(self, widget, delay_ms: int = 50, **kwargs):
         """
         Args:
             widget: Tkinter виджет (root или любой другой)
             delay_ms: Задержка в миллисекундах
         """
-        self.widget = widget
-        self.delay_ms = delay_ms
-        self._timer_id: Optional[str] = None
-        
-    def call(self, func: Callable, *args, **kwargs):
-        """
-        Отложенный вызов функции через Tkinter.
-        
-        Args:
-            func: Функция для вызова
-            *args, **kwargs: Аргументы функции
-        """
-        # Отменяем предыдущий таймер
-        self.cancel()
-        
-        # Создаём новый
-        def callback():
-            self._timer_id = None
-            func(*args, **kwargs)
-            
-        self._timer_id = self.widget.after(self.delay_ms, callback)
-        
-    def cancel(self):
-        """Отменяет отложенный вызов"""
-        if self._timer_id:
-            try:
-                self.widget.after_cancel(self._timer_id)
-            except Exception:
-                pass
-            self._timer_id = None
+        super().__init__(delay_ms, widget=widget, **kwargs)
 
 
-class TkThrottler:
+class TkThrottler(Throttler):
     """
-    Троттлер для Tkinter.
-    
+    Троттлер без отложенного последнего вызова (лишние вызовы отбрасываются).
+
     Использование:
         throttler = TkThrottler(100)  # Раз в 100ms
-        
+
         def update_info(x, y):
             info_label.config(text=f"{x}, {y}")
-        
+
         canvas.bind('<Motion>', lambda e: throttler.call(update_info, e.x, e.y))
     """
-    
-    def __init__(self, interval_ms: int = 16):
+
+    def __init__(self, interval_ms: int = 16, widget=None):
         """
         Args:
             interval_ms: Минимальный интервал между вызовами (мс)
         """
-        self.interval_ms = interval_ms
-        self._last_call = 0
-        
-    def call(self, func: Callable, *args, **kwargs) -> bool:
-        """
-        Вызывает функцию если прошло достаточно времени.
-        """
-        import time
-        now = int(time.time() * 1000)
-        
-        if now - self._last_call >= self.interval_ms:
-            self._last_call = now
-            func(*args, **kwargs)
-            return True
-        return False
+        super().__init__(interval_ms, widget=widget, trailing=False)
 
 
 # Готовые дебаунсеры для типичных задач
@@ -262,8 +458,9 @@ DEBOUNCE_UI = 50      # Обновление UI
 DEBOUNCE_SEARCH = 300  # Поиск/фильтрация
 DEBOUNCE_SAVE = 2000   # Автосохранение
 DEBOUNCE_RESIZE = 100  # Изменение размера окна
+DEBOUNCE_CODEGEN = 150          # Живая генерация кода
+DEBOUNCE_CODEGEN_MAX_WAIT = 1000  # ...но не реже раза в секунду
 
 THROTTLE_SCROLL = 16   # Скролл (60fps)
 THROTTLE_DRAG = 16     # Перетаскивание (60fps)
 THROTTLE_MOUSE = 50    # Движение мыши
-
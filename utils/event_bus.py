@@ -1,11 +1,17 @@
 """
 Централизованная шина событий (Event Bus)
 Реализует паттерн Pub/Sub для уменьшения связанности модулей
+и доставку вызовов из фоновых потоков в поток Tk (emit_async / call_on_ui)
 """
 
-from typing import Dict, List, Callable, Any, Optional
+from typing import Dict, List, Callable, Any, Optional, Tuple
+import bisect
+import collections
 import threading
-from collections import defaultdict
+from contextlib import contextmanager
+from .logger import get_logger
+
+log = get_logger('EventBus')
 
 
 class EventBus:
@@ -29,17 +35,37 @@ class EventBus:
         
         # Одноразовая подписка
         event_bus.once('app:ready', lambda: print("App is ready!"))
+        
+        # Из фонового потока: обработчики выполнятся в потоке Tk
+        event_bus.attach_ui(root)
+        event_bus.emit_async('ai:response', response)
+        event_bus.call_on_ui(label.config, text="Готово")
+        
+        # Шаблоны: все события элементов / всё пространство project
+        event_bus.on('element.*', on_any_element_event)
+        event_bus.on('project.**', on_project_event)
+        
+    Пространства ':' и '.' не смешиваются: 'element:moved' (контроллер,
+    данные - элемент) и 'element.moved' (ElementManager, данные -
+    {'element': ...}) - разные события; шаблоны делят тему только по '.'.
+    Таблица обработчиков каждого события компилируется при первом emit
+    и сбрасывается при подписке/отписке; событие без подписчиков стоит
+    один поиск в словаре.
     """
     
     # Стандартные события
     EVENTS = {
         # Элементы
         'element:created': 'Создан новый элемент',
+        'element:bulk_created': 'Создана пачка элементов',
         'element:selected': 'Выбран элемент',
         'element:deselected': 'Снято выделение с элемента',
         'element:moved': 'Элемент перемещён',
         'element:resized': 'Изменён размер элемента',
         'element:deleted': 'Элемент удалён',
+        'element:reordered': 'Изменён порядок элементов',
+        'element:cleared': 'Удалены все элементы',
+        'element:loaded': 'Элементы загружены из проекта',
         'element:properties_changed': 'Изменены свойства элемента',
         
         # Механизмы
@@ -66,73 +92,124 @@ class EventBus:
         'app:closing': 'Приложение закрывается',
     }
     
+    # Разделитель сегментов темы (':' разделителем не считается)
+    SEPARATOR = '.'
+    
+    # Шаблоны: '*' - ровно один сегмент, '**' - любой хвост (в т.ч. пустой)
+    WILDCARD = '*'
+    WILDCARD_TAIL = '**'
+    
+    # Период насоса очереди UI (мс)
+    UI_PUMP_MS = 16
+    # Максимум вызовов за один такт насоса (остальное - в следующем такте)
+    UI_BATCH_LIMIT = 500
+    
     def __init__(self):
-        self._handlers: Dict[str, List[Callable]] = defaultdict(list)
-        self._once_handlers: Dict[str, List[Callable]] = defaultdict(list)
+        # Тема/шаблон -> отсортированный кортеж подписок (копируется при изменении)
+        self._handlers: Dict[str, Tuple[_Subscription, ...]] = {}
+        # Дерево шаблонов с '*'/'**'
+        self._trie = _TopicNode()
+        # Скомпилированные таблицы: имя события как передано в emit -> подписки
+        self._dispatch: Dict[str, Tuple[_Subscription, ...]] = {}
         self._lock = threading.Lock()
         self._enabled = True
+        self._sequence = 0
+        # Состояние batch/suspend (своё у каждого потока)
+        self._local = threading.local()
+        # Очередь вызовов для потока Tk: append/popleft у deque атомарны,
+        # поэтому потоки-производители не берут блокировок
+        self._ui_queue: 'collections.deque[Tuple[Callable, tuple, dict]]' = collections.deque()
+        self._ui_root = None
+        self._ui_thread: Optional[int] = None
+        self._ui_after_id = None
+        self._ui_interval = self.UI_PUMP_MS
+        
+    def _is_pattern(self, topic: str) -> bool:
+        return self.WILDCARD in topic
+        
+    def _subscribe(self, event: str, handler: Callable, priority: int, once: bool) -> 'EventBus':
+        with self._lock:
+            self._sequence += 1
+            sub = _Subscription(priority, self._sequence, handler, once)
+            current = self._handlers.get(event, ())
+            # Копирование при записи: вставка в отсортированный кортеж
+            index = bisect.bisect(current, sub)
+            self._handlers[event] = current[:index] + (sub,) + current[index:]
+            if self._is_pattern(event):
+                self._trie.add(event.split(self.SEPARATOR), event)
+            self._dispatch = {}
+        return self
         
     def on(self, event: str, handler: Callable, priority: int = 0) -> 'EventBus':
         """
         Подписывается на событие.
         
         Args:
-            event: Имя события
+            event: Имя события или шаблон ('element.*', 'project.**')
             handler: Функция-обработчик
             priority: Приоритет (выше = раньше выполнится)
             
         Returns:
             self для цепочки вызовов
         """
-        with self._lock:
-            # Храним как (priority, handler)
-            self._handlers[event].append((priority, handler))
-            # Сортируем по приоритету (больше = раньше)
-            self._handlers[event].sort(key=lambda x: -x[0])
-        return self
+        return self._subscribe(event, handler, priority, once=False)
         
     def off(self, event: str, handler: Optional[Callable] = None) -> 'EventBus':
         """
         Отписывается от события.
         
         Args:
-            event: Имя события
+            event: Имя события или шаблон
             handler: Функция-обработчик (если None - отписывает всех)
             
         Returns:
             self для цепочки вызовов
         """
         with self._lock:
-            if handler is None:
-                # Удаляем всех
-                self._handlers[event].clear()
-                self._once_handlers[event].clear()
-            else:
-                # Удаляем конкретный обработчик
-                self._handlers[event] = [
-                    (p, h) for p, h in self._handlers[event] if h != handler
-                ]
-                self._once_handlers[event] = [
-                    (p, h) for p, h in self._once_handlers[event] if h != handler
-                ]
+            self._remove(event, lambda sub: handler is None or sub.handler == handler)
         return self
         
+    def _remove(self, topic: str, predicate: Callable[['_Subscription'], bool]):
+        """Удаляет подписки темы (вызывается под блокировкой)"""
+        current = self._handlers.get(topic)
+        if not current:
+            return
+        kept = tuple(sub for sub in current if not predicate(sub))
+        if len(kept) == len(current):
+            return
+        if kept:
+            self._handlers[topic] = kept
+        else:
+            del self._handlers[topic]
+            if self._is_pattern(topic):
+                self._trie.remove(topic.split(self.SEPARATOR))
+        self._dispatch = {}
+        
     def once(self, event: str, handler: Callable, priority: int = 0) -> 'EventBus':
         """
         Подписывается на событие с автоматической отпиской после первого срабатывания.
         
         Args:
-            event: Имя события
+            event: Имя события или шаблон
             handler: Функция-обработчик
             priority: Приоритет
             
         Returns:
             self для цепочки вызовов
         """
+        return self._subscribe(event, handler, priority, once=True)
+        
+    def _compile(self, event: str) -> Tuple['_Subscription', ...]:
+        """Собирает таблицу обработчиков события: точная тема + подходящие шаблоны"""
         with self._lock:
-            self._once_handlers[event].append((priority, handler))
-            self._once_handlers[event].sort(key=lambda x: -x[0])
-        return self
+            handlers = self._handlers
+            subs = list(handlers.get(event, ()))
+            for pattern in self._trie.match(event.split(self.SEPARATOR)):
+                subs.extend(handlers.get(pattern, ()))
+            # Как и раньше: сначала постоянные, затем одноразовые, внутри - по приоритету
+            table = tuple(sorted(subs, key=lambda sub: (sub.once, sub)))
+            self._dispatch[event] = table
+        return table
         
     def emit(self, event: str, *args, **kwargs) -> bool:
         """
@@ -147,34 +224,183 @@ class EventBus:
         """
         if not self._enabled:
             return False
+        
+        table = self._dispatch.get(event)
+        if table is None:
+            table = self._compile(event)
+        if not table:
+            # Быстрый путь: подписчиков нет
+            return False
+        
+        local = self._local.__dict__
+        if local.get('suspended'):
+            return False
+        queue = local.get('batch')
+        if queue is not None:
+            queue.append((event, args, kwargs))
+            return True
             
+        return self._dispatch_event(event, table, args, kwargs)
+        
+    def _dispatch_event(self, event: str, table, args, kwargs) -> bool:
+        """Вызывает обработчики из скомпилированной таблицы"""
+        if table[-1].once:
+            # Одноразовые снимаются до вызова (повторный emit из обработчика их не увидит)
+            fired = {id(sub) for sub in table if sub.once}
+            with self._lock:
+                for topic in list(self._handlers):
+                    self._remove(topic, lambda sub: sub.once and id(sub) in fired)
+        
         handled = False
+        for sub in table:
+            try:
+                sub.handler(*args, **kwargs)
+                handled = True
+            except Exception as e:
+                kind = "once handler" if sub.once else "handler"
+                log.error("Error in %s for '%s': %s", kind, event, e)
+                
+        return handled
         
-        with self._lock:
-            # Копируем списки чтобы избежать проблем при модификации во время итерации
-            handlers = list(self._handlers.get(event, []))
-            once_handlers = list(self._once_handlers.get(event, []))
+    @contextmanager
+    def batch(self, coalesce: bool = True):
+        """
+        Копит события внутри блока и публикует их при выходе.
+        
+        Args:
+            coalesce: Схлопывать повторы (та же тема с теми же аргументами)
+        
+        Пример:
+            with event_bus.batch():
+                for element in elements:
+                    element.move(dx, dy)   # 'element.moved' x N
+            # Обработчики вызываются после блока
+        """
+        local = self._local.__dict__
+        outer = local.get('batch')
+        if outer is not None:
+            # Вложенный batch - события уходят во внешний
+            yield self
+            return
+        
+        queue = local['batch'] = []
+        try:
+            yield self
+        finally:
+            local['batch'] = None
             
-            # Очищаем once обработчики
-            self._once_handlers[event].clear()
+        seen = set()
+        for event, args, kwargs in queue:
+            if coalesce:
+                try:
+                    key = (event, args, tuple(sorted(kwargs.items())))
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                except TypeError:
+                    pass  # Нехешируемые аргументы - без схлопывания
+            self.emit(event, *args, **kwargs)
             
-        # Вызываем обычные обработчики
-        for priority, handler in handlers:
+    @contextmanager
+    def suspend(self):
+        """Подавляет события внутри блока (в текущем потоке)"""
+        local = self._local.__dict__
+        previous = local.get('suspended', False)
+        local['suspended'] = True
+        try:
+            yield self
+        finally:
+            local['suspended'] = previous
+        
+    # === Доставка в поток Tk ===
+    
+    def attach_ui(self, root, interval_ms: Optional[int] = None):
+        """
+        Подключает насос очереди UI к корневому окну.
+        Вызывается в потоке Tk; с этого момента call_on_ui/emit_async
+        из других потоков выполняются в нём.
+        
+        Args:
+            root: Корневое окно Tk
+            interval_ms: Период насоса (по умолчанию UI_PUMP_MS)
+        """
+        self.detach_ui()
+        self._ui_root = root
+        self._ui_thread = threading.get_ident()
+        self._ui_interval = interval_ms or self.UI_PUMP_MS
+        self._pump_ui()
+        
+    def detach_ui(self):
+        """Останавливает насос (очередь сохраняется до следующего attach_ui)"""
+        root, after_id = self._ui_root, self._ui_after_id
+        self._ui_root = None
+        self._ui_thread = None
+        self._ui_after_id = None
+        if root is not None and after_id is not None:
             try:
-                handler(*args, **kwargs)
-                handled = True
-            except Exception as e:
-                print(f"[EventBus] Error in handler for '{event}': {e}")
+                root.after_cancel(after_id)
+            except Exception:
+                pass
                 
-        # Вызываем once обработчики
-        for priority, handler in once_handlers:
+    def get_ui_root(self):
+        """Корневое окно, к которому подключён насос (или None)"""
+        return self._ui_root
+        
+    def is_ui_thread(self) -> bool:
+        """True если вызов идёт из потока Tk (или насос не подключён)"""
+        return self._ui_thread is None or self._ui_thread == threading.get_ident()
+        
+    def call_on_ui(self, func: Callable, *args, **kwargs):
+        """
+        Выполняет функцию в потоке Tk.
+        
+        Из потока Tk (и пока насос не подключён) функция вызывается сразу,
+        из других потоков - ставится в очередь и выполняется ближайшим
+        тактом насоса.
+        """
+        if self._ui_root is None or self._ui_thread == threading.get_ident():
+            func(*args, **kwargs)
+        else:
+            self._ui_queue.append((func, args, kwargs))
+            
+    def emit_async(self, event: str, *args, **kwargs):
+        """Публикует событие из любого потока; обработчики выполняются в потоке Tk"""
+        self.call_on_ui(self.emit, event, *args, **kwargs)
+        
+    def _pump_ui(self):
+        """Такт насоса: выполняет накопленные вызовы пачкой"""
+        root = self._ui_root
+        if root is None:
+            return
+        self._ui_after_id = None
+        self.drain_ui(self.UI_BATCH_LIMIT)
+        if self._ui_root is root:
+            # Хвост пачки - без ожидания периода
+            delay = 1 if self._ui_queue else self._ui_interval
             try:
-                handler(*args, **kwargs)
-                handled = True
-            except Exception as e:
-                print(f"[EventBus] Error in once handler for '{event}': {e}")
+                self._ui_after_id = root.after(delay, self._pump_ui)
+            except Exception:
+                # Окно уничтожено
+                self._ui_root = None
+                self._ui_thread = None
                 
-        return handled
+    def drain_ui(self, limit: Optional[int] = None) -> int:
+        """
+        Выполняет вызовы из очереди UI в текущем потоке.
+        
+        Returns:
+            Количество выполненных вызовов
+        """
+        ui_queue = self._ui_queue
+        count = len(ui_queue) if limit is None else min(limit, len(ui_queue))
+        for _ in range(count):
+            func, args, kwargs = ui_queue.popleft()
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                name = getattr(func, '__qualname__', repr(func))
+                log.error("Error in UI call %s: %s", name, e)
+        return count
         
     def enable(self):
         """Включает шину событий"""
@@ -187,19 +413,87 @@ class EventBus:
     def clear(self):
         """Очищает все подписки"""
         with self._lock:
-            self._handlers.clear()
-            self._once_handlers.clear()
+            self._handlers = {}
+            self._trie = _TopicNode()
+            self._dispatch = {}
             
     def get_handlers_count(self, event: str) -> int:
-        """Возвращает количество обработчиков для события"""
-        with self._lock:
-            return len(self._handlers.get(event, [])) + len(self._once_handlers.get(event, []))
+        """Возвращает количество обработчиков для события (включая шаблоны)"""
+        table = self._dispatch.get(event)
+        if table is None:
+            table = self._compile(event)
+        return len(table)
             
     def list_events(self) -> List[str]:
-        """Возвращает список всех событий с подписчиками"""
+        """Возвращает список всех событий и шаблонов с подписчиками"""
         with self._lock:
-            events = set(self._handlers.keys()) | set(self._once_handlers.keys())
-            return list(events)
+            return list(self._handlers.keys())
+
+
+class _Subscription:
+    """Подписка; сортируется по приоритету (больше = раньше), затем по порядку подписки"""
+    
+    __slots__ = ('priority', 'sequence', 'handler', 'once')
+    
+    def __init__(self, priority: int, sequence: int, handler: Callable, once: bool):
+        self.priority = priority
+        self.sequence = sequence
+        self.handler = handler
+        self.once = once
+        
+    def __lt__(self, other: '_Subscription') -> bool:
+        return (-self.priority, self.sequence) < (-other.priority, other.sequence)
+
+
+class _TopicNode:
+    """Узел дерева шаблонов тем"""
+    
+    __slots__ = ('children', 'pattern', 'tail_pattern')
+    
+    def __init__(self):
+        self.children: Dict[str, '_TopicNode'] = {}
+        # Шаблон, заканчивающийся в этом узле
+        self.pattern: Optional[str] = None
+        # Шаблон вида '<путь>.**' (любой хвост)
+        self.tail_pattern: Optional[str] = None
+        
+    def add(self, segments: List[str], pattern: str):
+        node = self
+        for index, segment in enumerate(segments):
+            if segment == EventBus.WILDCARD_TAIL and index == len(segments) - 1:
+                node.tail_pattern = pattern
+                return
+            node = node.children.setdefault(segment, _TopicNode())
+        node.pattern = pattern
+        
+    def remove(self, segments: List[str]):
+        node = self
+        for index, segment in enumerate(segments):
+            if segment == EventBus.WILDCARD_TAIL and index == len(segments) - 1:
+                node.tail_pattern = None
+                return
+            node = node.children.get(segment)
+            if node is None:
+                return
+        node.pattern = None
+        
+    def match(self, segments: List[str]) -> List[str]:
+        """Шаблоны, подходящие под тему"""
+        found = []
+        self._match(segments, 0, found)
+        return found
+        
+    def _match(self, segments: List[str], index: int, found: List[str]):
+        if self.tail_pattern:
+            found.append(self.tail_pattern)
+        if index == len(segments):
+            if self.pattern:
+                found.append(self.pattern)
+            return
+        for key in (segments[index], EventBus.WILDCARD):
+            child = self.children.get(key)
+            if child is not None:
+                child._match(segments, index + 1, found)
 
 
 # Глобальный экземпляр шины событий
@@ -226,3 +520,13 @@ def once(event: str, handler: Callable, priority: int = 0) -> EventBus:
     """Одноразовая подписка (глобальная шина)"""
     return event_bus.once(event, handler, priority)
 
+
+
+def emit_async(event: str, *args, **kwargs):
+    """Публикует событие из любого потока (глобальная шина)"""
+    event_bus.emit_async(event, *args, **kwargs)
+
+
+def call_on_ui(func: Callable, *args, **kwargs):
+    """Выполняет функцию в потоке Tk (глобальная шина)"""
+    event_bus.call_on_ui(func, *args, **kwargs)
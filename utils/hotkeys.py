@@ -343,6 +343,13 @@ def setup_default_hotkeys(hotkeys: HotkeyManager, app) -> HotkeyManager:
         HotkeyManager.CATEGORY_VIEW
     )
     
+    hotkeys.register(
+        'F12', 
+        lambda: app.toggle_profiler_hud() if hasattr(app, 'toggle_profiler_hud') else None,
+        'HUD профилировщика',
+        HotkeyManager.CATEGORY_VIEW
+    )
+    
     # === Навигация ===
     hotkeys.register(
         'F5', 
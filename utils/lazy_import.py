@@ -0,0 +1,47 @@
+"""
+Ленивый импорт для пакетов (PEP 562)
+Имена пакета загружаются из своих модулей при первом обращении,
+а не при импорте пакета: холодный старт не платит за неиспользуемые подсистемы
+"""
+
+import importlib
+import sys
+from typing import Callable, Dict, List, Sequence, Tuple
+
+
+def lazy_exports(package: str, modules: Dict[str, Sequence[str]]
+                 ) -> Tuple[Callable[[str], object], Callable[[], List[str]], List[str]]:
+    """
+    Строит __getattr__, __dir__ и __all__ для __init__.py пакета.
+
+    Использование (вместо from .button_config_dialog import ...):
+        __getattr__, __dir__, __all__ = lazy_exports(__name__, {
+            '.button_config_dialog': ('ButtonConfigDialog', 'show_button_config'),
+            '.frame_config_dialog': ('FrameConfigDialog', 'show_frame_config'),
+        })
+
+    Загруженное имя кэшируется в пакете - повторное обращение идёт
+    без __getattr__. Имя не должно совпадать с именем подмодуля:
+    импорт подмодуля перезапишет атрибут пакета (такие имена импортируются сразу).
+
+    Args:
+        package: __name__ пакета
+        modules: относительный модуль -> экспортируемые из него имена
+    """
+    exports: Dict[str, str] = {}
+    for module_name, names in modules.items():
+        for name in names:
+            exports[name] = module_name
+
+    def __getattr__(name: str):
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__, list(exports)
@@ -1,14 +1,23 @@
 """
 Централизованная система логирования для проекта.
 Поддерживает уровни логирования, форматирование, ротацию файлов.
+
+Логгеры модулей только кладут записи в общую очередь (QueueHandler);
+форматирование и запись в консоль/файлы выполняет один поток (QueueListener),
+поэтому log.debug на горячих путях не блокирует поток Tk файловым вводом-выводом.
+Сообщения с аргументами форматируются только если уровень включён:
+    log.debug("Перемещён %s в (%s, %s)", element.id, x, y)
 """
 
+import atexit
+import json
 import logging
 import os
+import queue
 import sys
 from datetime import datetime
 from typing import Optional
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 
 
 # Цвета для консоли (ANSI)
@@ -36,6 +45,77 @@ class ColoredFormatter(logging.Formatter):
         return super().format(record)
 
 
+# Атрибуты LogRecord, не попадающие в поле 'data' JSON-записи
+_RECORD_ATTRS = frozenset(logging.makeLogRecord({}).__dict__) | {
+    'message', 'asctime', 'colored_levelname'
+}
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Форматтер JSON Lines: одна запись - одна строка JSON"""
+    
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'thread': record.threadName,
+        }
+        # Поля из extra={...}
+        data = {key: value for key, value in record.__dict__.items()
+                if key not in _RECORD_ATTRS}
+        if data:
+            entry['data'] = data
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _EnqueueHandler(QueueHandler):
+    """Обработчик логгера модуля: только ставит запись в очередь"""
+    
+    def prepare(self, record):
+        # Текст фиксируется сразу (аргументы могут измениться до записи),
+        # время, цвета и traceback форматируются в потоке записи
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class _ModuleFileHandler(logging.Handler):
+    """Раскладывает записи по файлам модулей (работает в потоке записи)"""
+    
+    def __init__(self, log_dir: str, formatter: logging.Formatter, extension: str,
+                 max_bytes: int, backup_count: int):
+        super().__init__()
+        self.log_dir = log_dir
+        self.extension = extension
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.setFormatter(formatter)
+        self._files = {}
+        
+    def emit(self, record):
+        handler = self._files.get(record.name)
+        if handler is None:
+            handler = RotatingFileHandler(
+                os.path.join(self.log_dir, f'{record.name}.{self.extension}'),
+                maxBytes=self.max_bytes,
+                backupCount=self.backup_count,
+                encoding='utf-8'
+            )
+            handler.setFormatter(self.formatter)
+            self._files[record.name] = handler
+        handler.emit(record)
+        
+    def close(self):
+        for handler in self._files.values():
+            handler.close()
+        self._files.clear()
+        super().close()
+
+
 class Logger:
     """
     Менеджер логирования для проекта.
@@ -60,9 +140,14 @@ class Logger:
     _log_level: int = logging.INFO
     _file_logging: bool = True
     _console_logging: bool = True
+    _json_lines: bool = True
     _initialized: bool = False
     _loggers: dict = {}
     
+    # Очередь записей и поток записи
+    _queue: Optional[queue.SimpleQueue] = None
+    _listener: Optional[QueueListener] = None
+    
     # Константы
     MAX_LOG_SIZE = 50 * 1024 * 1024  # 50MB
     BACKUP_COUNT = 5
@@ -72,7 +157,8 @@ class Logger:
                    log_dir: Optional[str] = None,
                    level: int = logging.INFO,
                    file_logging: bool = True,
-                   console_logging: bool = True):
+                   console_logging: bool = True,
+                   json_lines: bool = True):
         """
         Инициализирует систему логирования.
         
@@ -81,6 +167,8 @@ class Logger:
             level: Уровень логирования (DEBUG, INFO, WARNING, ERROR, CRITICAL)
             file_logging: Включить запись в файл
             console_logging: Включить вывод в консоль
+            json_lines: Файлы модулей в формате JSON Lines (<модуль>.jsonl)
+                вместо текстового (<модуль>.log)
         """
         if cls._initialized:
             return
@@ -88,6 +176,7 @@ class Logger:
         cls._log_level = level
         cls._file_logging = file_logging
         cls._console_logging = console_logging
+        cls._json_lines = json_lines
         
         # Определяем директорию для логов
         if log_dir:
@@ -101,8 +190,59 @@ class Logger:
         if cls._file_logging:
             os.makedirs(cls._log_dir, exist_ok=True)
             
+        cls._start_listener()
         cls._initialized = True
         
+    @classmethod
+    def _start_listener(cls):
+        """Запускает поток записи с консольным и файловым обработчиками"""
+        date_format = '%Y-%m-%d %H:%M:%S'
+        handlers = []
+        
+        # Консольный обработчик
+        if cls._console_logging:
+            console_handler = logging.StreamHandler(sys.stdout)
+            console_handler.setFormatter(ColoredFormatter(
+                '%(asctime)s | %(colored_levelname)s | %(name)s | %(message)s', date_format
+            ))
+            handlers.append(console_handler)
+            
+        # Файлы модулей
+        if cls._file_logging and cls._log_dir:
+            if cls._json_lines:
+                file_formatter = JsonLinesFormatter()
+            else:
+                # Без цветов для файла
+                file_formatter = logging.Formatter(
+                    '%(asctime)s | %(levelname)-8s | %(name)s | %(message)s', date_format
+                )
+            file_handler = _ModuleFileHandler(
+                cls._log_dir, file_formatter, cls._file_extension(),
+                cls.MAX_LOG_SIZE, cls.BACKUP_COUNT
+            )
+            handlers.append(file_handler)
+            
+        # Уровень проверяют логгеры до постановки в очередь,
+        # у обработчиков потока записи уровня нет
+        cls._queue = queue.SimpleQueue()
+        cls._listener = QueueListener(cls._queue, *handlers)
+        cls._listener.start()
+        atexit.register(cls.shutdown)
+        
+    @classmethod
+    def shutdown(cls):
+        """Дописывает очередь и останавливает поток записи"""
+        listener, cls._listener = cls._listener, None
+        if listener is None:
+            return
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+            
+    @classmethod
+    def _file_extension(cls) -> str:
+        return 'jsonl' if cls._json_lines else 'log'
+        
     @classmethod
     def create(cls, name: str) -> logging.Logger:
         """
@@ -133,35 +273,8 @@ class Logger:
         if logger.handlers:
             return logger
             
-        # Формат сообщений
-        format_str = '%(asctime)s | %(colored_levelname)s | %(name)s | %(message)s'
-        date_format = '%Y-%m-%d %H:%M:%S'
-        
-        # Консольный обработчик
-        if cls._console_logging:
-            console_handler = logging.StreamHandler(sys.stdout)
-            console_handler.setLevel(cls._log_level)
-            console_formatter = ColoredFormatter(format_str, date_format)
-            console_handler.setFormatter(console_formatter)
-            logger.addHandler(console_handler)
-            
-        # Файловый обработчик
-        if cls._file_logging and cls._log_dir:
-            log_file = os.path.join(cls._log_dir, f'{clean_name}.log')
-            
-            file_handler = RotatingFileHandler(
-                log_file,
-                maxBytes=cls.MAX_LOG_SIZE,
-                backupCount=cls.BACKUP_COUNT,
-                encoding='utf-8'
-            )
-            file_handler.setLevel(cls._log_level)
-            
-            # Без цветов для файла
-            file_format = '%(asctime)s | %(levelname)-8s | %(name)s | %(message)s'
-            file_formatter = logging.Formatter(file_format, date_format)
-            file_handler.setFormatter(file_formatter)
-            logger.addHandler(file_handler)
+        # Запись уходит в очередь, форматирует и пишет поток записи
+        logger.addHandler(_EnqueueHandler(cls._queue))
             
         # Кэшируем
         cls._loggers[clean_name] = logger
@@ -174,14 +287,12 @@ class Logger:
         cls._log_level = level
         for logger in cls._loggers.values():
             logger.setLevel(level)
-            for handler in logger.handlers:
-                handler.setLevel(level)
                 
     @classmethod
     def get_log_file(cls, name: str) -> Optional[str]:
         """Возвращает путь к лог-файлу"""
         if cls._log_dir:
-            return os.path.join(cls._log_dir, f'{name}.log')
+            return os.path.join(cls._log_dir, f'{name}.{cls._file_extension()}')
         return None
 
 
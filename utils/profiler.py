@@ -0,0 +1,320 @@
+"""
+Профилирование горячих путей
+Замеры (perf_counter_ns) пишутся в кольцевой буфер только когда профилировщик
+включён; HUD на холсте показывает FPS, время кадра и самые дорогие участки,
+буфер выгружается в Chrome trace (chrome://tracing, Perfetto)
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .logger import get_logger
+
+log = get_logger('Profiler')
+
+
+class _Span:
+    """Замер участка кода (контекстный менеджер)"""
+
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler: 'Profiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        start = self.start
+        self.profiler.record(self.name, start, time.perf_counter_ns() - start)
+        return False
+
+
+class _NullSpan:
+    """Пустой замер для выключенного профилировщика"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Profiler:
+    """
+    Профилировщик участков кода.
+
+    Использование:
+        from modules.utils.profiler import get_profiler, profiled
+
+        @profiled('grid.draw')
+        def draw_grid(self):
+            ...
+
+        with get_profiler().span('codegen.regenerate'):
+            ...
+
+        profiler = get_profiler()
+        profiler.enable()
+        ...
+        profiler.export_chrome_trace('trace.json')
+
+    Пока профилировщик выключен, замер стоит одну проверку флага.
+    """
+
+    # Размер кольцевого буфера замеров
+    BUFFER_SIZE = 100000
+    # Сколько последних кадров учитывается в статистике
+    FRAME_HISTORY = 240
+
+    def __init__(self, buffer_size: Optional[int] = None):
+        self.enabled = False
+        # (имя, начало нс, длительность нс, поток)
+        self._spans: deque = deque(maxlen=buffer_size or self.BUFFER_SIZE)
+        # Длительности кадров (нс)
+        self._frames: deque = deque(maxlen=self.FRAME_HISTORY)
+        self._last_frame: Optional[int] = None
+
+    def enable(self):
+        """Включает запись замеров"""
+        self.enabled = True
+
+    def disable(self):
+        """Выключает запись замеров (буфер сохраняется)"""
+        self.enabled = False
+        self._last_frame = None
+
+    def clear(self):
+        """Очищает буфер замеров и историю кадров"""
+        self._spans.clear()
+        self._frames.clear()
+        self._last_frame = None
+
+    # === Запись ===
+
+    def span(self, name: str):
+        """Контекстный менеджер замера участка"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name: str, start_ns: int, duration_ns: int):
+        """Добавляет готовый замер (deque.append потокобезопасен)"""
+        self._spans.append((name, start_ns, duration_ns, threading.get_ident()))
+
+    def mark_frame(self):
+        """Отмечает границу кадра цикла событий"""
+        now = time.perf_counter_ns()
+        if self._last_frame is not None:
+            duration = now - self._last_frame
+            self._frames.append(duration)
+            if self.enabled:
+                self._spans.append(('frame', self._last_frame, duration, threading.get_ident()))
+        self._last_frame = now
+
+    # === Статистика ===
+
+    def frame_stats(self) -> Dict[str, float]:
+        """FPS и время кадра (p50/p95, мс) по последним кадрам"""
+        frames = sorted(self._frames)
+        if not frames:
+            return {'fps': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'frames': 0}
+        count = len(frames)
+        mean = sum(frames) / count
+        return {
+            'fps': 1e9 / mean if mean else 0.0,
+            'p50_ms': frames[count // 2] / 1e6,
+            'p95_ms': frames[min(count - 1, int(count * 0.95))] / 1e6,
+            'frames': count,
+        }
+
+    def top_spans(self, window_ms: float = 1000, limit: int = 5) -> List[Tuple[str, float, int]]:
+        """
+        Самые дорогие участки за последние window_ms.
+
+        Returns:
+            [(имя, суммарное время мс, количество вызовов)] по убыванию времени
+        """
+        cutoff = time.perf_counter_ns() - int(window_ms * 1e6)
+        totals: Dict[str, List[int]] = {}
+        for name, start, duration, _ in reversed(self._spans):
+            if start < cutoff:
+                break
+            if name == 'frame':
+                continue
+            entry = totals.get(name)
+            if entry is None:
+                totals[name] = [duration, 1]
+            else:
+                entry[0] += duration
+                entry[1] += 1
+        ranked = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)
+        return [(name, total / 1e6, count) for name, (total, count) in ranked[:limit]]
+
+    # === Экспорт ===
+
+    def export_chrome_trace(self, path: str) -> int:
+        """
+        Сохраняет буфер в формате Chrome trace (JSON, события 'X').
+
+        Returns:
+            Количество записанных замеров
+        """
+        spans = list(self._spans)
+        # Внешний участок записывается после вложенных - начало берём минимальное
+        origin = min(span[1] for span in spans) if spans else 0
+        pid = os.getpid()
+        events = [{
+            'name': name,
+            'cat': name.split('.', 1)[0],
+            'ph': 'X',
+            'ts': (start - origin) / 1000,
+            'dur': duration / 1000,
+            'pid': pid,
+            'tid': tid,
+        } for name, start, duration, tid in spans]
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        log.info("Trace сохранён: %s (%d замеров)", path, len(events))
+        return len(events)
+
+
+class ProfilerHUD:
+    """
+    Оверлей профилировщика в углу холста.
+
+    Пока HUD показан, профилировщик включён, а отдельный таймер
+    с периодом FRAME_MS отмечает кадры: если цикл событий занят,
+    кадры растягиваются - это и видно в p50/p95.
+    """
+
+    TAG = 'profiler_hud'
+    FRAME_MS = 16
+    REFRESH_MS = 250
+
+    def __init__(self, canvas, profiler: Optional[Profiler] = None):
+        self.canvas = canvas
+        self.profiler = profiler or get_profiler()
+        self.visible = False
+        self._was_enabled = False
+        self._frame_id = None
+        self._refresh_id = None
+        self._text_item = None
+        self._bg_item = None
+
+    def toggle(self):
+        """Показывает/скрывает HUD"""
+        if self.visible:
+            self.hide()
+        else:
+            self.show()
+
+    def show(self):
+        if self.visible:
+            return
+        self.visible = True
+        self._was_enabled = self.profiler.enabled
+        self.profiler.enable()
+        self._bg_item = self.canvas.create_rectangle(
+            0, 0, 0, 0, fill='#0d1117', outline='#30363d', tags=(self.TAG,)
+        )
+        self._text_item = self.canvas.create_text(
+            0, 0, anchor='nw', fill='#7ee787', font=("Consolas", 9), tags=(self.TAG,)
+        )
+        self._frame_tick()
+        self._refresh()
+
+    def hide(self):
+        if not self.visible:
+            return
+        self.visible = False
+        for after_id in (self._frame_id, self._refresh_id):
+            if after_id is not None:
+                try:
+                    self.canvas.after_cancel(after_id)
+                except Exception:
+                    pass
+        self._frame_id = self._refresh_id = None
+        try:
+            self.canvas.delete(self.TAG)
+        except Exception:
+            pass
+        self._text_item = self._bg_item = None
+        if not self._was_enabled:
+            self.profiler.disable()
+
+    def _frame_tick(self):
+        self.profiler.mark_frame()
+        self._frame_id = self.canvas.after(self.FRAME_MS, self._frame_tick)
+
+    def _refresh(self):
+        """Перерисовывает текст HUD"""
+        with self.profiler.span('profiler.hud'):
+            stats = self.profiler.frame_stats()
+            items = len(self.canvas.find_all()) - 2
+            lines = [
+                f"FPS {stats['fps']:5.1f}   кадр p50 {stats['p50_ms']:5.1f} мс   p95 {stats['p95_ms']:5.1f} мс",
+                f"объектов на холсте: {items}",
+            ]
+            for name, total_ms, count in self.profiler.top_spans(window_ms=1000):
+                lines.append(f"{total_ms:7.2f} мс/с  ×{count:<5} {name}")
+
+            x = self.canvas.canvasx(0) + 8
+            y = self.canvas.canvasy(0) + 8
+            self.canvas.itemconfig(self._text_item, text='\n'.join(lines))
+            self.canvas.coords(self._text_item, x + 6, y + 4)
+            x1, y1, x2, y2 = self.canvas.bbox(self._text_item) or (x, y, x, y)
+            self.canvas.coords(self._bg_item, x1 - 6, y1 - 4, x2 + 6, y2 + 4)
+            self.canvas.tag_raise(self.TAG)
+        self._refresh_id = self.canvas.after(self.REFRESH_MS, self._refresh)
+
+
+# Глобальный экземпляр
+_profiler = Profiler()
+
+
+def get_profiler() -> Profiler:
+    """Получить глобальный профилировщик"""
+    return _profiler
+
+
+def profiled(name: Optional[str] = None):
+    """
+    Декоратор замера функции (глобальный профилировщик).
+
+    Использование:
+        @profiled('element.update')
+        def update(self):
+            ...
+    """
+    def decorator(func: Callable):
+        span_name = name or func.__qualname__
+        profiler = _profiler
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.record(span_name, start, time.perf_counter_ns() - start)
+
+        wrapper.__profiled__ = True
+        return wrapper
+
+    return decorator
@@ -0,0 +1,273 @@
+"""
+Дисковый кэш ответов ИИ (SQLite)
+Ответы переживают перезапуск; размер ограничен (вытесняются давно
+не использованные), записи устаревают по TTL. Ключ строится из
+нормализованного запроса и параметров генерации.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from .logger import get_logger
+
+log = get_logger('ResponseCache')
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Запрос без различий в регистре и пробелах"""
+    return ' '.join(prompt.casefold().split())
+
+
+class ResponseCache:
+    """
+    LRU-кэш ответов с TTL, хранящийся в SQLite.
+
+    Использование:
+        cache = ResponseCache('~/.panel_editor_ai_cache.db')
+        cache.warm()
+
+        key = cache.make_key('css_generator', prompt, model='orca', settings=settings)
+        text = cache.get(key)
+        if text is None:
+            text = generate(...)
+            cache.put(key, text, task_type='css_generator')
+
+    Недавние записи держатся и в памяти: повторный запрос не обращается к диску.
+    Методы потокобезопасны (генерация пишет в кэш из фонового потока).
+    """
+
+    MAX_ENTRIES = 2000
+    TTL_SECONDS = 30 * 24 * 3600
+    # Сколько последних записей загружается в память при старте
+    WARM_ENTRIES = 200
+    MEMORY_ENTRIES = 500
+    # Параметры генерации, влияющие на ответ
+    KEY_SETTINGS = ('max_tokens', 'temperature', 'top_p', 'repeat_penalty')
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None,
+                 ttl_seconds: Optional[float] = None):
+        """
+        Args:
+            path: Файл базы (None - только память)
+            max_entries: Максимум записей на диске
+            ttl_seconds: Время жизни записи (0 - без ограничения)
+        """
+        self.path = os.path.expanduser(path) if path else None
+        self.max_entries = max_entries or self.MAX_ENTRIES
+        self.ttl_seconds = self.TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._memory: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.RLock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._opened = False
+        self._count = 0
+        self.hits = 0
+        self.misses = 0
+
+    # === Ключи ===
+
+    @classmethod
+    def make_key(cls, task_type: str, prompt: str, model: str = '',
+                 settings: Optional[Dict[str, Any]] = None) -> str:
+        """Ключ записи: задача, нормализованный запрос, модель и параметры генерации"""
+        settings = settings or {}
+        payload = {
+            'task': task_type,
+            'prompt': normalize_prompt(prompt),
+            'model': model,
+            'settings': {name: settings.get(name) for name in cls.KEY_SETTINGS},
+        }
+        raw = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    # === База ===
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Открывает базу при первом обращении (ошибка диска - кэш только в памяти)"""
+        if self._opened:
+            return self._db
+        self._opened = True
+        if not self.path:
+            return None
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    task TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    accessed REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)")
+            self._db = db
+            self._purge_expired()
+            self._count = db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        except (sqlite3.Error, OSError) as e:
+            log.warning("Кэш ответов недоступен (%s): %s", self.path, e)
+            self._db = None
+        return self._db
+
+    def _expired(self, created: float, now: float) -> bool:
+        return bool(self.ttl_seconds) and now - created > self.ttl_seconds
+
+    def _purge_expired(self):
+        if self._db is None or not self.ttl_seconds:
+            return
+        removed = self._db.execute(
+            "DELETE FROM responses WHERE created < ?", (time.time() - self.ttl_seconds,)
+        ).rowcount
+        if removed:
+            log.info("Кэш ответов: удалено устаревших записей: %d", removed)
+
+    def warm(self, limit: Optional[int] = None) -> int:
+        """
+        Загружает в память последние использованные записи.
+
+        Returns:
+            Количество загруженных записей
+        """
+        with self._lock:
+            db = self._connect()
+            if db is None:
+                return 0
+            try:
+                rows = db.execute(
+                    "SELECT key, response, created FROM responses ORDER BY accessed DESC LIMIT ?",
+                    (limit or self.WARM_ENTRIES,)
+                ).fetchall()
+            except sqlite3.Error as e:
+                log.warning("Кэш ответов не прогрет: %s", e)
+                return 0
+            # Самые свежие - в конец (конец OrderedDict - недавно использованные)
+            for key, response, created in reversed(rows):
+                self._remember(key, response, created)
+            log.debug("Кэш ответов прогрет: %d из %d записей", len(rows), self._count)
+            return len(rows)
+
+    # === Чтение и запись ===
+
+    def _remember(self, key: str, response: str, created: float):
+        self._memory[key] = (response, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.MEMORY_ENTRIES:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """Ответ по ключу или None"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                db = self._connect()
+                if db is not None:
+                    try:
+                        row = db.execute("SELECT response, created FROM responses WHERE key = ?",
+                                         (key,)).fetchone()
+                    except sqlite3.Error as e:
+                        log.warning("Ошибка чтения кэша ответов: %s", e)
+                        row = None
+                    entry = tuple(row) if row else None
+
+            if entry is None:
+                self.misses += 1
+                return None
+            response, created = entry
+            if self._expired(created, now):
+                self.delete(key)
+                self.misses += 1
+                return None
+
+            self._remember(key, response, created)
+            self.hits += 1
+            if self._db is not None:
+                try:
+                    self._db.execute("UPDATE responses SET accessed = ?, hits = hits + 1 WHERE key = ?",
+                                     (now, key))
+                except sqlite3.Error as e:
+                    log.debug("Не удалось обновить время доступа: %s", e)
+            return response
+
+    def put(self, key: str, response: str, task_type: str = ''):
+        """Сохраняет ответ (с вытеснением давно не использованных записей)"""
+        now = time.time()
+        with self._lock:
+            self._remember(key, response, now)
+            db = self._connect()
+            if db is None:
+                return
+            try:
+                inserted = db.execute("SELECT 1 FROM responses WHERE key = ?", (key,)).fetchone() is None
+                db.execute(
+                    "INSERT OR REPLACE INTO responses (key, task, response, created, accessed, hits) "
+                    "VALUES (?, ?, ?, ?, ?, 0)",
+                    (key, task_type, response, now, now)
+                )
+                if inserted:
+                    self._count += 1
+                if self._count > self.max_entries:
+                    self._evict()
+            except sqlite3.Error as e:
+                log.warning("Ошибка записи кэша ответов: %s", e)
+
+    def _evict(self):
+        """Удаляет давно не использованные записи сверх лимита"""
+        excess = self._count - self.max_entries
+        self._db.execute(
+            "DELETE FROM responses WHERE key IN "
+            "(SELECT key FROM responses ORDER BY accessed ASC LIMIT ?)",
+            (excess,)
+        )
+        self._count = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        log.debug("Кэш ответов: вытеснено %d записей", excess)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._memory.pop(key, None)
+            if self._connect() is not None:
+                try:
+                    if self._db.execute("DELETE FROM responses WHERE key = ?", (key,)).rowcount:
+                        self._count -= 1
+                except sqlite3.Error as e:
+                    log.warning("Ошибка удаления из кэша ответов: %s", e)
+
+    def clear(self):
+        """Очищает кэш (память и диск)"""
+        with self._lock:
+            self._memory.clear()
+            if self._connect() is not None:
+                try:
+                    self._db.execute("DELETE FROM responses")
+                except sqlite3.Error as e:
+                    log.warning("Ошибка очистки кэша ответов: %s", e)
+            self._count = 0
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+            self._db = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._connect()
+            return self._count if self._db is not None else len(self._memory)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'entries': len(self),
+            'memory': len(self._memory),
+            'hits': self.hits,
+            'misses': self.misses,
+            'path': self.path,
+        }
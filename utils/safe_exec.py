@@ -6,7 +6,9 @@
 import sys
 import io
 import ast
-from typing import Dict, Any, Optional, Tuple
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Callable
 from contextlib import contextmanager
 
 
@@ -25,6 +27,11 @@ class DangerousCodeError(SafeExecutionError):
     pass
 
 
+class ExecutionTimeoutError(SafeExecutionError):
+    """Превышен лимит времени выполнения"""
+    pass
+
+
 class SafeExecutor:
     """
     Безопасный исполнитель кода Python.
@@ -80,6 +87,9 @@ class SafeExecutor:
         'decimal', 'fractions', 'statistics',
     }
     
+    # Размер LRU кеша проверенного и скомпилированного кода
+    CODE_CACHE_SIZE = 128
+    
     def __init__(self, timeout: int = 5, max_output: int = 10000):
         """
         Args:
@@ -90,6 +100,23 @@ class SafeExecutor:
         self.max_output = max_output
         self._output_buffer = io.StringIO()
         
+        # Получатель вывода print по мере выполнения (для потоковой передачи)
+        self.on_output: Optional[Callable[[str], None]] = None
+        
+        # (режим, хеш исходника) -> code object или (класс ошибки, сообщение)
+        self._code_cache: 'OrderedDict[Tuple[str, bytes], Any]' = OrderedDict()
+        # Шаблоны окружения: строятся один раз, при выполнении копируются
+        self._builtins_template: Optional[Dict[str, Any]] = None
+        self._modules_template: Optional[Dict[str, Any]] = None
+        
+    def warm_up(self):
+        """Заранее импортирует разрешённые модули (для воркеров sandbox)"""
+        for module_name in self.ALLOWED_MODULES:
+            try:
+                __import__(module_name)
+            except ImportError:
+                pass
+        
     def _create_safe_builtins(self) -> Dict[str, Any]:
         """Создаёт безопасный набор встроенных функций"""
         import builtins
@@ -114,6 +141,8 @@ class SafeExecutor:
                 result += "\n[...вывод обрезан...]"
                 
             self._output_buffer.write(result)
+            if result and self.on_output:
+                self.on_output(result)
             
         safe_builtins['print'] = safe_print
         
@@ -131,8 +160,74 @@ class SafeExecutor:
         
         return safe_builtins
         
-    def _check_ast(self, code: str) -> None:
-        """Проверяет AST кода на опасные конструкции"""
+    def _safe_builtins(self) -> Dict[str, Any]:
+        """Копия шаблона builtins (копируется - код может менять свои builtins)"""
+        if self._builtins_template is None:
+            self._builtins_template = self._create_safe_builtins()
+        return dict(self._builtins_template)
+        
+    def _safe_globals(self) -> Dict[str, Any]:
+        """Новое окружение выполнения из шаблонов"""
+        if self._modules_template is None:
+            # Разрешённые модули
+            modules = {}
+            for module_name in self.ALLOWED_MODULES:
+                try:
+                    modules[module_name] = __import__(module_name)
+                except ImportError:
+                    pass
+            self._modules_template = modules
+            
+        safe_globals = {'__builtins__': self._safe_builtins()}
+        safe_globals.update(self._modules_template)
+        return safe_globals
+        
+    def _compile_checked(self, source: str, mode: str = 'exec'):
+        """
+        Проверяет и компилирует код с LRU кешем по хешу исходника.
+        Повторный запуск того же кода не парсит и не обходит AST заново.
+        
+        Raises:
+            SafeExecutionError: Код не прошёл проверку (результат тоже кешируется)
+        """
+        key = (mode, hashlib.blake2b(source.encode('utf-8'), digest_size=16).digest())
+        cache = self._code_cache
+        entry = cache.get(key)
+        
+        if entry is None:
+            try:
+                if mode == 'exec':
+                    tree = self._check_ast(source)
+                else:
+                    tree = self._check_expression(source)
+                entry = compile(tree, '<sandbox>', mode)
+            except SafeExecutionError as e:
+                entry = (type(e), str(e))
+            cache[key] = entry
+            if len(cache) > self.CODE_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+            
+        if isinstance(entry, tuple):
+            error_class, message = entry
+            raise error_class(message)
+        return entry
+        
+    def _check_expression(self, expression: str) -> ast.AST:
+        """Проверяет AST выражения для evaluate"""
+        # Проверяем что это простое выражение
+        tree = ast.parse(expression, mode='eval')
+        
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Call):
+                if isinstance(node.func, ast.Name):
+                    if node.func.id in self.BLOCKED_BUILTINS:
+                        raise DangerousCodeError(f"Вызов '{node.func.id}' запрещён")
+        return tree
+        
+    def _check_ast(self, code: str) -> ast.AST:
+        """Проверяет AST кода на опасные конструкции, возвращает дерево"""
         try:
             tree = ast.parse(code)
         except SyntaxError as e:
@@ -160,6 +255,8 @@ class SafeExecutor:
                 if node.attr.startswith('__') and node.attr.endswith('__'):
                     if node.attr not in ('__init__', '__str__', '__repr__', '__len__'):
                         raise DangerousCodeError(f"Доступ к '{node.attr}' запрещён")
+        
+        return tree
                         
     def execute(self, code: str, local_vars: Optional[Dict[str, Any]] = None) -> Tuple[bool, str, Any]:
         """
@@ -175,22 +272,13 @@ class SafeExecutor:
         self._output_buffer = io.StringIO()
         
         try:
-            # Проверка AST
-            self._check_ast(code)
+            # Проверка AST и компиляция (из кеша для повторного кода)
+            compiled = self._compile_checked(code, 'exec')
             
             # Создаём безопасное окружение
-            safe_globals = {
-                '__builtins__': self._create_safe_builtins(),
-                '__name__': '__main__',
-                '__doc__': None,
-            }
-            
-            # Добавляем разрешённые модули
-            for module_name in self.ALLOWED_MODULES:
-                try:
-                    safe_globals[module_name] = __import__(module_name)
-                except ImportError:
-                    pass
+            safe_globals = self._safe_globals()
+            safe_globals['__name__'] = '__main__'
+            safe_globals['__doc__'] = None
                     
             # Добавляем пользовательские переменные
             if local_vars:
@@ -198,16 +286,41 @@ class SafeExecutor:
                 
             # Выполняем код
             result = None
-            exec(compile(code, '<sandbox>', 'exec'), safe_globals)
+            exec(compiled, safe_globals)
             
             output = self._output_buffer.getvalue()
             return True, output, result
             
+        except ExecutionTimeoutError as e:
+            return False, f"Превышено время выполнения: {e}", None
         except SafeExecutionError as e:
             return False, f"Ошибка безопасности: {e}", None
         except Exception as e:
             return False, f"Ошибка выполнения: {type(e).__name__}: {e}", None
             
+    def execute_isolated(self, code: str, local_vars: Optional[Dict[str, Any]] = None,
+                         on_output: Optional[Callable[[str], None]] = None) -> Tuple[bool, str, Any]:
+        """
+        Выполняет код в отдельном процессе из пула sandbox.
+        Лимит self.timeout соблюдается: зависший процесс убивается и заменяется.
+        Без пула код не выполняется (в текущем процессе нет ни таймаута, ни лимитов).
+        
+        Args:
+            code: Код для выполнения
+            local_vars: Дополнительные переменные (должны сериализоваться pickle)
+            on_output: Вызывается с каждым фрагментом вывода (из потока вызывающего)
+            
+        Returns:
+            Tuple[success: bool, output: str, result: Any]
+        """
+        from .sandbox_pool import get_sandbox_pool
+        
+        pool = get_sandbox_pool()
+        if pool is None:
+            return False, "Sandbox недоступен", None
+        return pool.execute(code, local_vars, on_output=on_output,
+                            timeout=self.timeout, max_output=self.max_output)
+            
     def evaluate(self, expression: str, local_vars: Optional[Dict[str, Any]] = None) -> Tuple[bool, str, Any]:
         """
         Вычисляет выражение безопасно.
@@ -220,24 +333,17 @@ class SafeExecutor:
             Tuple[success: bool, message: str, result: Any]
         """
         try:
-            # Проверяем что это простое выражение
-            tree = ast.parse(expression, mode='eval')
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Call):
-                    if isinstance(node.func, ast.Name):
-                        if node.func.id in self.BLOCKED_BUILTINS:
-                            raise DangerousCodeError(f"Вызов '{node.func.id}' запрещён")
+            compiled = self._compile_checked(expression, 'eval')
                             
             # Создаём безопасное окружение
             safe_globals = {
-                '__builtins__': self._create_safe_builtins(),
+                '__builtins__': self._safe_builtins(),
             }
             
             if local_vars:
                 safe_globals.update(local_vars)
                 
-            result = eval(compile(tree, '<sandbox>', 'eval'), safe_globals)
+            result = eval(compiled, safe_globals)
             return True, str(result), result
             
         except SafeExecutionError as e:
@@ -250,13 +356,16 @@ class SafeExecutor:
 _default_executor = SafeExecutor()
 
 
-def safe_exec(code: str, local_vars: Optional[Dict[str, Any]] = None) -> Tuple[bool, str, Any]:
+def safe_exec(code: str, local_vars: Optional[Dict[str, Any]] = None,
+              on_output: Optional[Callable[[str], None]] = None) -> Tuple[bool, str, Any]:
     """
     Удобная функция для безопасного выполнения кода.
+    Код выполняется в отдельном процессе sandbox с лимитом времени.
     
     Args:
         code: Код для выполнения
         local_vars: Дополнительные переменные
+        on_output: Получатель вывода по мере выполнения
         
     Returns:
         Tuple[success: bool, output: str, result: Any]
@@ -266,5 +375,5 @@ def safe_exec(code: str, local_vars: Optional[Dict[str, Any]] = None) -> Tuple[b
         if success:
             print(output)  # "Hello\n"
     """
-    return _default_executor.execute(code, local_vars)
+    return _default_executor.execute_isolated(code, local_vars, on_output)
 
@@ -0,0 +1,319 @@
+"""
+Пул процессов sandbox для SafeExecutor
+Код выполняется в заранее запущенных процессах-воркерах:
+- лимит реального времени (зависший воркер убивается и заменяется)
+- лимиты CPU и памяти через resource внутри воркера (POSIX)
+- вывод print передаётся обратно по pipe по мере выполнения
+"""
+
+import itertools
+import multiprocessing
+import pickle
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .logger import get_logger
+
+log = get_logger('SandboxPool')
+
+try:
+    import resource
+    import signal
+except ImportError:  # Windows
+    resource = None
+    signal = None
+
+
+# === Воркер (выполняется в дочернем процессе) ===
+
+def _apply_limits(memory_limit_mb: Optional[int]):
+    """Постоянные лимиты воркера"""
+    if resource is None:
+        return
+    limits = [
+        # Запись в файлы запрещена (pipe не затрагивается)
+        (resource.RLIMIT_FSIZE, 0),
+        # Запрет порождения процессов
+        (getattr(resource, 'RLIMIT_NPROC', None), 0),
+    ]
+    if memory_limit_mb:
+        limits.append((resource.RLIMIT_AS, memory_limit_mb * 1024 * 1024))
+    for limit, value in limits:
+        if limit is None:
+            continue
+        try:
+            resource.setrlimit(limit, (value, value))
+        except (ValueError, OSError):
+            pass
+
+
+def _set_cpu_limit(seconds: Optional[float]):
+    """Мягкий лимит CPU на одно задание (от текущего расхода процесса)"""
+    if resource is None:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if seconds:
+        used = resource.getrusage(resource.RUSAGE_SELF)
+        soft = int(used.ru_utime + used.ru_stime + seconds) + 1
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+    else:
+        soft = hard
+    try:
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    except (ValueError, OSError):
+        pass
+
+
+def _worker_main(conn, memory_limit_mb: Optional[int]):
+    """Цикл воркера: принимает задания, возвращает вывод и результат"""
+    from .safe_exec import SafeExecutor, ExecutionTimeoutError
+
+    if signal is not None and hasattr(signal, 'SIGXCPU'):
+        def on_cpu_limit(signum, frame):
+            raise ExecutionTimeoutError("превышен лимит процессорного времени")
+        signal.signal(signal.SIGXCPU, on_cpu_limit)
+
+    # Прогретый интерпретатор: модули импортируются до лимитов памяти
+    executor = SafeExecutor()
+    executor.warm_up()
+    _apply_limits(memory_limit_mb)
+    conn.send(('ready',))
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+
+        job_id, code, local_vars, cpu_limit, max_output = job
+        executor.max_output = max_output
+        executor.on_output = lambda text: conn.send(('output', job_id, text))
+
+        _set_cpu_limit(cpu_limit)
+        try:
+            success, output, result = executor.execute(code, local_vars)
+        except ExecutionTimeoutError as e:
+            # Сигнал пришёл вне пользовательского кода
+            success, output, result = False, f"Превышено время выполнения: {e}", None
+        finally:
+            _set_cpu_limit(None)
+
+        try:
+            pickle.dumps(result)
+        except Exception:
+            result = repr(result)
+        conn.send(('done', job_id, success, output, result))
+
+
+# === Пул (выполняется в основном процессе) ===
+
+class _Worker:
+    """Процесс-воркер и его конец pipe"""
+
+    def __init__(self, context, memory_limit_mb: Optional[int]):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_conn, memory_limit_mb),
+            name='SandboxWorker', daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+
+    def wait_ready(self, timeout: float) -> bool:
+        if self.ready:
+            return True
+        try:
+            if self.conn.poll(timeout):
+                message = self.conn.recv()
+                self.ready = message[0] == 'ready'
+        except (EOFError, OSError):
+            # Воркер умер при запуске
+            return False
+        return self.ready
+
+    def kill(self):
+        try:
+            self.conn.close()
+        except OSError:
+            pass
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(1)
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(0.5)
+        self.kill()
+
+
+class SandboxPool:
+    """
+    Пул процессов для выполнения недоверенного кода.
+
+    Использование:
+        pool = SandboxPool(size=2)
+        pool.start()
+        success, output, result = pool.execute('print(1)', timeout=5,
+                                               on_output=lambda text: ...)
+        pool.shutdown()
+    """
+
+    # Время на запуск воркера (импорт интерпретатора)
+    STARTUP_TIMEOUT = 15.0
+
+    def __init__(self, size: int = 2, timeout: float = 5.0,
+                 cpu_limit: Optional[float] = None, memory_limit_mb: Optional[int] = 512):
+        """
+        Args:
+            size: Количество воркеров
+            timeout: Лимит реального времени по умолчанию (сек)
+            cpu_limit: Лимит процессорного времени (сек, по умолчанию = timeout)
+            memory_limit_mb: Лимит адресного пространства воркера (МБ)
+        """
+        self.size = size
+        self.timeout = timeout
+        self.cpu_limit = cpu_limit
+        self.memory_limit_mb = memory_limit_mb
+
+        # spawn: воркер не наследует состояние Tk и потоки основного процесса
+        self._context = multiprocessing.get_context('spawn')
+        self._idle: 'queue.Queue[_Worker]' = queue.Queue()
+        self._workers = set()
+        self._lock = threading.Lock()
+        self._job_ids = itertools.count(1)
+        self._started = False
+
+    def start(self):
+        """Запускает воркеры заранее (не ждёт их готовности)"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        for _ in range(self.size):
+            self._idle.put(self._spawn())
+        log.info(f"Пул sandbox запущен: {self.size} процесс(ов)")
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._context, self.memory_limit_mb)
+        with self._lock:
+            self._workers.add(worker)
+        return worker
+
+    def _discard(self, worker: _Worker) -> bool:
+        """Убивает воркер; True если пул ещё работает"""
+        worker.kill()
+        with self._lock:
+            self._workers.discard(worker)
+            return self._started
+
+    def _replace(self, worker: _Worker):
+        """Убивает воркер и запускает новый на его место"""
+        if self._discard(worker):
+            self._idle.put(self._spawn())
+
+    def execute(self, code: str, local_vars: Optional[Dict[str, Any]] = None,
+                on_output: Optional[Callable[[str], None]] = None,
+                timeout: Optional[float] = None,
+                max_output: int = 10000) -> Tuple[bool, str, Any]:
+        """
+        Выполняет код в свободном воркере (блокирует вызывающий поток).
+
+        Returns:
+            Tuple[success: bool, output: str, result: Any]
+        """
+        self.start()
+        timeout = timeout or self.timeout
+        cpu_limit = self.cpu_limit or timeout
+
+        try:
+            worker = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            return False, "Sandbox занят: нет свободных процессов", None
+
+        if not worker.wait_ready(self.STARTUP_TIMEOUT):
+            # Одна попытка со свежим процессом; без изоляции код не выполняется
+            self._discard(worker)
+            worker = self._spawn()
+            if not worker.wait_ready(self.STARTUP_TIMEOUT):
+                self._replace(worker)
+                log.warning("Sandbox: процесс не запускается")
+                return False, "Sandbox недоступен", None
+
+        job_id = next(self._job_ids)
+        try:
+            worker.conn.send((job_id, code, local_vars, cpu_limit, max_output))
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            self._idle.put(worker)
+            return False, f"Ошибка: переменные нельзя передать в sandbox: {e}", None
+        except OSError:
+            self._replace(worker)
+            return False, "Процесс sandbox недоступен", None
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0 or not worker.conn.poll(remaining):
+                    self._replace(worker)
+                    log.warning(f"Sandbox: задание {job_id} прервано по таймауту {timeout} с")
+                    return False, f"Превышено время выполнения ({timeout} с), процесс остановлен", None
+                message = worker.conn.recv()
+            except (EOFError, OSError):
+                self._replace(worker)
+                return False, "Процесс sandbox аварийно завершился", None
+
+            kind = message[0]
+            if message[1] != job_id:
+                continue
+            if kind == 'output':
+                if on_output:
+                    on_output(message[2])
+            elif kind == 'done':
+                self._idle.put(worker)
+                _, _, success, output, result = message
+                return success, output, result
+
+    def shutdown(self):
+        """Останавливает все воркеры"""
+        with self._lock:
+            self._started = False
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.stop()
+        while not self._idle.empty():
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+
+
+# Глобальный экземпляр
+_sandbox_pool = None
+_sandbox_pool_failed = False
+
+
+def get_sandbox_pool() -> Optional[SandboxPool]:
+    """
+    Получить глобальный пул sandbox.
+    None если процессы запустить не удалось (тогда выполнение идёт в текущем процессе)
+    """
+    global _sandbox_pool, _sandbox_pool_failed
+    if _sandbox_pool is None and not _sandbox_pool_failed:
+        try:
+            pool = SandboxPool()
+            pool.start()
+            _sandbox_pool = pool
+        except (OSError, RuntimeError) as e:
+            _sandbox_pool_failed = True
+            log.error(f"Пул sandbox недоступен: {e}")
+    return _sandbox_pool
@@ -0,0 +1,257 @@
+"""
+Граф запуска приложения
+Этапы выполняются в порядке зависимостей сразу, как только готовы
+их предпосылки (другие этапы или внешние события, например <Configure> холста),
+без фиксированных задержек after(). Некритичные этапы выполняются
+после основных - по одному в паузах цикла событий.
+"""
+
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .logger import get_logger
+from .event_bus import event_bus
+from .profiler import get_profiler
+
+log = get_logger('Startup')
+
+
+class StartupStage:
+    """Этап запуска"""
+
+    PENDING = 'pending'
+    DONE = 'done'
+    FAILED = 'failed'
+    SKIPPED = 'skipped'
+
+    def __init__(self, name: str, func: Callable[[], None], requires: Iterable[str] = (),
+                 deferred: bool = False, title: str = ''):
+        self.name = name
+        self.func = func
+        self.requires = tuple(requires)
+        self.deferred = deferred
+        self.title = title or name
+        self.state = self.PENDING
+        self.scheduled = False
+        # Время от старта графа (мс)
+        self.ready_ms: Optional[float] = None
+        self.start_ms: Optional[float] = None
+        self.duration_ms: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'state': self.state,
+            'deferred': self.deferred,
+            'ready_ms': self.ready_ms,
+            'start_ms': self.start_ms,
+            'duration_ms': self.duration_ms,
+        }
+
+
+class StartupGraph:
+    """
+    Запуск по графу зависимостей.
+
+    Использование:
+        startup = StartupGraph(root)
+        startup.add('ui', build_ui, title="Интерфейс")
+        startup.add('main_panel', create_panel, requires=('ui', 'canvas_sized'))
+        startup.add('ai', init_ai, requires=('ui',), deferred=True)
+        startup.start()
+
+        # В обработчике <Configure>
+        startup.signal('canvas_sized')
+
+    Имя в requires, которое не является этапом, - внешнее событие (signal).
+    Основные этапы идут через after_idle: между ними Tk успевает
+    перерисовать оверлей загрузки. Когда они выполнены, публикуется
+    'startup.interactive', после отложенных - 'startup.complete'.
+    """
+
+    def __init__(self, root, on_stage: Optional[Callable[[StartupStage, float], None]] = None,
+                 on_error: Optional[Callable[[StartupStage, Exception], None]] = None):
+        """
+        Args:
+            root: Tk root (для after/after_idle)
+            on_stage: Вызывается перед основным этапом (этап, доля выполненных 0..1)
+            on_error: Вызывается при ошибке этапа
+        """
+        self.root = root
+        self.on_stage = on_stage
+        self.on_error = on_error
+        self._stages: Dict[str, StartupStage] = {}
+        self._signals = set()
+        self._started_at: Optional[float] = None
+        self._interactive = False
+        self._complete = False
+
+    # === Описание графа ===
+
+    def add(self, name: str, func: Callable[[], None], requires: Iterable[str] = (),
+            deferred: bool = False, title: str = '') -> StartupStage:
+        """Добавляет этап"""
+        if name in self._stages:
+            raise ValueError(f"Этап '{name}' уже добавлен")
+        stage = StartupStage(name, func, requires, deferred, title)
+        self._stages[name] = stage
+        return stage
+
+    def signal(self, name: str):
+        """Отмечает внешнее событие как произошедшее"""
+        if name in self._signals:
+            return
+        self._signals.add(name)
+        log.debug("Событие запуска: %s (%.0f мс)", name, self._elapsed_ms())
+        self._schedule_ready()
+
+    def get_stage(self, name: str) -> Optional[StartupStage]:
+        return self._stages.get(name)
+
+    def is_done(self, name: str) -> bool:
+        stage = self._stages.get(name)
+        return stage is not None and stage.state == StartupStage.DONE
+
+    # === Выполнение ===
+
+    def start(self):
+        """Запускает выполнение графа"""
+        for stage in self._stages.values():
+            for required in stage.requires:
+                other = self._stages.get(required)
+                if other is not None and other.deferred and not stage.deferred:
+                    raise ValueError(f"Основной этап '{stage.name}' зависит от отложенного '{required}'")
+        self._started_at = time.perf_counter()
+        self._schedule_ready()
+
+    def ensure(self, name: str) -> bool:
+        """
+        Выполняет этап немедленно, если он ещё не выполнен
+        (например, пользователь открыл библиотеку до её фоновой загрузки).
+        Невыполненные этапы из requires выполняются перед ним.
+
+        Returns:
+            True если этап выполнен
+        """
+        stage = self._stages.get(name)
+        if stage is None:
+            return False
+        if stage.state == StartupStage.PENDING:
+            for required in stage.requires:
+                if required in self._stages:
+                    self.ensure(required)
+            if self._requirements_met(stage):
+                self._run(stage)
+        return stage.state == StartupStage.DONE
+
+    def _elapsed_ms(self) -> float:
+        if self._started_at is None:
+            return 0.0
+        return (time.perf_counter() - self._started_at) * 1000
+
+    def _requirements_met(self, stage: StartupStage) -> bool:
+        for required in stage.requires:
+            other = self._stages.get(required)
+            if other is None:
+                if required not in self._signals:
+                    return False
+            elif other.state != StartupStage.DONE:
+                return False
+        return True
+
+    def _schedule_ready(self):
+        """Ставит в очередь этапы, у которых выполнены предпосылки"""
+        if self._started_at is None:
+            return
+        for stage in self._stages.values():
+            if stage.state != StartupStage.PENDING or stage.scheduled:
+                continue
+            if not self._requirements_met(stage):
+                continue
+            if stage.ready_ms is None:
+                stage.ready_ms = self._elapsed_ms()
+            if stage.deferred:
+                # Отложенные - после основных, по одному за паузу
+                if self._interactive:
+                    stage.scheduled = True
+                    self.root.after(1, lambda s=stage: self.root.after_idle(self._run, s))
+                continue
+            stage.scheduled = True
+            if self.on_stage:
+                self.on_stage(stage, self._critical_progress())
+            self.root.after_idle(self._run, stage)
+
+    def _run(self, stage: StartupStage):
+        if stage.state != StartupStage.PENDING:
+            return
+        stage.start_ms = self._elapsed_ms()
+        start_ns = time.perf_counter_ns()
+        try:
+            stage.func()
+            stage.state = StartupStage.DONE
+        except Exception as e:
+            stage.state = StartupStage.FAILED
+            log.exception("Этап запуска '%s' завершился ошибкой: %s", stage.name, e)
+            self._skip_dependents(stage.name)
+            if self.on_error:
+                self.on_error(stage, e)
+        duration_ns = time.perf_counter_ns() - start_ns
+        stage.duration_ms = duration_ns / 1e6
+        profiler = get_profiler()
+        if profiler.enabled:
+            profiler.record(f'startup.{stage.name}', start_ns, duration_ns)
+        log.debug("Этап %s: %.1f мс", stage.name, stage.duration_ms)
+
+        self._check_milestones()
+        self._schedule_ready()
+
+    def _skip_dependents(self, name: str):
+        for stage in self._stages.values():
+            if stage.state == StartupStage.PENDING and name in stage.requires:
+                stage.state = StartupStage.SKIPPED
+                log.warning("Этап запуска '%s' пропущен: не выполнен '%s'", stage.name, name)
+                self._skip_dependents(stage.name)
+
+    def _critical_progress(self) -> float:
+        critical = [stage for stage in self._stages.values() if not stage.deferred]
+        if not critical:
+            return 1.0
+        finished = sum(1 for stage in critical if stage.state != StartupStage.PENDING)
+        return finished / len(critical)
+
+    def _check_milestones(self):
+        stages = list(self._stages.values())
+        if not self._interactive and all(
+                stage.state != StartupStage.PENDING for stage in stages if not stage.deferred):
+            self._interactive = True
+            log.info("Интерфейс готов за %.0f мс", self._elapsed_ms())
+            event_bus.emit('startup.interactive', self.timings())
+        if self._interactive and not self._complete and all(
+                stage.state != StartupStage.PENDING for stage in stages):
+            self._complete = True
+            self._log_report()
+            event_bus.emit('startup.complete', self.timings())
+
+    # === Отчёт ===
+
+    def timings(self) -> List[dict]:
+        """Замеры этапов в порядке запуска"""
+        stages = sorted(self._stages.values(),
+                        key=lambda stage: (stage.start_ms is None, stage.start_ms or 0))
+        return [stage.to_dict() for stage in stages]
+
+    def _log_report(self):
+        log.info("Запуск завершён за %.0f мс", self._elapsed_ms())
+        for entry in self.timings():
+            if entry['duration_ms'] is None:
+                log.info("  %-20s %s", entry['name'], entry['state'])
+                continue
+            notes = []
+            if entry['deferred']:
+                notes.append('отложен')
+            if entry['state'] == StartupStage.FAILED:
+                notes.append('ошибка')
+            log.info("  %-20s старт %7.1f мс  длительность %7.1f мс  ожидание %6.1f мс%s",
+                     entry['name'], entry['start_ms'], entry['duration_ms'],
+                     entry['start_ms'] - entry['ready_ms'],
+                     f"  ({', '.join(notes)})" if notes else '')
@@ -0,0 +1,365 @@
+"""
+Подсветка синтаксиса для tk.Text
+Лексер на одном скомпилированном регулярном выражении (один проход по строке)
+и инкрементальный подсветчик: перелексирует только изменённые и видимые строки,
+хранит состояние лексера на конец каждой строки, работает срезами через after_idle
+"""
+
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+# Ключевые слова по языкам
+KEYWORDS = {
+    'python': ['def', 'class', 'if', 'elif', 'else', 'for', 'while', 'try',
+               'except', 'finally', 'with', 'as', 'import', 'from', 'return',
+               'yield', 'lambda', 'pass', 'break', 'continue', 'and', 'or',
+               'not', 'in', 'is', 'True', 'False', 'None', 'self', 'async', 'await'],
+    'javascript': ['function', 'const', 'let', 'var', 'if', 'else', 'for',
+                   'while', 'return', 'class', 'new', 'this', 'true', 'false',
+                   'null', 'undefined', 'async', 'await', 'import', 'export',
+                   'default', 'try', 'catch', 'finally', 'throw'],
+    'json': ['true', 'false', 'null'],
+}
+
+_NUMBER = r'\b\d+(?:\.\d+)?\b'
+_DQ_STRING = r'"(?:[^"\\]|\\.)*"?'
+_SQ_STRING = r"'(?:[^'\\]|\\.)*'?"
+
+# Описание языков:
+#   blocks - многострочные конструкции (тег, открытие, закрытие)
+#   rules  - однострочные токены (тег, шаблон); порядок = приоритет
+LANGUAGES = {
+    'python': {
+        'blocks': [('string', '"""', '"""'), ('string', "'''", "'''")],
+        'rules': [('comment', r'#.*'), ('string', _DQ_STRING),
+                  ('string', _SQ_STRING), ('number', _NUMBER)],
+    },
+    'javascript': {
+        'blocks': [('comment', r'/\*', r'\*/'), ('string', '`', '`')],
+        'rules': [('comment', r'//.*'), ('string', _DQ_STRING),
+                  ('string', _SQ_STRING), ('number', _NUMBER)],
+    },
+    'json': {
+        'blocks': [],
+        'rules': [('attr', _DQ_STRING + r'(?=\s*:)'), ('string', _DQ_STRING),
+                  ('number', r'-?' + _NUMBER)],
+    },
+    'css': {
+        'blocks': [('comment', r'/\*', r'\*/')],
+        'rules': [('string', _DQ_STRING), ('string', _SQ_STRING),
+                  ('attr', r'[\w-]+(?=\s*:[^{]*;)'), ('number', r'\b\d+(?:\.\d+)?(?:px|em|rem|vh|vw|%)?')],
+    },
+    'html': {
+        'blocks': [('comment', r'<!--', r'-->')],
+        'rules': [('tag', r'</?[\w-]+|/?>'), ('attr', r'[\w-]+(?==)'),
+                  ('value', _DQ_STRING), ('value', _SQ_STRING)],
+    },
+}
+
+# Синонимы языков
+LANGUAGE_ALIASES = {
+    'js': 'javascript',
+    'react': 'javascript',
+    'jsx': 'javascript',
+    'py': 'python',
+}
+
+
+class SyntaxLexer:
+    """
+    Построчный лексер.
+
+    Состояние между строками - индекс незакрытой многострочной
+    конструкции (None если строка закончилась в обычном контексте).
+    """
+
+    def __init__(self, blocks=(), rules=(), keywords=()):
+        parts = []
+        self._group_tags: Dict[str, str] = {}
+        self._block_tags: List[str] = []
+        self._closers = []
+
+        for index, (tag, opener, closer) in enumerate(blocks):
+            parts.append(f'(?P<b{index}>{opener})')
+            self._block_tags.append(tag)
+            self._closers.append(re.compile(closer))
+
+        for index, (tag, pattern) in enumerate(rules):
+            name = f'r{index}'
+            parts.append(f'(?P<{name}>{pattern})')
+            self._group_tags[name] = tag
+
+        if keywords:
+            words = '|'.join(re.escape(word) for word in sorted(keywords, key=len, reverse=True))
+            parts.append(rf'(?P<kw>\b(?:{words})\b)')
+            self._group_tags['kw'] = 'keyword'
+
+        self._pattern = re.compile('|'.join(parts)) if parts else None
+
+    @property
+    def tags(self) -> List[str]:
+        """Все теги, которые может выдать лексер"""
+        return sorted(set(self._group_tags.values()) | set(self._block_tags))
+
+    def lex_line(self, text: str, state: Optional[int] = None) -> Tuple[List[Tuple[int, int, str]], Optional[int]]:
+        """
+        Разбирает одну строку.
+
+        Args:
+            text: Строка без '\\n'
+            state: Состояние на начало строки
+
+        Returns:
+            (токены [(начало, конец, тег)], состояние на конец строки)
+        """
+        tokens = []
+        pos = 0
+        length = len(text)
+
+        if state is not None:
+            match = self._closers[state].search(text)
+            if not match:
+                if length:
+                    tokens.append((0, length, self._block_tags[state]))
+                return tokens, state
+            tokens.append((0, match.end(), self._block_tags[state]))
+            pos = match.end()
+
+        pattern = self._pattern
+        if pattern is None:
+            return tokens, None
+
+        while pos < length:
+            match = pattern.search(text, pos)
+            if not match:
+                break
+            name = match.lastgroup
+            start, end = match.span()
+            if name[0] == 'b':
+                # Открытие многострочной конструкции
+                block = int(name[1:])
+                close = self._closers[block].search(text, end)
+                if not close:
+                    tokens.append((start, length, self._block_tags[block]))
+                    return tokens, block
+                end = close.end()
+                tokens.append((start, end, self._block_tags[block]))
+            else:
+                tokens.append((start, end, self._group_tags[name]))
+            pos = end if end > start else end + 1
+
+        return tokens, None
+
+
+_lexers: Dict[Tuple[str, Tuple[str, ...]], SyntaxLexer] = {}
+
+
+def get_lexer(language: str, keywords=None) -> SyntaxLexer:
+    """
+    Возвращает (кешированный) лексер для языка.
+    Для неизвестного языка - лексер без правил (обычный текст)
+    """
+    language = LANGUAGE_ALIASES.get(language, language)
+    if keywords is None:
+        keywords = KEYWORDS.get(language, ())
+    key = (language, tuple(keywords))
+    lexer = _lexers.get(key)
+    if lexer is None:
+        spec = LANGUAGES.get(language, {})
+        lexer = SyntaxLexer(spec.get('blocks', ()), spec.get('rules', ()), keywords)
+        _lexers[key] = lexer
+    return lexer
+
+
+class TextHighlighter:
+    """
+    Инкрементальная подсветка tk.Text.
+
+    - notify_edit() после ввода: перелексируются только изменённые строки
+      (и следующие за ними видимые, если изменилось состояние лексера)
+    - view_changed() при прокрутке: подсвечиваются строки, ставшие видимыми
+    - reset() после полной замены текста
+
+    Работа выполняется срезами через after_idle.
+
+    Использование:
+        highlighter = TextHighlighter(text, 'python')
+        text.config(yscrollcommand=highlighter.view_changed)
+        text.bind('<KeyRelease>', lambda e: highlighter.notify_edit())
+    """
+
+    # Сколько строк за срез пролистывать только ради состояния лексера
+    STATE_LINES_PER_SLICE = 2000
+
+    # Бюджет одного среза (мс)
+    SLICE_MS = 10
+
+    def __init__(self, text, language: str = 'text', keywords=None):
+        self.text = text
+        self._after_id = None
+        self._yscroll_target = None
+        self._tags = set()
+        self._all_tags = set()
+        self.set_language(language, keywords)
+
+    def set_language(self, language: str, keywords=None):
+        """Меняет язык и подсвечивает текст заново"""
+        self.language = language
+        self.lexer = get_lexer(language, keywords)
+        self._tags = set(self.lexer.tags)
+        # Теги прошлого языка тоже снимаются в reset()
+        self._all_tags |= self._tags
+        self.reset()
+
+    def set_yscroll_target(self, callback):
+        """Дополнительный получатель yscrollcommand (например scrollbar.set)"""
+        self._yscroll_target = callback
+
+    def reset(self):
+        """Сбрасывает кеш (после полной замены текста)"""
+        # Состояние лексера на конец строки: _end_states[i] - для строки i + 1
+        self._end_states: List[Optional[int]] = []
+        # Подсвеченные строки: номер строки -> состояние на начало при подсветке
+        self._clean: Dict[int, Optional[int]] = {}
+        self._line_count = self._count_lines()
+        for tag in self._all_tags:
+            self.text.tag_remove(tag, '1.0', 'end')
+        self._all_tags = set(self._tags)
+        self.schedule()
+
+    def notify_edit(self, line: Optional[int] = None):
+        """
+        Сообщает об изменении текста около строки line (по умолчанию - курсор).
+        Сдвигает кеш на разницу в количестве строк.
+        """
+        if line is None:
+            line = int(self.text.index('insert').split('.')[0])
+        count = self._count_lines()
+        delta = count - self._line_count
+        self._line_count = count
+
+        # Изменённый диапазон в новой нумерации: [first, line]
+        first = max(1, line - max(delta, 0))
+        # Последняя затронутая строка в старой нумерации
+        old_last = first + max(-delta, 0)
+
+        del self._end_states[first - 1:]
+        self._clean = {
+            (ln if ln < first else ln + delta): state
+            for ln, state in self._clean.items()
+            if ln < first or ln > old_last
+        }
+        self.schedule()
+
+    def view_changed(self, *args):
+        """Для yscrollcommand: подсвечивает строки, ставшие видимыми"""
+        if self._yscroll_target:
+            self._yscroll_target(*args)
+        self.schedule()
+
+    def schedule(self):
+        """Планирует обработку в after_idle"""
+        if self._after_id is None:
+            self._after_id = self.text.after_idle(self._run)
+
+    def cancel(self):
+        if self._after_id is not None:
+            self.text.after_cancel(self._after_id)
+            self._after_id = None
+
+    # === Обработка ===
+
+    def _count_lines(self) -> int:
+        return int(self.text.index('end-1c').split('.')[0])
+
+    def _visible_range(self) -> Tuple[int, int]:
+        first = int(self.text.index('@0,0').split('.')[0])
+        last = int(self.text.index(f'@0,{self.text.winfo_height()}').split('.')[0])
+        return first, max(first, last)
+
+    def _run(self):
+        self._after_id = None
+        try:
+            if not self.text.winfo_exists():
+                return
+        except Exception:
+            return
+
+        deadline = time.perf_counter() + self.SLICE_MS / 1000
+        first, last = self._visible_range()
+
+        # Состояние на начало первой видимой строки (пролистываем строки выше)
+        while len(self._end_states) < first - 1:
+            self._extend_states(first - 1)
+            if time.perf_counter() >= deadline and len(self._end_states) < first - 1:
+                self.schedule()
+                return
+
+        self._highlight_lines(first, min(last, self._line_count))
+
+    def _extend_states(self, upto: int):
+        """Вычисляет состояния на конец строк до upto (не больше STATE_LINES_PER_SLICE за раз)"""
+        start = len(self._end_states) + 1
+        stop = min(upto, start + self.STATE_LINES_PER_SLICE - 1)
+        if stop < start:
+            return
+        lex_line = self.lexer.lex_line
+        state = self._end_states[-1] if self._end_states else None
+        for line_text in self.text.get(f'{start}.0', f'{stop}.end').split('\n'):
+            _, state = lex_line(line_text, state)
+            self._end_states.append(state)
+
+    def _highlight_lines(self, first: int, last: int):
+        """Подсвечивает устаревшие строки диапазона [first, last]"""
+        if last < first:
+            return
+
+        lines = self.text.get(f'{first}.0', f'{last}.end').split('\n')
+        lex_line = self.lexer.lex_line
+        end_states = self._end_states
+        clean = self._clean
+
+        ranges: Dict[str, List[str]] = {}
+        dirty_runs = []
+        state = end_states[first - 2] if first > 1 else None
+
+        for offset, line_text in enumerate(lines):
+            line = first + offset
+            known = len(end_states) >= line
+            if line in clean and clean[line] == state:
+                if known:
+                    state = end_states[line - 1]
+                    continue
+                _, state = lex_line(line_text, state)
+                end_states.append(state)
+                continue
+
+            tokens, end_state = lex_line(line_text, state)
+            clean[line] = state
+            if known:
+                if end_states[line - 1] != end_state:
+                    # Состояние изменилось - строки ниже нужно пересчитать
+                    del end_states[line - 1:]
+                    end_states.append(end_state)
+            else:
+                end_states.append(end_state)
+            state = end_state
+
+            if dirty_runs and dirty_runs[-1][1] == line - 1:
+                dirty_runs[-1][1] = line
+            else:
+                dirty_runs.append([line, line])
+            for start, end, tag in tokens:
+                ranges.setdefault(tag, []).extend((f'{line}.{start}', f'{line}.{end}'))
+
+        if not dirty_runs:
+            return
+
+        text = self.text
+        for run_first, run_last in dirty_runs:
+            for tag in self._tags:
+                text.tag_remove(tag, f'{run_first}.0', f'{run_last}.end')
+        for tag, indices in ranges.items():
+            text.tag_add(tag, *indices)